@@ -0,0 +1,5 @@
+'''
+Advent of Code 2020 runner
+
+Run the puzzles of any day with `python -m aoc`.
+'''
@@ -0,0 +1,8 @@
+'''Run the puzzles of the chosen days and report their answers and resource usage'''
+import sys
+
+from aoc.runner import main
+
+
+if __name__ == '__main__': # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,6 @@
+'''
+Advent of Code 2020 benchmarks
+
+Generate seeded synthetic inputs of any size for every day and measure how each solver scales
+with `python -m aoc.benchmarks`.
+'''
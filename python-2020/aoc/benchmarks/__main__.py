@@ -0,0 +1,8 @@
+'''Measure how the solvers of the chosen days scale with the size of their input'''
+import sys
+
+from aoc.benchmarks.harness import main
+
+
+if __name__ == '__main__': # pragma: no cover
+    sys.exit(main())
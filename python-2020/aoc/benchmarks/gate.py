@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+# Advent of Code 2020
+'''
+Performance regression gate: run selected puzzle parts, each one in a fresh process, and fail
+when one takes more time or memory than its budget in budgets.json allows.
+
+The budgets follow the machine they are checked on. Time budgets are scaled by the ratio of a
+calibration workload timed now to the same workload timed when the budgets were saved. Memory
+budgets only count the memory a part uses above the peak of a fresh process that solves
+nothing, which depends on the platform and on what that process imports. The tolerance of the
+file can be overridden with --tolerance or the AOC_BENCHMARK_TOLERANCE environment variable.
+
+The checks live in test_benchmarks.py and are marked as benchmarks so the main test run skips
+them. Run them with `pytest -m benchmark --no-cov` and refresh the budgets with
+`python -m aoc.benchmarks.gate --update` after an intended change.
+'''
+from __future__ import annotations
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+import unittest
+from unittest import mock
+
+from aoc.cli import build_parser, load_json, save_json
+from aoc.runner import PartResult, peak_rss_kb, run
+
+
+BUDGETS_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'budgets.json')
+TOLERANCE_VARIABLE = 'AOC_BENCHMARK_TOLERANCE'
+CALIBRATION_LOOPS = 500_000
+
+
+def load_budgets(filename: str = BUDGETS_FILENAME,
+                 tolerance: Optional[float] = None) -> Dict[str, Any]:
+    '''
+    Load the tolerances, the calibration time and the budget of each part. A tolerance given
+    here, or else in the AOC_BENCHMARK_TOLERANCE environment variable, overrides the file's.
+    '''
+    budgets: Dict[str, Any] = load_json(filename)
+
+    if tolerance is None and os.environ.get(TOLERANCE_VARIABLE):
+        tolerance = float(os.environ[TOLERANCE_VARIABLE])
+    if tolerance is not None:
+        budgets['tolerance'] = tolerance
+
+    return budgets
+
+
+class Calibration(NamedTuple):
+    '''Class to represent the speed and the baseline memory of a machine'''
+    seconds: float
+    peak_rss_kb: int
+
+
+def calibrate(repeat: int = 3) -> Calibration:
+    '''
+    Return the best time in seconds of a fixed pure Python workload, and the peak resident set
+    size of a fresh process started like the ones that measure the parts
+    '''
+    durations = []
+
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        total = 0
+
+        for number in range(CALIBRATION_LOOPS):
+            total += number * number
+
+        durations.append(time.perf_counter() - start_time)
+
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return Calibration(min(durations), pool.apply(peak_rss_kb))
+
+
+def check_result(result: PartResult, budget: Dict[str, Any], settings: Dict[str, Any],
+                 calibration: Optional[Calibration] = None) -> List[str]:
+    '''
+    Return a message for each budget a part exceeds, on a machine with the given calibration
+    or else the one the budgets were saved with. A part may take the tolerance more than its
+    budget, plus a fixed slack so that parts taking a few milliseconds do not fail on noise.
+    '''
+    violations = []
+    name = f'day {result.day} part {result.part}'
+    calibration = calibration or Calibration(settings['calibration_seconds'],
+                                             settings['calibration_peak_rss_kb'])
+    speed = calibration.seconds / settings['calibration_seconds']
+    seconds_limit = (budget['seconds'] * speed * (1 + settings['tolerance']) +
+                     settings['slack_seconds'])
+    memory_limit = ((budget['peak_rss_kb'] - settings['calibration_peak_rss_kb']) *
+                    (1 + settings['tolerance']) + calibration.peak_rss_kb + settings['slack_kb'])
+
+    if result.answer != budget['answer']:
+        violations.append(f'{name} answered {result.answer} instead of {budget["answer"]}')
+    if result.wall_seconds > seconds_limit:
+        violations.append(f'{name} took {result.wall_seconds:.3f}s, over its limit of '
+                          f'{seconds_limit:.3f}s')
+    if result.peak_rss_kb > memory_limit:
+        violations.append(f'{name} peaked at {result.peak_rss_kb} KiB, over its limit of '
+                          f'{memory_limit:.0f} KiB')
+
+    return violations
+
+
+def measure_budgets(budgets: Dict[str, Dict[str, Any]]) -> Dict[str, PartResult]:
+    '''Measure each budgeted part in a fresh process'''
+    return {name: run([budget['day']], [budget['part']])[0] for name, budget in budgets.items()}
+
+
+def check_budgets(filename: str = BUDGETS_FILENAME,
+                  tolerance: Optional[float] = None) -> List[str]:
+    '''Measure every budgeted part and return a message for each budget exceeded'''
+    settings = load_budgets(filename, tolerance)
+    calibration = calibrate()
+    results = measure_budgets(settings['budgets'])
+
+    return [violation for name, result in results.items()
+            for violation in check_result(result, settings['budgets'][name], settings,
+                                          calibration)]
+
+
+def update_budgets(filename: str = BUDGETS_FILENAME) -> Dict[str, Any]:
+    '''Measure the calibration and every budgeted part again and save them as the new budgets'''
+    settings = load_json(filename)
+    calibration = calibrate()
+    settings.update(calibration_seconds=round(calibration.seconds, 4),
+                    calibration_peak_rss_kb=calibration.peak_rss_kb)
+
+    for name, result in measure_budgets(settings['budgets']).items():
+        settings['budgets'][name].update(answer=result.answer,
+                                         seconds=round(result.wall_seconds, 4),
+                                         peak_rss_kb=result.peak_rss_kb)
+
+    save_json(filename, settings)
+    return settings
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    '''Check the budgets, or update them, and return a non-zero status on any regression'''
+    parser = build_parser('python -m aoc.benchmarks.gate', __doc__)
+    parser.add_argument('--budgets', default=BUDGETS_FILENAME, help='budgets file to use')
+    parser.add_argument('--update', action='store_true',
+                        help='save the current measurements as the new budgets')
+    parser.add_argument('--tolerance', type=float,
+                        help=f'tolerance to use instead of the one of the budgets file or of '
+                             f'{TOLERANCE_VARIABLE}')
+    arguments = parser.parse_args(argv)
+
+    if arguments.update:
+        update_budgets(arguments.budgets)
+        print(f'Updated {arguments.budgets}')
+        return 0
+
+    violations = check_budgets(arguments.budgets, arguments.tolerance)
+    print('\n'.join(violations) or 'All parts are within their budgets')
+    return 1 if violations else 0
+
+
+class Tests(unittest.TestCase):
+    '''Tests'''
+
+    settings = {'tolerance': 0.5, 'slack_seconds': 0.05, 'slack_kb': 1024,
+                'calibration_seconds': 0.01, 'calibration_peak_rss_kb': 4000}
+    budget = {'day': 13, 'part': 2, 'answer': '725169163285238', 'seconds': 1.0,
+              'peak_rss_kb': 10000}
+
+    def test_check_result(self) -> None:
+        '''Test that only the budgets exceeded beyond the tolerance and slack are reported'''
+        within = PartResult(13, 2, '725169163285238', 1.549, 0.1, 14024)
+        self.assertEqual(check_result(within, self.budget, self.settings), [])
+
+        over = PartResult(13, 2, '1', 1.551, 0.1, 14025)
+        self.assertEqual(check_result(over, self.budget, self.settings),
+                         ['day 13 part 2 answered 1 instead of 725169163285238',
+                          'day 13 part 2 took 1.551s, over its limit of 1.550s',
+                          'day 13 part 2 peaked at 14025 KiB, over its limit of 14024 KiB'])
+
+        slower = PartResult(13, 2, '725169163285238', 3.0, 0.1, 34024)
+        self.assertEqual(check_result(slower, self.budget, self.settings,
+                                      Calibration(0.02, 24000)), [])
+        self.assertEqual(check_result(slower, self.budget, self.settings),
+                         ['day 13 part 2 took 3.000s, over its limit of 1.550s',
+                          'day 13 part 2 peaked at 34024 KiB, over its limit of 14024 KiB'])
+
+    def test_load_budgets_tolerance(self) -> None:
+        '''Test that the tolerance can be overridden by argument or environment variable'''
+        with mock.patch.dict(os.environ, {TOLERANCE_VARIABLE: ''}):
+            tolerance = load_budgets()['tolerance']
+            self.assertEqual(load_budgets(tolerance=tolerance + 1)['tolerance'], tolerance + 1)
+
+        with mock.patch.dict(os.environ, {TOLERANCE_VARIABLE: '2.5'}):
+            self.assertEqual(load_budgets()['tolerance'], 2.5)
+            self.assertEqual(load_budgets(tolerance=0.1)['tolerance'], 0.1)
+
+    def test_calibrate(self) -> None:
+        '''Test that the calibration measures some time and memory'''
+        calibration = calibrate(repeat=1)
+        self.assertGreater(calibration.seconds, 0)
+        self.assertGreater(calibration.peak_rss_kb, 0)
+        self.assertGreater(peak_rss_kb(), 0)
+
+    def test_budgets_file(self) -> None:
+        '''Test that the checked-in budgets are complete'''
+        settings = load_budgets()
+        self.assertEqual(sorted(settings), ['budgets', 'calibration_peak_rss_kb',
+                                            'calibration_seconds', 'slack_kb', 'slack_seconds',
+                                            'tolerance'])
+
+        for name, budget in settings['budgets'].items():
+            with self.subTest(name=name):
+                self.assertEqual(name, f'day{budget["day"]}_part{budget["part"]}')
+                self.assertEqual(sorted(budget), ['answer', 'day', 'part', 'peak_rss_kb',
+                                                  'seconds'])
+
+    def test_update_and_check_budgets(self) -> None:
+        '''Test that updated budgets pass and that tightened ones fail'''
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'budgets.json')
+
+            save_json(filename, dict(self.settings, budgets={'day13_part2': self.budget}))
+
+            output = io.StringIO()
+
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(main(['--budgets', filename, '--update']), 0)
+                self.assertEqual(main(['--budgets', filename]), 0)
+
+            settings = load_budgets(filename)
+            self.assertGreater(settings['calibration_seconds'], 0)
+            self.assertGreater(settings['calibration_peak_rss_kb'], 0)
+            self.assertEqual(settings['budgets']['day13_part2']['day'], 13)
+            self.assertGreater(settings['budgets']['day13_part2']['peak_rss_kb'], 0)
+            settings['budgets']['day13_part2']['answer'] = '0'
+
+            save_json(filename, settings)
+
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(main(['--budgets', filename, '--tolerance', '4']), 1)
+
+        self.assertEqual(output.getvalue().splitlines(),
+                         [f'Updated {filename}', 'All parts are within their budgets',
+                          'day 13 part 2 answered 725169163285238 instead of 0'])
+
+
+if __name__ == '__main__': # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+
+# Advent of Code 2020
+'''
+Seeded generators of valid puzzle inputs of any size, one per day. Each one takes a size and a
+random number generator and returns the text of an input file.
+'''
+from __future__ import annotations
+import math
+import random
+import re
+import string
+from typing import Callable, Dict, List
+import unittest
+
+
+PASSPORT_EYE_COLORS = ('amb', 'blu', 'brn', 'gry', 'grn', 'hzl', 'oth', 'xry')
+BAG_ADJECTIVES = ('light', 'dark', 'bright', 'muted', 'shiny', 'faded', 'dotted', 'vibrant',
+                  'wavy', 'pale', 'clear', 'dull')
+BAG_COLORS = ('red', 'orange', 'white', 'yellow', 'gold', 'olive', 'plum', 'blue', 'black',
+              'green', 'tan', 'teal')
+BOOT_OPERATIONS = ('acc', 'jmp', 'nop')
+XMAS_PREAMBLE_LENGTH = 25
+
+
+def generate_expense_report(size: int, rng: random.Random) -> str:
+    '''Day 1: expenses with at least one pair and one triple summing to 2020'''
+    expenses = [rng.randrange(1, 2020) for _ in range(max(size - 5, 0))]
+    pair = rng.randrange(1, 2020)
+    triple = (rng.randrange(1, 1000), rng.randrange(1, 1000))
+
+    for expense in (pair, 2020 - pair, *triple, 2020 - sum(triple)):
+        expenses.insert(rng.randrange(len(expenses) + 1), expense)
+
+    return '\n'.join(map(str, expenses)) + '\n'
+
+
+def generate_password_rules(size: int, rng: random.Random) -> str:
+    '''Day 2: password policies followed by a password'''
+    lines = []
+
+    for _ in range(size):
+        low = rng.randrange(1, 10)
+        password = ''.join(rng.choices(string.ascii_lowercase[:6], k=rng.randrange(1, 20)))
+        lines.append(f'{low}-{rng.randrange(low + 1, 20)} {rng.choice("abcdef")}: {password}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def generate_tree_grid(size: int, rng: random.Random) -> str:
+    '''Day 3: rows of a 31 wide grid of open squares and trees'''
+    return ''.join(''.join(rng.choices('..#', k=31)) + '\n' for _ in range(size))
+
+
+def generate_passports(size: int, rng: random.Random) -> str:
+    '''Day 4: passports with valid and invalid field values, some of them missing a field'''
+    passports = []
+
+    for _ in range(size):
+        fields = {
+            'byr': str(rng.randrange(1910, 2010)),
+            'iyr': str(rng.randrange(2005, 2025)),
+            'eyr': str(rng.randrange(2015, 2035)),
+            'hgt': rng.choice((f'{rng.randrange(140, 200)}cm', f'{rng.randrange(50, 80)}in')),
+            'hcl': '#' + ''.join(rng.choices('0123456789abcdef', k=6)),
+            'ecl': rng.choice(PASSPORT_EYE_COLORS),
+            'pid': ''.join(rng.choices(string.digits, k=rng.choice((8, 9, 9, 9)))),
+            'cid': str(rng.randrange(100, 350)),
+        }
+        del fields[rng.choice(('cid', 'cid', 'byr', 'hgt', 'pid'))]
+        pairs = [f'{key}:{value}' for key, value in fields.items()]
+        split = rng.randrange(1, len(pairs))
+        passports.append(' '.join(pairs[:split]) + '\n' + ' '.join(pairs[split:]) + '\n')
+
+    return '\n'.join(passports)
+
+
+def generate_boarding_passes(size: int, rng: random.Random) -> str:
+    '''Day 5: binary space partitioned boarding passes'''
+    return ''.join(''.join(rng.choices('FB', k=7)) + ''.join(rng.choices('LR', k=3)) + '\n'
+                   for _ in range(size))
+
+
+def generate_group_answers(size: int, rng: random.Random) -> str:
+    '''Day 6: groups of one to five people answering yes to some questions'''
+    groups = []
+
+    for _ in range(size):
+        groups.append(''.join(''.join(rng.sample(string.ascii_lowercase, rng.randrange(1, 27)))
+                              + '\n' for _ in range(rng.randrange(1, 6))))
+
+    return '\n'.join(groups)
+
+
+def bag_name(index: int) -> str:
+    '''Return a distinct two word bag name for an index, the first one being shiny gold'''
+    number, position = divmod(index + BAG_COLORS.index('gold') +
+                              len(BAG_COLORS) * BAG_ADJECTIVES.index('shiny'),
+                              len(BAG_ADJECTIVES) * len(BAG_COLORS))
+    adjective, color = divmod(position, len(BAG_COLORS))
+    return f'{BAG_ADJECTIVES[adjective]}{number or ""} {BAG_COLORS[color]}'
+
+
+def generate_bag_rules(size: int, rng: random.Random) -> str:
+    '''Day 7: bag rules forming a random tree, shiny gold bags being somewhere in the middle'''
+    contents: List[List[str]] = [[] for _ in range(size)]
+    names = [bag_name(index) for index in range(size)]
+    names.insert(size // 2, names.pop(0))
+
+    for index in range(1, size):
+        count = rng.randrange(1, 10)
+        contents[rng.randrange(index)].append(f'{count} {names[index]} bag{"s" * (count > 1)}')
+
+    return ''.join(f'{name} bags contain {", ".join(inside) or "no other bags"}.\n'
+                   for name, inside in zip(names, contents))
+
+
+def generate_boot_code(size: int, rng: random.Random) -> str:
+    '''
+    Day 8: boot code that only jumps forward until its last instruction jumps back to the
+    start, so that changing that jump into a no-op makes it terminate
+    '''
+    lines = []
+
+    for position in range(size - 1):
+        operation = rng.choice(BOOT_OPERATIONS)
+        argument = rng.randrange(1, min(4, size - 1 - position) + 1) \
+            if operation != 'acc' else rng.randrange(-99, 100)
+        lines.append(f'{operation} {argument:+d}')
+
+    lines.append(f'jmp {1 - size:+d}')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_xmas_stream(size: int, rng: random.Random) -> str:
+    '''
+    Day 9: numbers that are each the sum of two of the 25 numbers before them, followed by
+    one that is not
+    '''
+    numbers = [rng.randrange(1, 50) for _ in range(XMAS_PREAMBLE_LENGTH)]
+
+    while len(numbers) < size - 1:
+        numbers.append(sum(rng.sample(numbers[-XMAS_PREAMBLE_LENGTH:], 2)))
+
+    numbers.append(2 * max(numbers[-XMAS_PREAMBLE_LENGTH:]) + 1)
+    return '\n'.join(map(str, numbers)) + '\n'
+
+
+def generate_adapters(size: int, rng: random.Random) -> str:
+    '''Day 10: a shuffled chain of adapters each one to three jolts above the previous one'''
+    joltages = []
+    joltage = 0
+
+    for _ in range(size):
+        joltage += rng.choice((1, 1, 1, 2, 3, 3))
+        joltages.append(joltage)
+
+    rng.shuffle(joltages)
+    return '\n'.join(map(str, joltages)) + '\n'
+
+
+def generate_seat_layout(size: int, rng: random.Random) -> str:
+    '''
+    Day 11: a square seat layout of empty seats and floor. Such random layouts may never settle,
+    some seats flipping every round, so they are only benchmarked over a bounded number of
+    rounds and never run until stable.
+    '''
+    return ''.join(''.join(rng.choices('LLLL.', k=size)) + '\n' for _ in range(size))
+
+
+def generate_navigation_route(size: int, rng: random.Random) -> str:
+    '''Day 12: navigation instructions turning by multiples of 90 degrees'''
+    lines = []
+
+    for _ in range(size):
+        action = rng.choice('NSEWLRFF')
+        value = rng.choice((90, 180, 270)) if action in 'LR' else rng.randrange(1, 100)
+        lines.append(f'{action}{value}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def generate_bus_schedule(size: int, rng: random.Random) -> str:
+    '''Day 13: a timestamp and distinct prime bus IDs separated by out of service buses'''
+    primes: List[int] = []
+    candidate = 11
+
+    while len(primes) < size:
+        if all(candidate % divisor for divisor in range(3, math.isqrt(candidate) + 1, 2)):
+            primes.append(candidate)
+        candidate += 2
+
+    rng.shuffle(primes)
+    entries = [str(primes[0])]
+
+    for prime in primes[1:]:
+        entries.extend(['x'] * rng.randrange(0, 8))
+        entries.append(str(prime))
+
+    return f'{rng.randrange(100000, 10000000)}\n{",".join(entries)}\n'
+
+
+def generate_docking_program(size: int, rng: random.Random) -> str:
+    '''Day 14: masks with up to six floating bits, each followed by a few memory writes'''
+    lines = []
+
+    for _ in range(size):
+        mask = rng.choices('01', k=36)
+
+        for position in rng.sample(range(36), rng.randrange(0, 7)):
+            mask[position] = 'X'
+
+        lines.append(f'mask = {"".join(mask)}')
+        lines.extend(f'mem[{rng.randrange(1 << 16)}] = {rng.randrange(1 << 30)}'
+                     for _ in range(rng.randrange(1, 5)))
+
+    return '\n'.join(lines) + '\n'
+
+
+def generate_starting_numbers(size: int, rng: random.Random) -> str:
+    '''Day 15: distinct starting numbers, the size being the number of turns to play'''
+    return ','.join(map(str, rng.sample(range(20), min(max(size, 1), 6)))) + '\n'
+
+
+GENERATORS: Dict[int, Callable[[int, random.Random], str]] = {
+    1: generate_expense_report,
+    2: generate_password_rules,
+    3: generate_tree_grid,
+    4: generate_passports,
+    5: generate_boarding_passes,
+    6: generate_group_answers,
+    7: generate_bag_rules,
+    8: generate_boot_code,
+    9: generate_xmas_stream,
+    10: generate_adapters,
+    11: generate_seat_layout,
+    12: generate_navigation_route,
+    13: generate_bus_schedule,
+    14: generate_docking_program,
+    15: generate_starting_numbers,
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    '''Return the input of a day for a size, the same for the same seed'''
+    return GENERATORS[day](size, random.Random(f'{day}:{size}:{seed}'))
+
+
+class Tests(unittest.TestCase):
+    '''Tests'''
+
+    line_patterns = {
+        1: r'\d+',
+        2: r'\d+-\d+ [a-f]: [a-f]+',
+        3: r'[.#]{31}',
+        5: r'[FB]{7}[LR]{3}',
+        8: r'(acc|jmp|nop) [+-]\d+',
+        9: r'\d+',
+        10: r'\d+',
+        11: r'[L.]{20}',
+        12: r'([NSEWF]\d+|[LR](90|180|270))',
+        14: r'(mask = [01X]{36}|mem\[\d+\] = \d+)',
+    }
+
+    def test_line_formats(self) -> None:
+        '''Test that every line of the line based inputs has the expected format'''
+        for day, pattern in self.line_patterns.items():
+            with self.subTest(day=day):
+                lines = generate(day, 20).splitlines()
+                self.assertGreaterEqual(len(lines), 20)
+                self.assertTrue(all(re.fullmatch(pattern, line) for line in lines))
+
+    def test_generate_is_seeded(self) -> None:
+        '''Test that the same seed gives the same input and another seed another one'''
+        for day in GENERATORS:
+            with self.subTest(day=day):
+                self.assertEqual(generate(day, 50, seed=1), generate(day, 50, seed=1))
+                self.assertNotEqual(generate(day, 50, seed=1), generate(day, 50, seed=2))
+
+    def test_expense_report(self) -> None:
+        '''Test that some expenses sum to 2020'''
+        expenses = list(map(int, generate(1, 3).split()))
+        self.assertEqual(len(expenses), 5)
+        self.assertEqual(sum(expenses), 2 * 2020)
+
+    def test_passports(self) -> None:
+        '''Test that each passport is split on two lines and misses one field'''
+        passports = generate(4, 30).split('\n\n')
+        self.assertEqual(len(passports), 30)
+
+        for passport in passports:
+            self.assertEqual(len(passport.strip().split('\n')), 2)
+            self.assertEqual(len(passport.split()), 7)
+
+    def test_group_answers(self) -> None:
+        '''Test that groups are separated by blank lines and answers are not repeated'''
+        groups = generate(6, 30).split('\n\n')
+        self.assertEqual(len(groups), 30)
+
+        for answers in '\n'.join(groups).split():
+            self.assertEqual(len(set(answers)), len(answers))
+
+    def test_bag_rules(self) -> None:
+        '''Test that every bag but the outermost one is inside exactly one other bag'''
+        rules = generate(7, 200).splitlines()
+        names = [rule.split(' bags contain ')[0] for rule in rules]
+        inside = re.findall(r'\d (\w+ \w+) bags?', '\n'.join(rules))
+        self.assertEqual(len(set(names)), 200)
+        self.assertEqual(sorted(inside), sorted(names[1:]))
+        self.assertEqual(names[100], 'shiny gold')
+        self.assertEqual(bag_name(len(BAG_ADJECTIVES) * len(BAG_COLORS)), 'shiny1 gold')
+
+    def test_boot_code(self) -> None:
+        '''Test that only the last instruction jumps backwards, to the start'''
+        instructions = [line.split() for line in generate(8, 50).splitlines()]
+        self.assertEqual(instructions[-1], ['jmp', '-49'])
+
+        for position, (operation, argument) in enumerate(instructions[:-1]):
+            if operation != 'acc':
+                self.assertIn(position + int(argument), range(position + 1, 50))
+
+    def test_xmas_stream(self) -> None:
+        '''Test that only the last number is not a sum of two of the 25 numbers before it'''
+        numbers = list(map(int, generate(9, 60).split()))
+
+        for position in range(XMAS_PREAMBLE_LENGTH, len(numbers)):
+            window = numbers[position - XMAS_PREAMBLE_LENGTH:position]
+            sums = {first + second for index, first in enumerate(window)
+                    for second in window[index + 1:]}
+            self.assertEqual(numbers[position] in sums, position < len(numbers) - 1)
+
+    def test_adapters(self) -> None:
+        '''Test that the adapters form a chain with differences of one to three jolts'''
+        joltages = sorted(map(int, generate(10, 100).split()))
+        self.assertTrue(all(1 <= second - first <= 3
+                            for first, second in zip([0] + joltages, joltages)))
+
+    def test_seat_layout(self) -> None:
+        '''Test that the seat layout is square'''
+        self.assertEqual([len(row) for row in generate(11, 7).split()], [7] * 7)
+
+    def test_bus_schedule(self) -> None:
+        '''Test that the bus IDs are distinct primes'''
+        timestamp, buses = generate(13, 30).split()
+        bus_ids = [int(bus) for bus in buses.split(',') if bus != 'x']
+        self.assertGreater(int(timestamp), 0)
+        self.assertEqual(len(set(bus_ids)), 30)
+        self.assertTrue(all(bus_id % divisor for bus_id in bus_ids
+                            for divisor in range(2, bus_id)))
+
+    def test_starting_numbers(self) -> None:
+        '''Test that there are at most six distinct starting numbers'''
+        self.assertEqual(len(set(generate(15, 1000).strip().split(','))), 6)
+        self.assertEqual(len(generate(15, 2).strip().split(',')), 2)
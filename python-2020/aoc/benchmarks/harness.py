@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+# Advent of Code 2020
+'''
+Time the solver of each day on generated inputs of growing sizes, fit the exponent of its
+running time against the size, and save the results as JSON to compare them between commits.
+'''
+from __future__ import annotations
+import contextlib
+import io
+import math
+import multiprocessing
+import os
+import platform
+import tempfile
+import time
+import types
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+import unittest
+
+from aoc.benchmarks.generators import generate
+from aoc.cli import add_days_argument, build_parser, load_json, parse_days_arguments, save_json
+from aoc.runner import load_day
+
+
+# Generated seat layouts may oscillate forever, so day 11 is timed over a fixed number of rounds
+SEAT_LAYOUT_ROUNDS = 10
+
+
+class Benchmark(NamedTuple):
+    '''Class to represent the solver of a day and the input sizes to time it with'''
+    name: str
+    sizes: Sequence[int]
+    solve: Callable[[Any, str, int], Any]
+
+
+def decode_boarding_passes(day: Any, filename: str) -> int:
+    '''Return the highest seat ID of the boarding passes of a file'''
+    with open(filename, 'r', encoding='utf-8') as input_file:
+        return max(day.decode_boarding_pass(line.strip().translate(str.maketrans('FBLR', '0101')))
+                   for line in input_file)
+
+
+BENCHMARKS: Dict[int, Benchmark] = {
+    1: Benchmark('solve_part1', (100, 200, 400, 800),
+                 lambda day, filename, size: day.solve_part1(day.parse_input(filename))),
+    2: Benchmark('solve_part2', (1000, 2000, 4000, 8000),
+                 lambda day, filename, size: day.solve_part2(day.parse_input(filename))),
+    3: Benchmark('solve_part2', (1000, 2000, 4000, 8000),
+                 lambda day, filename, size: day.solve_part2(day.parse_input(filename))),
+    4: Benchmark('validate_passports', (500, 1000, 2000, 4000),
+                 lambda day, filename, size: day.validate_passports(filename, True)),
+    5: Benchmark('decode_boarding_pass', (1000, 2000, 4000, 8000),
+                 lambda day, filename, size: decode_boarding_passes(day, filename)),
+    6: Benchmark('count_common_group_answers', (1000, 2000, 4000, 8000),
+                 lambda day, filename, size: day.count_common_group_answers(
+                     day.load_input_file(filename))),
+    7: Benchmark('count_bag_containers', (250, 500, 1000, 2000),
+                 lambda day, filename, size: day.count_bag_containers(
+                     day.load_input_file(filename), 'shiny gold')),
+    8: Benchmark('execute_program_after_instruction_change', (100, 200, 400, 800),
+                 lambda day, filename, size: day.execute_program_after_instruction_change(
+                     filename)),
+    9: Benchmark('find_encoding_error', (250, 500, 1000, 2000),
+                 lambda day, filename, size: day.find_encoding_error(filename, 25)),
+    10: Benchmark('calculate_distinct_ways', (1000, 2000, 4000, 8000),
+                  lambda day, filename, size: day.calculate_distinct_ways(filename)),
+    11: Benchmark('update_seat_matrix', (25, 50, 100, 200),
+                  lambda day, filename, size: day.update_seat_matrix(day.load_matrix(filename),
+                                                                     SEAT_LAYOUT_ROUNDS)),
+    12: Benchmark('solve_part2', (1000, 2000, 4000, 8000),
+                  lambda day, filename, size: day.solve_part2(day.parse_input(filename))),
+    13: Benchmark('solve_part2', (50, 100, 200, 400),
+                  lambda day, filename, size: day.solve_part2(day.parse_input(filename))),
+    14: Benchmark('solve', (100, 200, 400, 800),
+                  lambda day, filename, size: day.solve(filename, version_one=False,
+                                                        symbolic=False)),
+    15: Benchmark('solve_part1', (20000, 40000, 80000, 160000),
+                  lambda day, filename, size: day.solve_part1(day.load_input_file(filename),
+                                                              size)),
+}
+
+
+def measure(day: int, size: int, seed: int = 0, repeat: int = 3) -> float:
+    '''Return the best time in seconds of the solver of a day on a generated input'''
+    module = load_day(day)
+    durations = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, f'day_{day}_{size}.txt')
+
+        with open(filename, 'w', encoding='utf-8') as input_file:
+            input_file.write(generate(day, size, seed))
+
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            BENCHMARKS[day].solve(module, filename, size)
+            durations.append(time.perf_counter() - start_time)
+
+    return min(durations)
+
+
+def measure_sizes(day: int, sizes: Sequence[int], seed: int = 0,
+                  repeat: int = 3) -> List[float]:
+    '''Return the best time in seconds of the solver of a day for each size'''
+    return [measure(day, size, seed, repeat) for size in sizes]
+
+
+def fit_exponent(sizes: Sequence[int], durations: Sequence[float]) -> float:
+    '''
+    Return the slope of the least squares line through the points (log size, log duration),
+    which is k when the duration grows like size ** k
+    '''
+    if len(sizes) < 2 or len(sizes) != len(durations):
+        raise ValueError('at least two sizes with one duration each are needed')
+
+    points = [(math.log(size), math.log(max(duration, 1e-9)))
+              for size, duration in zip(sizes, durations)]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+
+    if variance == 0:
+        raise ValueError('the sizes must not all be the same')
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def run_benchmarks(days: Sequence[int], sizes: Optional[Sequence[int]] = None, seed: int = 0,
+                   repeat: int = 3) -> Dict[str, Any]:
+    '''
+    Time the solver of each day across its sizes, each day in a fresh process, and return the
+    results with the fitted exponents
+    '''
+    results: Dict[str, Any] = {'python': platform.python_version(), 'seed': seed,
+                               'repeat': repeat, 'days': {}}
+    context = multiprocessing.get_context('spawn')
+
+    for day in days:
+        day_sizes = list(sizes or BENCHMARKS[day].sizes)
+
+        with context.Pool(1) as pool:
+            durations = pool.apply(measure_sizes, (day, day_sizes, seed, repeat))
+
+        results['days'][str(day)] = {'solver': BENCHMARKS[day].name, 'sizes': day_sizes,
+                                     'seconds': durations,
+                                     'exponent': fit_exponent(day_sizes, durations)
+                                                 if len(day_sizes) > 1 else None}
+
+    return results
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, float]:
+    '''
+    Return for each day in both results the ratio of the current time to the baseline time at
+    the largest size they have in common
+    '''
+    ratios = {}
+
+    for day, result in current['days'].items():
+        if day not in baseline['days']:
+            continue
+
+        baseline_seconds = dict(zip(baseline['days'][day]['sizes'],
+                                    baseline['days'][day]['seconds']))
+        common_sizes = [size for size in result['sizes'] if size in baseline_seconds]
+
+        if common_sizes:
+            size = max(common_sizes)
+            ratios[day] = (result['seconds'][result['sizes'].index(size)] /
+                           max(baseline_seconds[size], 1e-9))
+
+    return ratios
+
+
+def format_results(results: Dict[str, Any], ratios: Optional[Dict[str, float]] = None) -> str:
+    '''Format the results as a table with one row per day'''
+    lines = [f'{"Day":>3}  {"Solver":<40}  {"Exponent":>8}  {"Largest (s)":>11}  '
+             f'{"Baseline":>8}']
+
+    for day, result in results['days'].items():
+        ratio = f'{ratios[day]:.2f}x' if ratios and day in ratios else '-'
+        exponent = f'{result["exponent"]:.2f}' if result['exponent'] is not None else '-'
+        lines.append(f'{day:>3}  {result["solver"]:<40}  {exponent:>8}  '
+                     f'{result["seconds"][-1]:>11.4f}  {ratio:>8}')
+
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    '''Parse the command line, run the benchmarks and print or save their results'''
+    parser = build_parser('python -m aoc.benchmarks', __doc__)
+    add_days_argument(parser, 'days to benchmark, all of them by default')
+    parser.add_argument('--sizes', type=lambda sizes: [int(size) for size in sizes.split(',')],
+                        help='comma separated input sizes instead of those of each day')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the input generators')
+    parser.add_argument('--repeat', type=int, default=3, help='runs kept for the best time')
+    parser.add_argument('--output', help='file to save the results to as JSON')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare with')
+    arguments = parse_days_arguments(parser, argv, BENCHMARKS, 'benchmark')
+    results = run_benchmarks(arguments.days or sorted(BENCHMARKS), arguments.sizes,
+                             arguments.seed, arguments.repeat)
+    ratios = None
+
+    if arguments.baseline:
+        ratios = compare_results(load_json(arguments.baseline), results)
+
+    if arguments.output:
+        save_json(arguments.output, results)
+
+    print(format_results(results, ratios))
+    return 0
+
+
+class Tests(unittest.TestCase):
+    '''Tests'''
+
+    def test_fit_exponent(self) -> None:
+        '''Test that the exponent of a power law is found'''
+        self.assertAlmostEqual(fit_exponent([10, 20, 40], [0.5, 2.0, 8.0]), 2.0)
+        self.assertAlmostEqual(fit_exponent([10, 100], [0.0, 0.0]), 0.0)
+
+        for sizes, durations in (([10], [1.0]), ([10, 20], [1.0]), ([10, 10], [1.0, 2.0])):
+            with self.subTest(sizes=sizes, durations=durations):
+                with self.assertRaises(ValueError):
+                    fit_exponent(sizes, durations)
+
+    def test_measure(self) -> None:
+        '''Test that the solvers run on generated inputs'''
+        for day in (13, 14, 15):
+            with self.subTest(day=day):
+                self.assertGreater(measure(day, BENCHMARKS[day].sizes[0], repeat=1), 0)
+
+        self.assertEqual(len(measure_sizes(13, [50, 100], repeat=1)), 2)
+
+    def test_decode_boarding_passes(self) -> None:
+        '''Test that the highest seat ID of a file of boarding passes is returned'''
+        day = types.SimpleNamespace(decode_boarding_pass=lambda code: int(code, 2))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'boarding_passes.txt')
+
+            with open(filename, 'w', encoding='utf-8') as input_file:
+                input_file.write('FBFBBFFRLR\nBFFFBBFRRR\nFFFBBBFRRR\n')
+
+            self.assertEqual(decode_boarding_passes(day, filename), 567)
+
+    def test_run_benchmarks(self) -> None:
+        '''Test that the solvers of other days run on generated inputs in a fresh process'''
+        results = run_benchmarks([7, 10], sizes=[50, 100], seed=1, repeat=1)
+        self.assertEqual(sorted(results['days']), ['10', '7'])
+        self.assertEqual(results['days']['7']['sizes'], [50, 100])
+        self.assertEqual(results['days']['10']['solver'], 'calculate_distinct_ways')
+        self.assertEqual(len(results['days']['10']['seconds']), 2)
+
+    def test_compare_results(self) -> None:
+        '''Test that the times are compared at the largest common size'''
+        baseline = {'days': {'1': {'sizes': [10, 20, 40], 'seconds': [1.0, 2.0, 4.0]},
+                             '2': {'sizes': [10], 'seconds': [1.0]}}}
+        current = {'days': {'1': {'sizes': [10, 20], 'seconds': [1.0, 3.0]},
+                            '2': {'sizes': [20], 'seconds': [1.0]},
+                            '3': {'sizes': [10], 'seconds': [1.0]}}}
+        self.assertEqual(compare_results(baseline, current), {'1': 1.5})
+
+    def test_main(self) -> None:
+        '''Test that the results are saved and compared with a baseline'''
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'results.json')
+            output = io.StringIO()
+
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(main(['15', '--sizes', '100,1000', '--repeat', '1',
+                                       '--output', filename]), 0)
+                self.assertEqual(main(['15', '--sizes', '1000', '--repeat', '1',
+                                       '--baseline', filename]), 0)
+
+            self.assertEqual(load_json(filename)['days']['15']['sizes'], [100, 1000])
+
+        table = output.getvalue().splitlines()
+        self.assertTrue(table[1].startswith(' 15  solve_part1'))
+        self.assertTrue(table[1].endswith('  -'))
+        self.assertTrue(table[3].endswith('x'))
+        self.assertEqual(table[3].split()[2], '-')
+
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(['16'])
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+# Advent of Code 2020
+'''
+Performance regression checks, marked as benchmarks so the main test run skips them. Run them
+with `pytest -m benchmark --no-cov`. They are kept out of the modules they check so that only
+the test run needs pytest.
+'''
+import unittest
+
+import pytest
+
+from aoc.benchmarks.gate import check_budgets
+from aoc.runner import load_day
+
+
+class BenchmarkTests(unittest.TestCase):
+    '''Performance regression checks, only run with -m benchmark'''
+
+    part2_different_starting_numbers = (
+        ([0, 3, 6], 175594),
+        ([1, 3, 2], 2578),
+        ([2, 1, 3], 3544142),
+        ([1, 2, 3], 261214),
+        ([2, 3, 1], 6895259),
+        ([3, 2, 1], 18),
+        ([3, 1, 2], 362),
+    )
+
+    @pytest.mark.benchmark
+    def test_budgets(self) -> None:
+        '''Test that every budgeted part stays within its budget'''
+        self.assertEqual(check_budgets(), [])
+
+    @pytest.mark.benchmark
+    def test_solve_many_part2(self) -> None:
+        '''Test the solve_many function of day 15 for part 2'''
+        cases = self.part2_different_starting_numbers
+        self.assertEqual(load_day(15).solve_many([numbers for numbers, _ in cases], 30000000),
+                         [last_spoken_number for _, last_spoken_number in cases])
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+
+# Advent of Code 2020
+'''
+Cache of parsed puzzle inputs, so that repeated runs over the same input skip parsing.
+
+Each entry is keyed by the SHA-256 of the input file and the name and version of its parser,
+so editing the input or bumping the parser version misses the old entry. Entries are pickled
+with protocol 5, and the least recently used ones are evicted once the cache grows beyond its
+size limit. An entry that can no longer be unpickled, for instance because a class it refers to
+was renamed or moved, counts as a miss and is replaced.
+'''
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, List, Optional, Tuple
+import unittest
+from unittest import mock
+
+
+PICKLE_PROTOCOL = 5
+ENTRY_SUFFIX = '.pickle'
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+def default_cache_directory() -> str:
+    '''Return the directory named by AOC_CACHE_DIR, or one under the user cache directory'''
+    return os.environ.get('AOC_CACHE_DIR') or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+        'advent-of-code-2020')
+
+
+class InputCache:
+    '''
+    Directory of pickled parsed inputs with least recently used eviction. The entries are only
+    ever written by this class, so they are trusted when unpickled.
+    '''
+
+    def __init__(self, directory: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError(f'max_bytes must not be negative, got {max_bytes}')
+
+        self.directory = directory or default_cache_directory()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def entry_path(self, content: bytes, parser_name: str, parser_version: int) -> str:
+        '''Return the path of the entry of an input parsed by a version of a parser'''
+        digest = hashlib.sha256(content).hexdigest()
+        return os.path.join(self.directory,
+                            f'{parser_name}-v{parser_version}-{digest}{ENTRY_SUFFIX}')
+
+    def load(self, filename: str, parser: Callable[[str], Any], parser_name: str,
+             parser_version: int) -> Any:
+        '''
+        Return the parsed input of a file, parsing it only when it is not cached yet or when its
+        entry cannot be unpickled, in which case the entry is replaced
+        '''
+        with open(filename, 'rb') as input_file:
+            path = self.entry_path(input_file.read(), parser_name, parser_version)
+
+        try:
+            with open(path, 'rb') as entry_file:
+                parsed = pickle.load(entry_file)  # nosec B301
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self.misses += 1
+            parsed = parser(filename)
+            self.store(path, parsed)
+        else:
+            self.hits += 1
+            os.utime(path)
+
+        return parsed
+
+    def store(self, path: str, parsed: Any) -> None:
+        '''Write an entry atomically, then evict entries until the cache fits its size limit'''
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+
+        with os.fdopen(descriptor, 'wb') as entry_file:
+            pickle.dump(parsed, entry_file, protocol=PICKLE_PROTOCOL)
+
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        '''Return the last use time, size and path of each entry, least recently used first'''
+        entries = []
+
+        for name in os.listdir(self.directory):
+            if name.endswith(ENTRY_SUFFIX):
+                status = os.stat(os.path.join(self.directory, name))
+                entries.append((status.st_mtime, status.st_size,
+                                os.path.join(self.directory, name)))
+
+        return sorted(entries)
+
+    def size(self) -> int:
+        '''Return the total size of the entries in bytes'''
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> None:
+        '''Remove the least recently used entries until the cache fits its size limit'''
+        entries = self.entries()
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total_size <= self.max_bytes:
+                break
+
+            os.remove(path)
+            total_size -= size
+
+    def clear(self) -> None:
+        '''Remove every entry'''
+        for _, _, path in self.entries():
+            os.remove(path)
+
+
+class Tests(unittest.TestCase):
+    '''Tests'''
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+        self.calls: List[str] = []
+
+    def write_input(self, name: str, content: str) -> str:
+        '''Write an input file and return its path'''
+        filename = os.path.join(self.directory.name, name)
+
+        with open(filename, 'w', encoding='utf-8') as input_file:
+            input_file.write(content)
+
+        return filename
+
+    def parse(self, filename: str) -> List[int]:
+        '''Parse numbers, recording each call'''
+        self.calls.append(filename)
+
+        with open(filename, 'r', encoding='utf-8') as input_file:
+            return [int(number) for number in input_file.read().split()]
+
+    def test_load(self) -> None:
+        '''Test that an input is parsed once per content and parser version'''
+        cache = InputCache(os.path.join(self.directory.name, 'cache'))
+        filename = self.write_input('input.txt', '1 2 3')
+        other_filename = self.write_input('other.txt', '1 2 3')
+
+        self.assertEqual(cache.load(filename, self.parse, 'numbers', 1), [1, 2, 3])
+        self.assertEqual(cache.load(other_filename, self.parse, 'numbers', 1), [1, 2, 3])
+        self.assertEqual(cache.load(filename, self.parse, 'numbers', 2), [1, 2, 3])
+        self.write_input('input.txt', '4 5')
+        self.assertEqual(cache.load(filename, self.parse, 'numbers', 1), [4, 5])
+
+        self.assertEqual(self.calls, [filename, filename, filename])
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        self.assertEqual(len(cache.entries()), 3)
+
+    def test_load_corrupted_entry(self) -> None:
+        '''Test that a corrupted entry is parsed and written again'''
+        cache = InputCache(os.path.join(self.directory.name, 'cache'))
+        filename = self.write_input('input.txt', '1 2 3')
+        cache.load(filename, self.parse, 'numbers', 1)
+
+        with open(cache.entries()[0][2], 'wb') as entry_file:
+            entry_file.write(b'not a pickle')
+
+        self.assertEqual(cache.load(filename, self.parse, 'numbers', 1), [1, 2, 3])
+        self.assertEqual(cache.load(filename, self.parse, 'numbers', 1), [1, 2, 3])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_load_stale_entry(self) -> None:
+        '''Test that an entry referring to a class that no longer exists is parsed again'''
+        cache = InputCache(os.path.join(self.directory.name, 'cache'))
+        filename = self.write_input('input.txt', '1 2 3')
+        cache.load(filename, self.parse, 'numbers', 1)
+
+        for stale_entry in (b'\x80\x05cos\nRenamedClass\n.', b'\x80\x05cmoved_module\nClass\n.'):
+            with self.subTest(stale_entry=stale_entry):
+                with open(cache.entries()[0][2], 'wb') as entry_file:
+                    entry_file.write(stale_entry)
+
+                self.assertEqual(cache.load(filename, self.parse, 'numbers', 1), [1, 2, 3])
+                self.assertEqual(cache.load(filename, self.parse, 'numbers', 1), [1, 2, 3])
+
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        self.assertEqual(len(cache.entries()), 1)
+
+    def test_evict(self) -> None:
+        '''Test that the least recently used entries are evicted first'''
+        cache = InputCache(os.path.join(self.directory.name, 'cache'))
+        filenames = [self.write_input(f'input{index}.txt', str(index)) for index in range(3)]
+
+        for index, filename in enumerate(filenames):
+            cache.load(filename, self.parse, 'numbers', 1)
+            os.utime(cache.entries()[-1][2], (index, index))
+
+        entry_size = cache.size() // 3
+        cache.load(filenames[0], self.parse, 'numbers', 1)
+        cache.max_bytes = 2 * entry_size
+        cache.evict()
+        self.assertEqual(cache.size(), 2 * entry_size)
+
+        cache.load(filenames[1], self.parse, 'numbers', 1)
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+        cache.clear()
+        self.assertEqual(cache.entries(), [])
+
+    def test_entries_skip_other_files(self) -> None:
+        '''Test that files other than entries in the cache directory are left alone'''
+        cache = InputCache(os.path.join(self.directory.name, 'cache'))
+        other_path = os.path.join(cache.directory, 'notes.txt')
+
+        with open(other_path, 'w', encoding='utf-8') as other_file:
+            other_file.write('not an entry')
+
+        cache.load(self.write_input('input.txt', '1 2 3'), self.parse, 'numbers', 1)
+        self.assertEqual(len(cache.entries()), 1)
+
+        cache.clear()
+        self.assertEqual(cache.entries(), [])
+        self.assertTrue(os.path.exists(other_path))
+
+    def test_evict_everything(self) -> None:
+        '''Test that an entry larger than the size limit is evicted right after being stored'''
+        cache = InputCache(os.path.join(self.directory.name, 'cache'), max_bytes=0)
+        filename = self.write_input('input.txt', '1 2 3')
+
+        self.assertEqual(cache.load(filename, self.parse, 'numbers', 1), [1, 2, 3])
+        self.assertEqual(cache.entries(), [])
+        cache.evict()
+        self.assertEqual(cache.load(filename, self.parse, 'numbers', 1), [1, 2, 3])
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_default_cache_directory(self) -> None:
+        '''Test that the cache directory can be chosen through the environment'''
+        with mock.patch.dict(os.environ, {'AOC_CACHE_DIR': self.directory.name}):
+            self.assertEqual(InputCache().directory, self.directory.name)
+
+        with mock.patch.dict(os.environ, {'AOC_CACHE_DIR': '',
+                                          'XDG_CACHE_HOME': self.directory.name}):
+            self.assertEqual(default_cache_directory(),
+                             os.path.join(self.directory.name, 'advent-of-code-2020'))
+
+        with self.assertRaises(ValueError):
+            InputCache(self.directory.name, max_bytes=-1)
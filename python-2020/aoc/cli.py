@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+# Advent of Code 2020
+'''
+Command line helpers shared by the runner, the benchmarks and the performance gate.
+'''
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+from typing import Any, Collection, Optional, Sequence
+import unittest
+
+
+def build_parser(prog: str, description: Optional[str]) -> argparse.ArgumentParser:
+    '''Return a parser whose description keeps the line breaks of a module docstring'''
+    return argparse.ArgumentParser(prog=prog, description=description,
+                                   formatter_class=argparse.RawDescriptionHelpFormatter)
+
+
+def add_days_argument(parser: argparse.ArgumentParser, help_text: str) -> None:
+    '''Add the optional list of days to a parser'''
+    parser.add_argument('days', nargs='*', type=int, metavar='DAY', help=help_text)
+
+
+def parse_days_arguments(parser: argparse.ArgumentParser, argv: Optional[Sequence[str]],
+                         days: Collection[int], noun: str) -> argparse.Namespace:
+    '''Parse the command line, exiting with an error on a day that has no such noun'''
+    arguments = parser.parse_args(argv)
+
+    for day in arguments.days:
+        if day not in days:
+            parser.error(f'no {noun} for day {day}, choose from {min(days)} to {max(days)}')
+
+    return arguments
+
+
+def load_json(filename: str) -> Any:
+    '''Load a JSON file'''
+    with open(filename, 'r', encoding='utf-8') as json_file:
+        return json.load(json_file)
+
+
+def save_json(filename: str, data: Any) -> None:
+    '''Save data as an indented JSON file ending with a newline'''
+    with open(filename, 'w', encoding='utf-8') as json_file:
+        json.dump(data, json_file, indent=2)
+        json_file.write('\n')
+
+
+class Tests(unittest.TestCase):
+    '''Tests'''
+
+    def test_parse_days_arguments(self) -> None:
+        '''Test that only the available days are accepted'''
+        parser = build_parser('test', 'First line\n  second line')
+        add_days_argument(parser, 'days to run')
+        self.assertEqual(parse_days_arguments(parser, ['2', '3'], (1, 2, 3), 'puzzle').days,
+                         [2, 3])
+        self.assertEqual(parse_days_arguments(parser, [], (1, 2, 3), 'puzzle').days, [])
+        self.assertIn('\n  second line', parser.format_help())
+        error = io.StringIO()
+
+        with contextlib.redirect_stderr(error), self.assertRaises(SystemExit):
+            parse_days_arguments(parser, ['4'], (1, 2, 3), 'puzzle')
+
+        self.assertIn('no puzzle for day 4, choose from 1 to 3', error.getvalue())
+
+    def test_save_and_load_json(self) -> None:
+        '''Test that saved data loads back the same'''
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'data.json')
+            save_json(filename, {'days': [1, 2]})
+            self.assertEqual(load_json(filename), {'days': [1, 2]})
+
+            with open(filename, 'r', encoding='utf-8') as json_file:
+                self.assertTrue(json_file.read().endswith('}\n'))
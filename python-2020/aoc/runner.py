@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+
+# Advent of Code 2020
+'''
+Run the puzzles of the chosen days and parts, each one in a fresh process, and report the
+answer, wall time, CPU time and peak resident set size of each part as a table or as JSON.
+
+Each day module provides INPUT_FILENAME, PARSER_VERSION, parse_input, solve_part1 and
+solve_part2. The unit tests of the days are never run, only those functions.
+'''
+from __future__ import annotations
+import contextlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from types import ModuleType
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence
+import unittest
+from unittest import mock
+
+from aoc.cache import InputCache, default_cache_directory
+from aoc.cli import add_days_argument, build_parser, parse_days_arguments
+
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAYS = tuple(range(1, 16))
+PARTS = (1, 2)
+
+
+class Puzzle(NamedTuple):
+    '''
+    Class to represent how a day parses its input and solves both parts of its puzzle, taken from
+    the INPUT_FILENAME, PARSER_VERSION, parse_input, solve_part1 and solve_part2 of its module
+    '''
+    input_filename: str
+    parser_version: int
+    parse: Callable[[str], Any]
+    part1: Callable[[Any], Any]
+    part2: Callable[[Any], Any]
+
+    def solver(self, part: int) -> Callable[[Any], Any]:
+        '''Return the solver of a part'''
+        return self.part1 if part == 1 else self.part2
+
+
+class PartResult(NamedTuple):
+    '''Class to represent the answer and resource usage of a part'''
+    day: int
+    part: int
+    answer: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss_kb: int
+
+
+def peak_rss_kb() -> int:
+    '''Return the peak resident set size of the process in kilobytes'''
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def load_day(day: int) -> ModuleType:
+    '''Import the module of a day from its directory without running its tests'''
+    name = f'day{day}'
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(ROOT_DIRECTORY, f'day_{day}', f'{name}.py'))
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_puzzle(day: int) -> Puzzle:
+    '''Return the input, parser and solvers of the puzzle of a day'''
+    module = load_day(day)
+
+    return Puzzle(module.INPUT_FILENAME, module.PARSER_VERSION, module.parse_input,
+                  module.solve_part1, module.solve_part2)
+
+
+def parse_input(day: int, cache_directory: Optional[str] = None) -> Any:
+    '''Parse the input of a day, through the cache when a directory is given'''
+    puzzle = load_puzzle(day)
+    filename = os.path.join(ROOT_DIRECTORY, f'day_{day}', puzzle.input_filename)
+
+    if cache_directory is None:
+        return puzzle.parse(filename)
+
+    return InputCache(cache_directory).load(filename, puzzle.parse, f'day{day}',
+                                            puzzle.parser_version)
+
+
+def solve(day: int, part: int, cache_directory: Optional[str] = None) -> Any:
+    '''Return the answer of a part of the puzzle of a day'''
+    return load_puzzle(day).solver(part)(parse_input(day, cache_directory))
+
+
+def measure_part(day: int, part: int, cache_directory: Optional[str] = None) -> PartResult:
+    '''
+    Parse the input and solve a part, and return its answer with the wall time, the CPU time and
+    the peak resident set size of the process in kilobytes.
+    '''
+    puzzle = load_puzzle(day)
+    start_wall_time = time.perf_counter()
+    start_cpu_time = time.process_time()
+    answer = puzzle.solver(part)(parse_input(day, cache_directory))
+    cpu_time = time.process_time() - start_cpu_time
+    wall_time = time.perf_counter() - start_wall_time
+
+    return PartResult(day, part, str(answer), wall_time, cpu_time, peak_rss_kb())
+
+
+def run(days: Sequence[int], parts: Sequence[int] = PARTS,
+        cache_directory: Optional[str] = None) -> List[PartResult]:
+    '''Measure each part of each day in a fresh process so its peak memory is its own'''
+    results = []
+    context = multiprocessing.get_context('spawn')
+
+    for day in days:
+        for part in parts:
+            with context.Pool(1) as pool:
+                results.append(pool.apply(measure_part, (day, part, cache_directory)))
+
+    return results
+
+
+def format_table(results: Sequence[PartResult]) -> str:
+    '''Format the results as a table with one row per part'''
+    rows = [('Day', 'Part', 'Answer', 'Wall (s)', 'CPU (s)', 'Peak RSS (KiB)')]
+    rows.extend((str(result.day), str(result.part), result.answer,
+                 f'{result.wall_seconds:.3f}', f'{result.cpu_seconds:.3f}',
+                 str(result.peak_rss_kb)) for result in results)
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+
+    return '\n'.join('  '.join(cell.rjust(width) for cell, width in zip(row, widths))
+                     for row in rows)
+
+
+def format_json(results: Sequence[PartResult]) -> str:
+    '''Format the results as a JSON list with one object per part'''
+    return json.dumps([result._asdict() for result in results], indent=2)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    '''Parse the command line, run the chosen puzzles and print their report'''
+    parser = build_parser('python -m aoc', __doc__)
+    add_days_argument(parser, 'days to run, all of them by default')
+    parser.add_argument('-p', '--part', type=int, choices=PARTS, action='append',
+                        dest='parts', help='part to run, both of them by default')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--cache', action='store_true',
+                        help='reuse parsed inputs from the cache directory')
+    parser.add_argument('--cache-dir', help='cache directory to use, implies --cache')
+    arguments = parse_days_arguments(parser, argv, DAYS, 'puzzle')
+    cache_directory = arguments.cache_dir or (default_cache_directory() if arguments.cache
+                                              else None)
+    results = run(arguments.days or DAYS, arguments.parts or PARTS, cache_directory)
+    print(format_json(results) if arguments.json else format_table(results))
+    return 0
+
+
+class Tests(unittest.TestCase):
+    '''Tests'''
+
+    def test_solve(self) -> None:
+        '''Test that solve returns the answers of a day'''
+        self.assertEqual(solve(13, 1), 3035)
+        self.assertEqual(solve(13, 2), 725169163285238)
+
+    def test_solve_with_cache(self) -> None:
+        '''Test that a parsed input is cached and then reused'''
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(solve(13, 1, directory), 3035)
+            entries = InputCache(directory).entries()
+            self.assertEqual(len(entries), 1)
+            self.assertTrue(os.path.basename(entries[0][2]).startswith('day13-v1-'))
+
+            result = measure_part(13, 2, directory)
+            self.assertEqual(result.answer, '725169163285238')
+            self.assertEqual(InputCache(directory).entries()[0][1:], entries[0][1:])
+
+            self.assertEqual(parse_input(14, directory), parse_input(14))
+            self.assertEqual(len(InputCache(directory).entries()), 2)
+
+    def test_load_day(self) -> None:
+        '''Test that a day is only imported once'''
+        self.assertIs(load_day(14), load_day(14))
+        self.assertTrue(hasattr(load_day(14), 'Tests'))
+
+    def test_load_day_import(self) -> None:
+        '''Test that a day not imported yet is loaded from its file and registered'''
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop('day13', None)
+            module = load_day(13)
+
+            self.assertIs(sys.modules['day13'], module)
+            self.assertEqual(module.__file__, os.path.join(ROOT_DIRECTORY, 'day_13', 'day13.py'))
+            self.assertEqual(module.solve_part1(module.parse_input(module.INPUT_FILENAME)), 3035)
+
+    def test_measure_part(self) -> None:
+        '''Test that measure_part reports the answer and resource usage of a part'''
+        result = measure_part(15, 1)
+        self.assertEqual((result.day, result.part, result.answer), (15, 1, '1373'))
+        self.assertGreaterEqual(result.wall_seconds, 0)
+        self.assertGreaterEqual(result.cpu_seconds, 0)
+        self.assertGreater(result.peak_rss_kb, 0)
+
+    def test_run(self) -> None:
+        '''Test that run measures each part in a fresh process, in order'''
+        results = run([1, 8], [2, 1])
+        self.assertEqual([(result.day, result.part, result.answer) for result in results],
+                         [(1, 2, '295086480'), (1, 1, '1020084'), (8, 2, '1149'),
+                          (8, 1, '1816')])
+
+    def test_format_table(self) -> None:
+        '''Test the table report'''
+        self.assertEqual(format_table([PartResult(3, 1, '173', 0.0123, 0.01, 9876),
+                                       PartResult(3, 2, '4385176320', 1.5, 1.25, 10240)]),
+                         'Day  Part      Answer  Wall (s)  CPU (s)  Peak RSS (KiB)\n'
+                         '  3     1         173     0.012    0.010            9876\n'
+                         '  3     2  4385176320     1.500    1.250           10240')
+
+    def test_main(self) -> None:
+        '''Test the command line as a table and as JSON'''
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(['6', '-p', '1']), 0)
+
+        self.assertIn('6612', output.getvalue())
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(['--json', '-p', '2', '6']), 0)
+
+        report = json.loads(output.getvalue())
+        self.assertEqual([(part['day'], part['part'], part['answer']) for part in report],
+                         [(6, 2, '3268')])
+
+        with tempfile.TemporaryDirectory() as directory:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(main(['7', '8', '11', '12', '-p', '1',
+                                       '--cache-dir', directory]), 0)
+                self.assertEqual(main(['7', '--cache-dir', directory, '--json']), 0)
+
+            self.assertEqual(sorted(os.path.basename(entry[2]).split('-')[0]
+                                    for entry in InputCache(directory).entries()),
+                             ['day11', 'day12', 'day7', 'day8'])
+
+        with mock.patch.dict(os.environ, {'AOC_CACHE_DIR': 'cache'}), \
+                mock.patch('aoc.runner.run', return_value=[]) as run_mock, \
+                contextlib.redirect_stdout(io.StringIO()):
+            main(['--cache', '-p', '1'])
+
+        run_mock.assert_called_once_with(DAYS, [1], 'cache')
+
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(['16'])
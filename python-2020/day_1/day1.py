@@ -1,16 +1,25 @@
 #!/usr/bin/env python3
 
+import os
 from itertools import combinations
 
 # Advent of Code 2020, Day 1
-amounts = []
+INPUT_FILENAME = 'day_1_input'
+PARSER_VERSION = 1
 
-with open('day_1_input', 'r') as input:
-    for line in input:
-        amounts.append(int(line))
-    
-answer1 = [(x * y) for (x, y) in combinations(amounts, 2) if (x + y) == 2020]
-print(f'Part 1: {answer1[0]}')
+def parse_input(filename):
+    with open(os.path.join(os.path.dirname(__file__), filename), 'r') as input:
+        return [int(line) for line in input]
 
-answer2 = [(x * y * z) for (x, y, z) in combinations(amounts, 3) if (x + y + z) == 2020]
-print(f'Part 2: {answer2[0]}')
+def solve_part1(amounts):
+    answer1 = [(x * y) for (x, y) in combinations(amounts, 2) if (x + y) == 2020]
+    return answer1[0]
+
+def solve_part2(amounts):
+    answer2 = [(x * y * z) for (x, y, z) in combinations(amounts, 3) if (x + y + z) == 2020]
+    return answer2[0]
+
+if __name__ == '__main__':
+    amounts = parse_input(INPUT_FILENAME)
+    print(f'Part 1: {solve_part1(amounts)}')
+    print(f'Part 2: {solve_part2(amounts)}')
@@ -170,24 +170,15 @@ outlet to your device?
 '''
 
 import os
-from typing import Iterable, Tuple, TypedDict, List, Set
-from itertools import combinations
-from functools import reduce
-from operator import mul
+from typing import Iterable, Tuple, Optional, Sequence
 import unittest
 
 
-class JoltageSets(TypedDict):
-    '''Typing for joltage sets'''
-    prev: int
-    set: Set[int]
-    next: int
-    combinations: List[Set[int]]
-
-
 TEST_1_INPUT_FILENAME = 'day_10_small_input_1.txt'
 TEST_2_INPUT_FILENAME = 'day_10_small_input_2.txt'
 INPUT_FILENAME = 'day_10_input.txt'
+PARSER_VERSION = 1
+DEFAULT_TOLERANCE = 3
 
 
 def load_input_file(filename: str) -> Iterable[str]:
@@ -196,15 +187,23 @@ def load_input_file(filename: str) -> Iterable[str]:
         return map(str.strip, input_file.readlines())
 
 
+def parse_input(filename: str) -> Tuple[int, ...]:
+    '''Parse the joltages of the adapters.'''
+    return tuple(map(int, load_input_file(filename)))
+
+
 def find_joltage_differences(filename: str) -> Tuple[int, int]:
     '''Find the number of 3-jolt and 1-jolt differences.'''
+    return count_joltage_differences(parse_input(filename))
+
+
+def count_joltage_differences(joltages: Sequence[int]) -> Tuple[int, int]:
+    '''Count the 1-jolt and 3-jolt differences of the chain of all the adapters.'''
     differences_of_1_jolt = 0
     differences_of_3_jolts = 0
     current_joltage = 0
 
-    joltages = sorted(tuple(map(int, load_input_file(filename))))
-
-    for joltage in joltages:
+    for joltage in sorted(joltages):
         if (current_joltage + 1) == joltage:
             differences_of_1_jolt += 1
         elif (current_joltage + 3) == joltage:
@@ -215,60 +214,59 @@ def find_joltage_differences(filename: str) -> Tuple[int, int]:
     return (differences_of_1_jolt, differences_of_3_jolts + 1)
 
 
-def length_of_valid_joltage_combinations(joltage_sets: List[JoltageSets]) -> int:
+def count_arrangements(joltages: Sequence[int],
+                       tolerance: int = DEFAULT_TOLERANCE,
+                       modulus: Optional[int] = None) -> int:
     '''
-    Filter the joltage combinations and return the product of the list of length of
-    the remaining groups of combinations
+    Count the distinct adapter chains from the outlet (0 jolts) to the device, which is rated
+    `tolerance` jolts above the highest adapter. Each adapter may take an input up to
+    `tolerance` jolts lower than its rating.
+
+    The number of ways to reach an adapter is the sum of the ways to reach every adapter within
+    `tolerance` jolts below it, which is kept as a running sum over a sliding window so each
+    adapter costs O(1) whatever the tolerance. When a modulus is given, counts are reduced
+    modulo it to keep them fixed-width.
     '''
-    length_of_combinations = []
+    if tolerance < 1:
+        raise ValueError(f'tolerance must be at least 1, got {tolerance}')
+    if modulus is not None and modulus < 1:
+        raise ValueError(f'modulus must be at least 1, got {modulus}')
 
-    for joltage_set in joltage_sets:
-        filtered_joltage_combinations = []
+    chain = [0, *sorted(joltages)]
+    chain.append(chain[-1] + tolerance)
+    ways = [1] + [0] * (len(chain) - 1)
+    window_start = 0
+    window_sum = 1
 
-        for length in range(1, len(joltage_set) + 1):
+    for position in range(1, len(chain)):
+        while chain[position] - chain[window_start] > tolerance:
+            window_sum -= ways[window_start]
+            window_start += 1
 
-            joltage_set_combinations = combinations(joltage_set['set'], length)
+        ways[position] = window_sum if modulus is None else window_sum % modulus
+        window_sum += ways[position]
 
-            for joltage_set_combination in joltage_set_combinations:
-                if (min(joltage_set_combination) - joltage_set['prev'] <= 3) and \
-                    (joltage_set['next'] - max(joltage_set_combination) <= 3):
-                    filtered_joltage_combinations.append(joltage_set_combination)
+    return ways[-1]
 
-        length_of_combinations.append(len(filtered_joltage_combinations))
 
-    return reduce(mul, length_of_combinations, 1)
-
-
-def calculate_distinct_ways(filename: str) -> int:
+def calculate_distinct_ways(filename: str,
+                            tolerance: int = DEFAULT_TOLERANCE,
+                            modulus: Optional[int] = None) -> int:
     '''
     Calculate the number of distinct ways to connect adapters together
     '''
-    position = 0
-    joltage_sets: List[JoltageSets] = []
-    current_set = set()
-
-    joltages = sorted(tuple(map(int, load_input_file(filename))))
-    joltages = [0, *joltages, max(joltages) + 3]
-
-    for position in range(1, len(joltages)):
-        try:
-            if (joltages[position + 1] - joltages[position]) < 3:
-                current_set.add(joltages[position])
-                current_set.add(joltages[position + 1])
-            else:
-                if len(current_set) >= 2:
-                    joltage_sets.append({
-                                        'prev': joltages[joltages.index(min(current_set)) - 1],
-                                        'set': current_set,
-                                        'next': joltages[position + 1],
-                                        'combinations': [],
-                                        })
-                current_set = set()
-
-        except IndexError:
-            pass
-
-    return length_of_valid_joltage_combinations(joltage_sets)
+    return count_arrangements(parse_input(filename), tolerance, modulus)
+
+
+def solve_part1(joltages: Sequence[int]) -> int:
+    '''Solve part 1 of the daily puzzle.'''
+    differences_of_1_jolt, differences_of_3_jolts = count_joltage_differences(joltages)
+    return differences_of_1_jolt * differences_of_3_jolts
+
+
+def solve_part2(joltages: Sequence[int]) -> int:
+    '''Solve part 2 of the daily puzzle.'''
+    return count_arrangements(joltages)
 
 
 class Tests(unittest.TestCase):
@@ -294,11 +292,43 @@ class Tests(unittest.TestCase):
         result = calculate_distinct_ways(TEST_2_INPUT_FILENAME)
         self.assertEqual(result, 19208)
 
+    def test_calculate_distinct_ways_with_modulus(self) -> None:
+        '''Test the modular counting mode of the distinct ways calculation.'''
+        result = calculate_distinct_ways(TEST_2_INPUT_FILENAME, modulus=1000)
+        self.assertEqual(result, 208)
+
+    def test_count_arrangements_with_tolerance(self) -> None:
+        '''Test the arrangement count for tolerances other than 3 jolts.'''
+        cases = (
+            ((1, 2, 3), 1, 1),
+            ((1, 3), 1, 0),
+            ((1, 2, 3), 2, 3),
+            ((1, 2, 3, 4), 4, 8),
+            ((1, 4, 5, 6, 7, 10, 11, 12, 15, 16, 19), 3, 8),
+            ((5, 10, 15), 5, 1),
+        )
+
+        for case in cases:
+            with self.subTest(case):
+                self.assertEqual(count_arrangements(case[0], tolerance=case[1]), case[2])
+
+    def test_count_arrangements_with_large_tolerance(self) -> None:
+        '''Test that a tolerance wider than the chain makes every adapter but the last optional.'''
+        result = count_arrangements(range(1, 101), tolerance=1000, modulus=1_000_000_007)
+        self.assertEqual(result, pow(2, 99, 1_000_000_007))
+
+    def test_count_arrangements_with_invalid_arguments(self) -> None:
+        '''Test that invalid tolerances and moduli are rejected.'''
+        with self.assertRaises(ValueError):
+            count_arrangements((1, 2, 3), tolerance=0)
+        with self.assertRaises(ValueError):
+            count_arrangements((1, 2, 3), modulus=0)
+
 
 if __name__ == '__main__': # pragma: no cover
     print('Running unit tests...')
     unittest.main(verbosity=2, exit=False)
     print('Puzzle Answers:')
-    (diff1, diff3) = find_joltage_differences(INPUT_FILENAME)
-    print(f"Part 1: {diff1 * diff3}")
-    print(f"Part 2: {calculate_distinct_ways(INPUT_FILENAME)}")
+    joltages = parse_input(INPUT_FILENAME)
+    print(f"Part 1: {solve_part1(joltages)}")
+    print(f"Part 2: {solve_part2(joltages)}")
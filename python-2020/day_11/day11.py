@@ -230,10 +230,25 @@ Given the new visibility method and the rule change for occupied seats becoming
 equilibrium is reached, how many seats end up occupied?
 '''
 
+from abc import ABC, abstractmethod
 import os
-from typing import Iterable, List, Tuple, Dict
-import copy
+from array import array
+from bisect import bisect_left
+from collections import deque
+import contextlib
+import hashlib
+import io
+import multiprocessing
+from multiprocessing import shared_memory
+from multiprocessing.process import BaseProcess
+from multiprocessing.synchronize import Barrier
+from typing import (BinaryIO, Deque, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Dict,
+                    Type, TypedDict)
+import struct
+import threading
+import time
 import unittest
+from unittest import mock
 
 
 TEST_INPUT_FILENAME = 'day_11_test_input.txt'
@@ -252,11 +267,37 @@ TEST_VISIBLE_SEATS_1 = 'test_visible_seats_1.txt'
 TEST_VISIBLE_SEATS_2 = 'test_visible_seats_2.txt'
 TEST_VISIBLE_SEATS_3 = 'test_visible_seats_3.txt'
 INPUT_FILENAME = 'day_11_input.txt'
+PARSER_VERSION = 1
 SEAT_STATUS = {
     'floor': '.',
     'empty': 'L',
     'occupied': '#',
 }
+DIRECTIONS = (
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1), (0, 1),
+    (1, -1), (1, 0), (1, 1),
+)
+
+
+class SeatUpdate(TypedDict):
+    '''Typing for the result of a seat matrix update'''
+    matrix: List[List[str]]
+    matrix_updated: bool
+    changes: int
+
+
+class SeatFrame(NamedTuple):
+    '''Occupancy of every cell after a round, packed one bit per cell'''
+    round: int
+    occupancy: bytes
+    changes: int
+
+
+SEAT_FRAMES_HEADER = struct.Struct('<4sII')
+SEAT_FRAMES_MAGIC = b'SEAT'
+SEAT_FRAME_RECORD = struct.Struct('<II')
+PARALLEL_TIMEOUT = 60.0
 
 
 def load_input_file(filename: str) -> Iterable[str]:
@@ -383,10 +424,24 @@ def count_state(neighbors: Tuple[str], position_state: str) -> int:
 def update_seat_matrix(initial_seat_matrix: List[List[str]],
                        rounds: int = 1,
                        visible_seats_to_empty: int = 4,
-                       visible_seats_method: str = 'neighbors') -> Dict[List[List[str]], bool]:
+                       visible_seats_method: str = 'neighbors',
+                       engine: str = 'scan') -> SeatUpdate:
     '''
-    Return a tuple that contains the updated seat matrix and if there was any change.
+    Return a tuple that contains the updated seat matrix, if there was any change and the number
+    of seats that changed in the last round.
     '''
+    if engine != 'scan':
+        with SEAT_ENGINES[engine](initial_seat_matrix,
+                                  visible_seats_to_empty,
+                                  visible_seats_method) as seat_engine:
+            changes = 0
+
+            for _ in range(0, rounds):
+                changes = seat_engine.step()
+
+            return {'matrix': seat_engine.to_matrix(), 'matrix_updated': changes > 0,
+                    'changes': changes}
+
     starting_seat_matrix = initial_seat_matrix
     seats_visibility_method = get_neighbors if visible_seats_method == 'neighbors' \
                                             else get_visible_seats
@@ -394,7 +449,7 @@ def update_seat_matrix(initial_seat_matrix: List[List[str]],
     #print(f'initial matrix: {initial_seat_matrix}')
 
     for _ in range(0, rounds):
-        seat_matrix_changed = False
+        changes = 0
         updated_seat_matrix = []
 
         for row, seat_row in enumerate(starting_seat_matrix):
@@ -406,23 +461,23 @@ def update_seat_matrix(initial_seat_matrix: List[List[str]],
                                 SEAT_STATUS['occupied']) == 0):
 
                     new_row.append(SEAT_STATUS['occupied'])
-                    seat_matrix_changed = True
+                    changes += 1
 
                 elif (seat == SEAT_STATUS['occupied']) and \
                     (count_state(seats_visibility_method(starting_seat_matrix, (row, column)),
                                                 SEAT_STATUS['occupied']) >= visible_seats_to_empty):
 
                     new_row.append(SEAT_STATUS['empty'])
-                    seat_matrix_changed = True
+                    changes += 1
 
                 else:
                     new_row.append(seat)
 
             updated_seat_matrix.append(new_row)
 
-        starting_seat_matrix = copy.deepcopy(updated_seat_matrix)
+        starting_seat_matrix = updated_seat_matrix
 
-    return {'matrix': updated_seat_matrix, 'matrix_updated': seat_matrix_changed}
+    return {'matrix': updated_seat_matrix, 'matrix_updated': changes > 0, 'changes': changes}
 
 
 def count_occupied_seats(seat_matrix: List[List[str]]) -> int:
@@ -439,34 +494,796 @@ def count_occupied_seats(seat_matrix: List[List[str]]) -> int:
     return number_of_occupied_seats
 
 
-def solve_part1(filename: str) -> int:
-    '''Solve part 1 of the daily puzzle.'''
+class SeatGraph(NamedTuple):
+    '''
+    Seats of a layout and the seats each of them sees, in compressed sparse row form: the
+    seats seen by seat `i` are `neighbors[offsets[i]:offsets[i + 1]]`.
+    '''
+    width: int
+    height: int
+    seats: array
+    offsets: array
+    neighbors: array
 
-    updated_seats = True
-    seat_matrix = load_matrix(filename)
 
-    while updated_seats:
-        result = update_seat_matrix(seat_matrix)
-        seat_matrix = result['matrix']
-        updated_seats = result['matrix_updated']
+def build_seat_graph(seat_matrix: List[List[str]],
+                     visible_seats_method: str = 'neighbors') -> SeatGraph:
+    '''
+    Given a seat matrix, return the graph of the seats each seat sees. Floors never change, so
+    this only has to be done once per layout.
+    '''
+    height = len(seat_matrix)
+    width = len(seat_matrix[0]) if height else 0
+    max_distance = 1 if visible_seats_method == 'neighbors' else max(height, width)
+    seats = array('I')
+    seat_index: Dict[int, int] = {}
+
+    for row, seat_row in enumerate(seat_matrix):
+        for column, seat in enumerate(seat_row):
+            if seat != SEAT_STATUS['floor']:
+                seat_index[row * width + column] = len(seats)
+                seats.append(row * width + column)
 
-    return count_occupied_seats(seat_matrix)
+    offsets = array('I', [0])
+    neighbors = array('I')
 
+    for cell in seats:
+        row, column = divmod(cell, width)
 
-def solve_part2(filename: str) -> int:
-    '''Solve part 2 of the daily puzzle.'''
+        for row_step, column_step in DIRECTIONS:
+            for distance in range(1, max_distance + 1):
+                seen_row = row + row_step * distance
+                seen_column = column + column_step * distance
+
+                if not (0 <= seen_row < height and 0 <= seen_column < width):
+                    break
+                if seat_matrix[seen_row][seen_column] != SEAT_STATUS['floor']:
+                    neighbors.append(seat_index[seen_row * width + seen_column])
+                    break
+
+        offsets.append(len(neighbors))
+
+    return SeatGraph(width, height, seats, offsets, neighbors)
+
+
+class SeatEngine(ABC):
+    '''Base class for the engines that simulate seating rounds'''
+
+    def __init__(self, seat_matrix: List[List[str]],
+                 visible_seats_to_empty: int = 4,
+                 visible_seats_method: str = 'neighbors') -> None:
+        self.height = len(seat_matrix)
+        self.width = len(seat_matrix[0]) if self.height else 0
+        self.visible_seats_to_empty = visible_seats_to_empty
+        self.visible_seats_method = visible_seats_method
+
+    @abstractmethod
+    def step(self) -> int:
+        '''Simulate one round and return the number of seats that changed'''
+
+    @abstractmethod
+    def to_matrix(self) -> List[List[str]]:
+        '''Return the current seat matrix'''
+
+    def count_occupied(self) -> int:
+        '''Return the number of occupied seats'''
+        return count_occupied_seats(self.to_matrix())
+
+    def occupancy(self) -> bytes:
+        '''Return one byte per cell, row by row, set to 1 for occupied seats'''
+        return bytes(seat == SEAT_STATUS['occupied']
+                     for seat_row in self.to_matrix() for seat in seat_row)
+
+    def round_limit(self, max_rounds: Optional[int] = None) -> int:
+        '''Return the number of rounds run may simulate, by default one more than the cells'''
+        return max_rounds if max_rounds is not None else self.width * self.height + 1
+
+    def run(self, max_rounds: Optional[int] = None) -> int:
+        '''
+        Simulate rounds until no seat changes and return the number of occupied seats. Some rule
+        variants oscillate forever, so a RuntimeError is raised when the layout has not settled
+        within max_rounds rounds; a SeatRecorder finds the cycle of such a layout.
+        '''
+        for _ in range(self.round_limit(max_rounds)):
+            if not self.step():
+                return self.count_occupied()
+
+        raise RuntimeError(f'the layout did not settle within {self.round_limit(max_rounds)} '
+                           f'rounds')
+
+    def close(self) -> None:
+        '''Release the resources held by the engine between rounds'''
+
+    def __enter__(self) -> 'SeatEngine':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class ScanSeatEngine(SeatEngine):
+    '''Engine that rescans the neighbors of every seat of the matrix in every round'''
+
+    def __init__(self, seat_matrix: List[List[str]],
+                 visible_seats_to_empty: int = 4,
+                 visible_seats_method: str = 'neighbors') -> None:
+        super().__init__(seat_matrix, visible_seats_to_empty, visible_seats_method)
+        self.matrix = seat_matrix
+
+    def step(self) -> int:
+        result = update_seat_matrix(self.matrix,
+                                    visible_seats_to_empty=self.visible_seats_to_empty,
+                                    visible_seats_method=self.visible_seats_method)
+        self.matrix = result['matrix']
+        return result['changes']
+
+    def to_matrix(self) -> List[List[str]]:
+        return self.matrix
+
+
+class GraphSeatEngine(SeatEngine):
+    '''
+    Engine that counts occupied seats over a precomputed seat graph, so a round costs at most
+    8 lookups per seat whatever the visibility rule.
+    '''
+
+    def __init__(self, seat_matrix: List[List[str]],
+                 visible_seats_to_empty: int = 4,
+                 visible_seats_method: str = 'neighbors') -> None:
+        super().__init__(seat_matrix, visible_seats_to_empty, visible_seats_method)
+        self.graph = build_seat_graph(seat_matrix, visible_seats_method)
+        self.occupied = bytearray(
+            seat_matrix[cell // self.graph.width][cell % self.graph.width] ==
+            SEAT_STATUS['occupied'] for cell in self.graph.seats)
+
+    def step(self) -> int:
+        occupied = self.occupied
+        offsets = self.graph.offsets
+        neighbors = self.graph.neighbors
+        threshold = self.visible_seats_to_empty
+        updated = bytearray(occupied)
+        changes = 0
+
+        for seat, is_occupied in enumerate(occupied):
+            count = sum([occupied[neighbor]
+                         for neighbor in neighbors[offsets[seat]:offsets[seat + 1]]])
+
+            if (not is_occupied and count == 0) or (is_occupied and count >= threshold):
+                updated[seat] = not is_occupied
+                changes += 1
+
+        self.occupied = updated
+        return changes
+
+    def to_matrix(self) -> List[List[str]]:
+        width = self.graph.width
+        cells = [SEAT_STATUS['floor']] * (width * self.graph.height)
+
+        for cell, is_occupied in zip(self.graph.seats, self.occupied):
+            cells[cell] = SEAT_STATUS['occupied'] if is_occupied else SEAT_STATUS['empty']
+
+        return [cells[start:start + width] for start in range(0, len(cells), width)]
+
+    def count_occupied(self) -> int:
+        return sum(self.occupied)
+
+
+class LaneSeatEngine(SeatEngine):
+    '''
+    Engine that steps the whole grid at once for the adjacency rule. The padded grid is packed
+    into big integers with one byte lane per cell, holding the occupancy and seat masks; the
+    neighbor counts are the sum of the eight shifted occupancy grids, and both rules are applied
+    to every lane at once with bit masks.
+    '''
+
+    def __init__(self, seat_matrix: List[List[str]],
+                 visible_seats_to_empty: int = 4,
+                 visible_seats_method: str = 'neighbors') -> None:
+        super().__init__(seat_matrix, visible_seats_to_empty, visible_seats_method)
+
+        if visible_seats_method != 'neighbors':
+            raise ValueError('the lane engine only supports the neighbors method')
+
+        padded_width = self.width + 2
+        lanes = padded_width * (self.height + 2)
+        seats = bytearray(lanes)
+        occupied = bytearray(lanes)
+
+        for row, seat_row in enumerate(seat_matrix):
+            for column, seat in enumerate(seat_row):
+                lane = (row + 1) * padded_width + column + 1
+                seats[lane] = seat != SEAT_STATUS['floor']
+                occupied[lane] = seat == SEAT_STATUS['occupied']
+
+        self.lanes = lanes
+        self.seats = int.from_bytes(seats, 'little')
+        self.occupied = int.from_bytes(occupied, 'little')
+        self.shifts = tuple(8 * (row_step * padded_width + column_step)
+                            for row_step, column_step in DIRECTIONS)
+        ones = int.from_bytes(b'\x01' * lanes, 'little')
+        threshold = min(max(visible_seats_to_empty, 0), 9)
+        self.high_bits = ones << 7
+        self.nonzero_bias = ones * 0x7f
+        self.threshold_bias = ones * (0x80 - threshold)
+
+    def step(self) -> int:
+        occupied = self.occupied
+        counts = 0
+
+        for shift in self.shifts:
+            counts += occupied >> shift if shift > 0 else occupied << -shift
+
+        crowded = ((counts + self.threshold_bias) & self.high_bits) >> 7
+        watched = ((counts + self.nonzero_bias) & self.high_bits) >> 7
+        updated = (occupied & ~crowded) | (self.seats & ~occupied & ~watched)
+        self.occupied = updated
+
+        return bin(occupied ^ updated).count('1')
+
+    def to_matrix(self) -> List[List[str]]:
+        padded_width = self.width + 2
+        seats = self.seats.to_bytes(self.lanes, 'little')
+        occupied = self.occupied.to_bytes(self.lanes, 'little')
+        matrix = []
+
+        for row in range(1, self.height + 1):
+            start = row * padded_width + 1
+            matrix.append([
+                (SEAT_STATUS['occupied'] if is_occupied else SEAT_STATUS['empty'])
+                if is_seat else SEAT_STATUS['floor']
+                for is_seat, is_occupied in zip(seats[start:start + self.width],
+                                                occupied[start:start + self.width])
+            ])
+
+        return matrix
+
+    def count_occupied(self) -> int:
+        return bin(self.occupied).count('1')
+
+
+class BufferedSeatEngine(SeatEngine):
+    '''
+    Engine that keeps the occupancy of every cell in two flat buffers indexed by
+    `row * width + column`. Each round reads one buffer, writes every seat of the other and
+    swaps them, so no matrix is allocated or copied between rounds. Floor cells are never
+    written and stay empty in both buffers.
+    '''
+
+    def __init__(self, seat_matrix: List[List[str]],
+                 visible_seats_to_empty: int = 4,
+                 visible_seats_method: str = 'neighbors') -> None:
+        super().__init__(seat_matrix, visible_seats_to_empty, visible_seats_method)
+        self.graph = build_seat_graph(seat_matrix, visible_seats_method)
+        self.neighbor_cells = array('I', (self.graph.seats[neighbor]
+                                          for neighbor in self.graph.neighbors))
+        self.current = bytearray(seat == SEAT_STATUS['occupied']
+                                 for seat_row in seat_matrix for seat in seat_row)
+        self.following = bytearray(len(self.current))
+
+    def step(self) -> int:
+        current = self.current
+        following = self.following
+        offsets = self.graph.offsets
+        neighbor_cells = self.neighbor_cells
+        threshold = self.visible_seats_to_empty
+        changes = 0
+
+        for seat, cell in enumerate(self.graph.seats):
+            is_occupied = current[cell]
+            count = sum([current[neighbor]
+                         for neighbor in neighbor_cells[offsets[seat]:offsets[seat + 1]]])
+
+            if (not is_occupied and count == 0) or (is_occupied and count >= threshold):
+                following[cell] = not is_occupied
+                changes += 1
+            else:
+                following[cell] = is_occupied
+
+        self.current, self.following = following, current
+        return changes
+
+    def to_matrix(self) -> List[List[str]]:
+        width = self.graph.width
+        cells = [SEAT_STATUS['floor']] * len(self.current)
+
+        for cell in self.graph.seats:
+            cells[cell] = SEAT_STATUS['occupied'] if self.current[cell] else SEAT_STATUS['empty']
+
+        return [cells[start:start + width] for start in range(0, len(cells), width)]
+
+    def count_occupied(self) -> int:
+        return sum(self.current)
+
+    def occupancy(self) -> bytes:
+        return bytes(self.current)
+
+
+class FrontierSeatEngine(GraphSeatEngine):
+    '''
+    Engine that only re-examines the seats that changed in the previous round and the seats
+    that see them, so once the layout settles a round costs in proportion to the changes
+    instead of the area. Seeing is symmetric, so the seat graph also gives the watchers.
+    '''
+
+    def __init__(self, seat_matrix: List[List[str]],
+                 visible_seats_to_empty: int = 4,
+                 visible_seats_method: str = 'neighbors') -> None:
+        super().__init__(seat_matrix, visible_seats_to_empty, visible_seats_method)
+        self.frontier = set(range(len(self.graph.seats)))
+
+    def step(self) -> int:
+        occupied = self.occupied
+        offsets = self.graph.offsets
+        neighbors = self.graph.neighbors
+        threshold = self.visible_seats_to_empty
+        flipped = []
+
+        for seat in self.frontier:
+            is_occupied = occupied[seat]
+            count = sum([occupied[neighbor]
+                         for neighbor in neighbors[offsets[seat]:offsets[seat + 1]]])
+
+            if (not is_occupied and count == 0) or (is_occupied and count >= threshold):
+                flipped.append(seat)
+
+        frontier = set(flipped)
+
+        for seat in flipped:
+            occupied[seat] ^= 1
+            frontier.update(neighbors[offsets[seat]:offsets[seat + 1]])
 
-    updated_seats = True
-    seat_matrix = load_matrix(filename)
+        self.frontier = frontier
+        return len(flipped)
 
-    while updated_seats:
-        result = update_seat_matrix(seat_matrix,
-                                    visible_seats_to_empty=5,
-                                    visible_seats_method='visible_seats')
-        seat_matrix = result['matrix']
-        updated_seats = result['matrix_updated']
+    def run(self, max_rounds: Optional[int] = None) -> int:
+        rounds = self.round_limit(max_rounds)
 
-    return count_occupied_seats(seat_matrix)
+        while self.frontier:
+            if rounds == 0:
+                raise RuntimeError(f'the layout did not settle within '
+                                   f'{self.round_limit(max_rounds)} rounds')
+
+            self.step()
+            rounds -= 1
+
+        return self.count_occupied()
+
+
+def _step_seat_band(shared_memory_name: str, graph: SeatGraph, band: Tuple[int, int],
+                    worker: int, workers: int, threshold: int, barrier: Barrier) -> None:
+    '''
+    Simulate the seats of one band of rows in a worker process, round after round, until the
+    engine stops the workers. The occupancy of all the seats is double-buffered in shared
+    memory, followed by one change counter per worker and the index of the buffer to read, or
+    -1 to stop. The engine waits on the barrier with the workers before and after each round;
+    links from the band to seats of other bands (the neighboring rows for the adjacency rule,
+    any row for the visibility rule) are read from the other bands' part of the buffer.
+    '''
+    seat_count = len(graph.seats)
+    block = shared_memory.SharedMemory(name=shared_memory_name)
+    shared_buffer = block.buf
+    assert shared_buffer is not None
+    buffers = (shared_buffer[:seat_count], shared_buffer[seat_count:2 * seat_count])
+    counters = shared_buffer[2 * seat_count:].cast('q')
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+    first_seat, last_seat = band
+
+    try:
+        while True:
+            barrier.wait()
+
+            if counters[workers] < 0:
+                break
+
+            current = buffers[counters[workers]]
+            following = buffers[1 - counters[workers]]
+            following[first_seat:last_seat] = current[first_seat:last_seat]
+            changes = 0
+
+            for seat in range(first_seat, last_seat):
+                is_occupied = current[seat]
+                count = sum([current[neighbor]
+                             for neighbor in neighbors[offsets[seat]:offsets[seat + 1]]])
+
+                if (not is_occupied and count == 0) or (is_occupied and count >= threshold):
+                    following[seat] = not is_occupied
+                    changes += 1
+
+            counters[worker] = changes
+            del current, following
+            barrier.wait()
+    except threading.BrokenBarrierError:
+        pass  # the engine closes the workers and reports the failure
+    finally:
+        del buffers, counters, shared_buffer
+        block.close()
+
+
+class ParallelSeatEngine(GraphSeatEngine):
+    '''
+    Engine that splits the rows of the layout into bands and steps each band in its own worker
+    process. The workers are started on the first round and kept until the engine is closed,
+    synchronising with the engine on a barrier every round, and give the same result as the
+    serial engines. A round that waits longer than the timeout on the barrier, or a worker that
+    exits with an error, raises a RuntimeError.
+    '''
+
+    def __init__(self, seat_matrix: List[List[str]],
+                 visible_seats_to_empty: int = 4,
+                 visible_seats_method: str = 'neighbors',
+                 workers: Optional[int] = None,
+                 timeout: float = PARALLEL_TIMEOUT) -> None:
+        super().__init__(seat_matrix, visible_seats_to_empty, visible_seats_method)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, self.graph.height or 1))
+        self.timeout = timeout
+        self.block: Optional[shared_memory.SharedMemory] = None
+        self.barrier: Optional[Barrier] = None
+        self.processes: List[BaseProcess] = []
+        self.parity = 0
+
+    def bands(self) -> List[Tuple[int, int]]:
+        '''Return the range of seats of each band of rows'''
+        boundaries = [bisect_left(self.graph.seats,
+                                  (self.graph.height * worker // self.workers) * self.graph.width)
+                      for worker in range(self.workers)]
+        boundaries.append(len(self.graph.seats))
+
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def start(self) -> None:
+        '''Start the worker processes and their shared memory unless they are running'''
+        if self.block is not None:
+            return
+
+        seat_count = len(self.occupied)
+        self.block = shared_memory.SharedMemory(create=True, size=2 * seat_count +
+                                                8 * (self.workers + 1))
+        context = multiprocessing.get_context()
+        self.barrier = context.Barrier(self.workers + 1, timeout=self.timeout)
+        self.processes = [
+            context.Process(target=_step_seat_band,
+                            args=(self.block.name, self.graph, band, worker, self.workers,
+                                  self.visible_seats_to_empty, self.barrier),
+                            daemon=True)
+            for worker, band in enumerate(self.bands())
+        ]
+        self.parity = 0
+
+        for process in self.processes:
+            process.start()
+
+    def advance(self, rounds: int) -> int:
+        '''
+        Simulate up to a number of rounds, stopping early once no seat changes, and return the
+        number of seats that changed in the last round.
+        '''
+        self.start()
+        assert self.block is not None and self.block.buf is not None
+        assert self.barrier is not None
+        shared_buffer = self.block.buf
+        barrier = self.barrier
+        seat_count = len(self.occupied)
+        changes = 0
+
+        try:
+            with shared_buffer[2 * seat_count:].cast('q') as counters:
+                start = seat_count * self.parity
+                shared_buffer[start:start + seat_count] = self.occupied
+
+                for _ in range(rounds):
+                    counters[self.workers] = self.parity
+                    barrier.wait()
+                    barrier.wait()
+                    changes = sum(counters[:self.workers])
+                    self.parity = 1 - self.parity
+
+                    if changes == 0:
+                        break
+        except threading.BrokenBarrierError as error:
+            self.close()
+            raise RuntimeError(f'parallel seat workers did not reach the barrier within '
+                               f'{self.timeout}s') from error
+
+        start = seat_count * self.parity
+        self.occupied = bytearray(shared_buffer[start:start + seat_count])
+        return changes
+
+    def step(self) -> int:
+        return self.advance(1)
+
+    def run(self, max_rounds: Optional[int] = None) -> int:
+        try:
+            if self.advance(self.round_limit(max_rounds)):
+                raise RuntimeError(f'the layout did not settle within '
+                                   f'{self.round_limit(max_rounds)} rounds')
+        finally:
+            self.close()
+
+        return self.count_occupied()
+
+    def close(self) -> None:
+        '''Stop the workers and free the shared memory, raising RuntimeError if a worker failed'''
+        if self.block is None:
+            return
+
+        block, barrier, processes = self.block, self.barrier, self.processes
+        self.block, self.barrier, self.processes = None, None, []
+        assert block.buf is not None and barrier is not None
+
+        with block.buf[2 * len(self.occupied):].cast('q') as counters:
+            counters[self.workers] = -1
+
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+
+        for process in processes:
+            process.join(self.timeout)
+
+        exit_codes = [process.exitcode for process in processes
+                      if process.exitcode not in (0, None)]
+
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        block.close()
+        block.unlink()
+
+        if exit_codes:
+            raise RuntimeError(f'parallel seat worker exited with code {exit_codes[0]}')
+
+
+def benchmark_parallel_engine(seat_matrix: List[List[str]],
+                              max_workers: int,
+                              visible_seats_to_empty: int = 4,
+                              visible_seats_method: str = 'neighbors') -> Dict[int, float]:
+    '''
+    Time the parallel engine on a layout with 1 to max_workers workers and return the duration
+    in seconds for each worker count. Every run must match the serial engine.
+    '''
+    expected = FrontierSeatEngine(seat_matrix, visible_seats_to_empty, visible_seats_method)
+    expected.run()
+    durations = {}
+
+    for workers in range(1, max_workers + 1):
+        seat_engine = ParallelSeatEngine(seat_matrix, visible_seats_to_empty,
+                                         visible_seats_method, workers)
+        start_time = time.perf_counter()
+        seat_engine.run()
+        durations[workers] = time.perf_counter() - start_time
+
+        if seat_engine.occupied != expected.occupied:
+            raise RuntimeError(f'parallel engine with {workers} workers diverged')
+
+    return durations
+
+
+class BitboardSeatEngine(SeatEngine):
+    '''
+    Engine that keeps the seat mask and occupancy of each row as an integer with one bit per
+    column. The eight neighbor bitplanes of a row are added into four bit-sliced counters, so a
+    whole row is updated with a handful of integer operations whatever its width.
+    '''
+
+    def __init__(self, seat_matrix: List[List[str]],
+                 visible_seats_to_empty: int = 4,
+                 visible_seats_method: str = 'neighbors') -> None:
+        super().__init__(seat_matrix, visible_seats_to_empty, visible_seats_method)
+
+        if visible_seats_method != 'neighbors':
+            raise ValueError('the bitboard engine only supports the neighbors method')
+
+        self.full_row = (1 << self.width) - 1
+        self.seats = [sum(1 << column for column, seat in enumerate(seat_row)
+                          if seat != SEAT_STATUS['floor']) for seat_row in seat_matrix]
+        self.occupied = [sum(1 << column for column, seat in enumerate(seat_row)
+                             if seat == SEAT_STATUS['occupied']) for seat_row in seat_matrix]
+
+    @staticmethod
+    def add_bitplanes(bitplanes: Iterable[int]) -> List[int]:
+        '''
+        Add bitplanes column by column and return the sum as four bit-sliced counters, from the
+        least significant bit to the most significant one.
+        '''
+        counters = [0, 0, 0, 0]
+
+        for carry in bitplanes:
+            for level, counter in enumerate(counters):
+                counters[level] = counter ^ carry
+                carry &= counter
+
+                if not carry:
+                    break
+
+        return counters
+
+    def at_least(self, counters: List[int], threshold: int) -> int:
+        '''Return the mask of the columns whose bit-sliced counter is at least a threshold'''
+        if threshold <= 0:
+            return self.full_row
+        if threshold >= 1 << len(counters):
+            return 0
+
+        greater = 0
+        equal = self.full_row
+
+        for level in range(len(counters) - 1, -1, -1):
+            if threshold >> level & 1:
+                equal &= counters[level]
+            else:
+                greater |= equal & counters[level]
+                equal &= ~counters[level]
+
+        return greater | equal
+
+    def step(self) -> int:
+        occupied = self.occupied
+        full_row = self.full_row
+        updated = []
+        changes = 0
+
+        for row, (seats, occupied_row) in enumerate(zip(self.seats, occupied)):
+            bitplanes = [(occupied_row << 1) & full_row, occupied_row >> 1]
+
+            for other_row in (row - 1, row + 1):
+                if 0 <= other_row < len(occupied):
+                    bitplanes.extend(((occupied[other_row] << 1) & full_row,
+                                      occupied[other_row],
+                                      occupied[other_row] >> 1))
+
+            counters = self.add_bitplanes(bitplanes)
+            unwatched = ~(counters[0] | counters[1] | counters[2] | counters[3])
+            crowded = self.at_least(counters, self.visible_seats_to_empty)
+            updated_row = (occupied_row & ~crowded) | (seats & ~occupied_row & unwatched)
+            changes += bin(occupied_row ^ updated_row).count('1')
+            updated.append(updated_row)
+
+        self.occupied = updated
+        return changes
+
+    def to_matrix(self) -> List[List[str]]:
+        return [[(SEAT_STATUS['occupied'] if occupied_row >> column & 1 else SEAT_STATUS['empty'])
+                 if seats >> column & 1 else SEAT_STATUS['floor']
+                 for column in range(self.width)]
+                for seats, occupied_row in zip(self.seats, self.occupied)]
+
+    def count_occupied(self) -> int:
+        return sum(bin(occupied_row).count('1') for occupied_row in self.occupied)
+
+
+SEAT_ENGINES: Dict[str, Type[SeatEngine]] = {
+    'scan': ScanSeatEngine,
+    'graph': GraphSeatEngine,
+    'lanes': LaneSeatEngine,
+    'buffer': BufferedSeatEngine,
+    'frontier': FrontierSeatEngine,
+    'parallel': ParallelSeatEngine,
+    'bitboard': BitboardSeatEngine,
+}
+
+
+def pack_flags(flags: bytes) -> bytes:
+    '''Pack a sequence of 0/1 bytes into one bit per flag'''
+    if not flags:
+        return b''
+
+    bits = flags.translate(bytes.maketrans(b'\x00\x01', b'01'))
+    return int(bits, 2).to_bytes((len(flags) + 7) // 8, 'big')
+
+
+def unpack_flags(packed: bytes, size: int) -> bytes:
+    '''Unpack the first flags packed by pack_flags into one 0/1 byte per flag'''
+    if not size:
+        return b''
+
+    bits = format(int.from_bytes(packed, 'big'), 'b').zfill(size).encode()
+    return bits.translate(bytes.maketrans(b'01', b'\x00\x01'))
+
+
+class SeatRecorder:
+    '''
+    Stream the rounds of a seat engine as compact frames until the layout repeats itself. Frames
+    are hashed into a bounded history, so a rule variant that oscillates stops with the length
+    of its cycle instead of running forever; a layout that settles ends with a cycle of 1. A
+    cycle longer than the history is never seen to repeat, so like SeatEngine.run the recorder
+    raises a RuntimeError once max_rounds rounds have been simulated. The frames can also be
+    written to a binary file to be replayed without simulating again.
+    '''
+
+    def __init__(self, seat_engine: SeatEngine,
+                 history: int = 1024,
+                 output: Optional[BinaryIO] = None,
+                 max_rounds: Optional[int] = None) -> None:
+        self.seat_engine = seat_engine
+        self.history = history
+        self.output = output
+        self.max_rounds = max_rounds
+        self.cycle_start: Optional[int] = None
+        self.cycle_length: Optional[int] = None
+
+    def __iter__(self) -> Iterator[SeatFrame]:
+        seat_matrix = self.seat_engine.to_matrix()
+        round_limit = self.seat_engine.round_limit(self.max_rounds)
+        seen: Dict[bytes, int] = {}
+        order: Deque[bytes] = deque()
+        frame = SeatFrame(0, pack_flags(self.seat_engine.occupancy()), 0)
+
+        if self.output is not None:
+            self.output.write(SEAT_FRAMES_HEADER.pack(SEAT_FRAMES_MAGIC,
+                                                      len(seat_matrix[0]) if seat_matrix else 0,
+                                                      len(seat_matrix)))
+            self.output.write(pack_flags(bytes(seat != SEAT_STATUS['floor']
+                                               for seat_row in seat_matrix
+                                               for seat in seat_row)))
+
+        while True:
+            if self.output is not None:
+                self.output.write(SEAT_FRAME_RECORD.pack(frame.round, frame.changes))
+                self.output.write(frame.occupancy)
+
+            yield frame
+
+            digest = hashlib.blake2b(frame.occupancy, digest_size=16).digest()
+
+            if digest in seen:
+                self.cycle_start = seen[digest]
+                self.cycle_length = frame.round - seen[digest]
+                return
+
+            seen[digest] = frame.round
+            order.append(digest)
+
+            if len(order) > self.history:
+                del seen[order.popleft()]
+
+            if frame.round >= round_limit:
+                raise RuntimeError(f'the layout did not repeat within {round_limit} rounds')
+
+            changes = self.seat_engine.step()
+            frame = SeatFrame(frame.round + 1, pack_flags(self.seat_engine.occupancy()), changes)
+
+
+def replay_seat_frames(input_file: BinaryIO) -> Iterator[Tuple[SeatFrame, List[List[str]]]]:
+    '''Read the frames written by a SeatRecorder and yield each of them with its seat matrix'''
+    magic, width, height = SEAT_FRAMES_HEADER.unpack(input_file.read(SEAT_FRAMES_HEADER.size))
+
+    if magic != SEAT_FRAMES_MAGIC:
+        raise ValueError('not a seat frames file')
+
+    size = width * height
+    packed_size = (size + 7) // 8
+    seats = unpack_flags(input_file.read(packed_size), size)
+
+    while record := input_file.read(SEAT_FRAME_RECORD.size):
+        round_number, changes = SEAT_FRAME_RECORD.unpack(record)
+        frame = SeatFrame(round_number, input_file.read(packed_size), changes)
+        occupancy = unpack_flags(frame.occupancy, size)
+        cells = [(SEAT_STATUS['occupied'] if is_occupied else SEAT_STATUS['empty'])
+                 if is_seat else SEAT_STATUS['floor']
+                 for is_seat, is_occupied in zip(seats, occupancy)]
+
+        yield frame, [cells[start:start + width] for start in range(0, size, width)]
+
+
+def parse_input(filename: str) -> List[List[str]]:
+    '''Parse the seat matrix of the input file.'''
+    return load_matrix(filename)
+
+
+def solve_part1(seat_matrix: List[List[str]], engine: str = 'lanes') -> int:
+    '''Solve part 1 of the daily puzzle.'''
+    return SEAT_ENGINES[engine](seat_matrix).run()
+
+
+def solve_part2(seat_matrix: List[List[str]], engine: str = 'frontier') -> int:
+    '''Solve part 2 of the daily puzzle.'''
+    return SEAT_ENGINES[engine](seat_matrix,
+                                visible_seats_to_empty=5,
+                                visible_seats_method='visible_seats').run()
 
 
 class Tests(unittest.TestCase):
@@ -504,6 +1321,9 @@ class Tests(unittest.TestCase):
         (4, TEST_ROUND_1_PART2_OUTPUT, (0, 0), ('#', '#', '#'), 0, 3),
     )
 
+    engines = ('scan', 'graph', 'buffer', 'frontier', 'parallel')
+    neighbors_engines = ('lanes', 'bitboard')
+
     @classmethod
     def setUpClass(cls):
         for line in load_input_file(TEST_INPUT_FILENAME):
@@ -538,16 +1358,210 @@ class Tests(unittest.TestCase):
 
     def test_seat_update_rounds(self):
         '''Verify the seat configuration after multiple rounds.'''
-        for case in self.seat_update_rounds_cases:
+        for engine in self.engines:
+            for case in self.seat_update_rounds_cases:
+                with self.subTest(case[0], engine=engine):
+                    result = update_seat_matrix(load_matrix(TEST_INPUT_FILENAME),
+                                                case[1],
+                                                visible_seats_to_empty=case[4],
+                                                visible_seats_method=case[5],
+                                                engine=engine)
+                    test_matrix = load_matrix(case[2])
+
+                    self.assertEqual(result['matrix'], test_matrix)
+                    self.assertEqual(result['matrix_updated'], case[3])
+
+    def test_seat_update_rounds_with_neighbors_engines(self):
+        '''Verify the seat configuration with the engines limited to the neighbors method.'''
+        for engine in self.neighbors_engines:
+            for case in self.seat_update_rounds_cases[:6]:
+                with self.subTest(case[0], engine=engine):
+                    result = update_seat_matrix(load_matrix(TEST_INPUT_FILENAME),
+                                                case[1],
+                                                visible_seats_to_empty=case[4],
+                                                engine=engine)
+
+                    self.assertEqual(result['matrix'], load_matrix(case[2]))
+                    self.assertEqual(result['matrix_updated'], case[3])
+
+            with self.subTest('part 1', engine=engine):
+                self.assertEqual(solve_part1(parse_input(TEST_INPUT_FILENAME), engine), 37)
+
+            with self.subTest('visible_seats', engine=engine):
+                with self.assertRaises(ValueError):
+                    solve_part2(parse_input(TEST_INPUT_FILENAME), engine)
+
+    def test_step_changes(self):
+        '''Test that every engine returns the number of seats that changed in each round.'''
+        for engine in self.engines + self.neighbors_engines:
+            with self.subTest(engine=engine), \
+                    SEAT_ENGINES[engine](load_matrix(TEST_INPUT_FILENAME)) as seat_engine:
+                self.assertEqual([seat_engine.step() for _ in range(6)], [71, 51, 31, 21, 7, 0])
+
+        result = update_seat_matrix(load_matrix(TEST_INPUT_FILENAME), 2)
+        self.assertEqual((result['matrix_updated'], result['changes']), (True, 51))
+
+    def test_frontier_shrinks_to_changes(self):
+        '''Test that the frontier only holds the changed seats and the seats that see them.'''
+        seat_engine = FrontierSeatEngine(load_matrix(TEST_INPUT_FILENAME))
+        self.assertEqual(len(seat_engine.frontier), 71)
+
+        changes = seat_engine.step()
+        self.assertEqual(changes, 71)
+        self.assertEqual(len(seat_engine.frontier), 71)
+
+        seat_engine.run()
+        self.assertEqual(seat_engine.frontier, set())
+        self.assertEqual(seat_engine.step(), 0)
+
+    def test_parallel_engine_bands(self):
+        '''Test that the parallel engine splits the seats into bands of rows.'''
+        seat_engine = ParallelSeatEngine(load_matrix(TEST_INPUT_FILENAME), workers=3)
+        self.assertEqual(seat_engine.bands(), [(0, 20), (20, 43), (43, 71)])
+        self.assertEqual(ParallelSeatEngine([list('LL')], workers=4).workers, 1)
+
+    def test_parallel_engine_workers(self):
+        '''Test that the parallel workers are kept across rounds until the engine is closed.'''
+        with ParallelSeatEngine(load_matrix(TEST_INPUT_FILENAME), workers=2) as seat_engine:
+            self.assertEqual(seat_engine.step(), 71)
+            processes = list(seat_engine.processes)
+            self.assertEqual(seat_engine.step(), 51)
+            self.assertEqual(seat_engine.processes, processes)
+            self.assertTrue(all(process.is_alive() for process in processes))
+
+        self.assertIsNone(seat_engine.block)
+        self.assertEqual([process.exitcode for process in processes], [0, 0])
+        self.assertEqual(seat_engine.run(), 37)
+
+    def test_parallel_engine_worker_failure(self):
+        '''Test that a worker that fails before reaching the barrier raises instead of hanging.'''
+        def fail(*args):
+            raise MemoryError('worker failed')
+
+        seat_engine = ParallelSeatEngine(load_matrix(TEST_INPUT_FILENAME), workers=2, timeout=1)
+
+        with mock.patch.dict(globals(), _step_seat_band=fail), \
+                contextlib.redirect_stderr(io.StringIO()), \
+                self.assertRaisesRegex(RuntimeError, 'exited with code 1'):
+            seat_engine.step()
+
+        self.assertIsNone(seat_engine.block)
+        self.assertEqual(seat_engine.processes, [])
+
+    def test_benchmark_parallel_engine(self):
+        '''Test the scaling benchmark of the parallel engine on both rules.'''
+        for case in ((4, 'neighbors'), (5, 'visible_seats')):
+            with self.subTest(case[1]):
+                durations = benchmark_parallel_engine(load_matrix(TEST_INPUT_FILENAME), 3,
+                                                      case[0], case[1])
+                self.assertEqual(list(durations), [1, 2, 3])
+
+    def test_bitboard_counters(self):
+        '''Test the bit-sliced adder and threshold comparison of the bitboard engine.'''
+        seat_engine = BitboardSeatEngine([list('LLLL')])
+        counters = seat_engine.add_bitplanes([0b1111, 0b1110, 0b1100, 0b1000] + [0b1000] * 5)
+        self.assertEqual(counters, [0b1101, 0b0110, 0b0000, 0b1000])
+
+        for threshold, expected in ((0, 0b1111), (2, 0b1110), (3, 0b1100), (9, 0b1000),
+                                    (10, 0b0000), (16, 0b0000)):
+            with self.subTest(threshold=threshold):
+                self.assertEqual(seat_engine.at_least(counters, threshold), expected)
+
+    def test_seat_recorder_until_stable(self):
+        '''Test that a settling layout streams its rounds and ends with a cycle of 1.'''
+        for engine in ('graph', 'buffer', 'lanes'):
+            with self.subTest(engine=engine):
+                recorder = SeatRecorder(SEAT_ENGINES[engine](load_matrix(TEST_INPUT_FILENAME)))
+                frames = list(recorder)
+
+                self.assertEqual([frame.round for frame in frames], list(range(7)))
+                self.assertEqual([frame.changes for frame in frames], [0, 71, 51, 31, 21, 7, 0])
+                self.assertEqual(frames[-1].occupancy, frames[-2].occupancy)
+                self.assertEqual((recorder.cycle_start, recorder.cycle_length), (5, 1))
+
+    def test_run_with_oscillating_rule(self):
+        '''Test that running a rule variant that never settles raises instead of looping.'''
+        for engine in self.engines + self.neighbors_engines:
+            with self.subTest(engine=engine):
+                with self.assertRaisesRegex(RuntimeError, 'within 3 rounds'):
+                    SEAT_ENGINES[engine]([list('LL')], visible_seats_to_empty=1).run()
+                with self.assertRaisesRegex(RuntimeError, 'within 10 rounds'):
+                    SEAT_ENGINES[engine]([list('LL')], visible_seats_to_empty=1).run(10)
+                with self.assertRaises(RuntimeError):
+                    SEAT_ENGINES[engine](load_matrix(TEST_INPUT_FILENAME)).run(5)
+
+                self.assertEqual(SEAT_ENGINES[engine](load_matrix(TEST_INPUT_FILENAME)).run(6),
+                                 37)
+
+    def test_seat_recorder_with_oscillating_rule(self):
+        '''Test that an oscillating rule variant stops with the length of its cycle.'''
+        recorder = SeatRecorder(GraphSeatEngine([list('LL')], visible_seats_to_empty=1))
+        frames = list(recorder)
+
+        self.assertEqual([frame.occupancy for frame in frames], [b'\x00', b'\x03', b'\x00'])
+        self.assertEqual((recorder.cycle_start, recorder.cycle_length), (0, 2))
+
+    def test_seat_recorder_with_cycle_longer_than_history(self):
+        '''Test that a cycle evicted from the history before repeating raises instead of looping.'''
+        for max_rounds, expected_frames in ((None, 4), (6, 7)):
+            with self.subTest(max_rounds=max_rounds):
+                recorder = SeatRecorder(GraphSeatEngine([list('LL')], visible_seats_to_empty=1),
+                                        history=1, max_rounds=max_rounds)
+                frames = []
+
+                with self.assertRaisesRegex(RuntimeError, f'within {expected_frames - 1} rounds'):
+                    frames.extend(recorder)
+
+                self.assertEqual(len(frames), expected_frames)
+                self.assertIsNone(recorder.cycle_length)
+
+    def test_replay_seat_frames(self):
+        '''Test that recorded frames replay into the seat matrices of each round.'''
+        output = io.BytesIO()
+        frames = list(SeatRecorder(GraphSeatEngine(load_matrix(TEST_INPUT_FILENAME)),
+                                   output=output))
+        output.seek(0)
+        replayed = list(replay_seat_frames(output))
+        expected_matrices = [load_matrix(filename) for filename in (
+            TEST_INPUT_FILENAME, TEST_ROUND_1_OUTPUT, TEST_ROUND_2_OUTPUT, TEST_ROUND_3_OUTPUT,
+            TEST_ROUND_4_OUTPUT, TEST_ROUND_5_OUTPUT, TEST_ROUND_5_OUTPUT)]
+
+        self.assertEqual([frame for frame, _ in replayed], frames)
+        self.assertEqual([matrix for _, matrix in replayed], expected_matrices)
+
+        with self.assertRaises(ValueError):
+            list(replay_seat_frames(io.BytesIO(b'\x00' * SEAT_FRAMES_HEADER.size)))
+
+    def test_pack_flags(self):
+        '''Test the packing of occupancy flags.'''
+        for flags in (b'', b'\x01', b'\x00\x01\x01', b'\x01' * 9 + b'\x00' * 8):
+            with self.subTest(flags=flags):
+                packed = pack_flags(flags)
+                self.assertEqual(len(packed), (len(flags) + 7) // 8)
+                self.assertEqual(unpack_flags(packed, len(flags)), flags)
+
+    def test_build_seat_graph(self):
+        '''Test the seat graph built for both visibility rules.'''
+        seat_matrix = [list('L.L'), list('...'), list('L.#')]
+        cases = (
+            ('neighbors', [0, 0, 0, 0, 0], []),
+            ('visible_seats', [0, 3, 6, 9, 12], [1, 2, 3, 0, 2, 3, 0, 1, 3, 0, 1, 2]),
+        )
+
+        for case in cases:
             with self.subTest(case[0]):
-                result = update_seat_matrix(load_matrix(TEST_INPUT_FILENAME),
-                                            case[1],
-                                            visible_seats_to_empty=case[4],
-                                            visible_seats_method=case[5])
-                test_matrix = load_matrix(case[2])
-
-                self.assertEqual(result['matrix'], test_matrix)
-                self.assertEqual(result['matrix_updated'], case[3])
+                graph = build_seat_graph(seat_matrix, case[0])
+                self.assertEqual((graph.width, graph.height), (3, 3))
+                self.assertEqual(list(graph.seats), [0, 2, 6, 8])
+                self.assertEqual(list(graph.offsets), case[1])
+                self.assertEqual(list(graph.neighbors), case[2])
+
+    def test_solve_with_engines(self):
+        '''Test both parts of the puzzle with each engine.'''
+        for engine in self.engines:
+            with self.subTest(engine=engine):
+                self.assertEqual(solve_part1(parse_input(TEST_INPUT_FILENAME), engine), 37)
+                self.assertEqual(solve_part2(parse_input(TEST_INPUT_FILENAME), engine), 26)
 
     def test_count_number_occupied_seats(self):
         '''Test the count_occupied_seats function.'''
@@ -569,5 +1583,6 @@ if __name__ == '__main__':
     print('Running unit tests...')
     unittest.main(verbosity=2, exit=False)
     print('Puzzle Answers:')
-    print(f'Part 1: {solve_part1(INPUT_FILENAME)}')
-    print(f"Part 2: {solve_part2(INPUT_FILENAME)}")
+    seat_matrix = parse_input(INPUT_FILENAME)
+    print(f'Part 1: {solve_part1(seat_matrix)}')
+    print(f"Part 2: {solve_part2(seat_matrix)}")
@@ -84,11 +84,26 @@ that location and the ship's starting position?
 
 from __future__ import annotations
 import os
-from typing import Iterable, Dict
+from array import array
+from bisect import bisect_right
+from functools import reduce
+from itertools import accumulate
+from typing import Iterable, Iterator, Dict, List, NamedTuple, Tuple
 import unittest
 
 
 INPUT_FILENAME = 'day_12_input.txt'
+PARSER_VERSION = 1
+OPCODES = {
+    'N': 0,
+    'S': 1,
+    'E': 2,
+    'W': 3,
+    'R': 4,
+    'F': 5,
+}
+NORTH, SOUTH, EAST, WEST, ROTATE, FORWARD = range(6)
+HEADINGS = ((1, 0), (0, -1), (-1, 0), (0, 1))
 
 
 def load_input_file(filename: str) -> Iterable[str]:
@@ -96,6 +111,44 @@ def load_input_file(filename: str) -> Iterable[str]:
     with open(os.path.join(os.path.dirname(__file__), filename), 'r') as input_file:
         return map(str.strip, input_file.readlines())
 
+
+class NavigationProgram(NamedTuple):
+    '''
+    Compiled navigation instructions: parallel arrays of opcodes and arguments. Turns are stored
+    as a number of clockwise quarter turns.
+    '''
+    opcodes: array
+    arguments: array
+
+
+def compile_route(actions: Iterable[str]) -> NavigationProgram:
+    '''Compile navigation actions into a program that can be replayed quickly'''
+    opcodes = array('b')
+    arguments = array('i')
+
+    for action in actions:
+        name, value = action[0], int(action[1:])
+
+        if name in 'LR':
+            if value % 90:
+                raise ValueError(f'invalid rotation: {action}')
+
+            value = (value // 90 if name == 'R' else -value // 90) % 4
+            name = 'R'
+        elif name not in OPCODES:
+            raise ValueError(f'invalid action: {action}')
+
+        opcodes.append(OPCODES[name])
+        arguments.append(value)
+
+    return NavigationProgram(opcodes, arguments)
+
+
+def compile_route_file(filename: str) -> NavigationProgram:
+    '''Compile the navigation actions of a route file'''
+    return compile_route(action for action in load_input_file(filename) if action)
+
+
 class Ship:
     '''Class that represents a ship and its position'''
 
@@ -134,6 +187,29 @@ class Ship:
 
         return self
 
+    def run_program(self, program: NavigationProgram) -> Ship:
+        '''Update the position of the ship by running a compiled navigation program'''
+        x_axis, y_axis, quarter_turns = self.__x_axis, self.__y_axis, self.__angle // 90
+
+        for opcode, argument in zip(program.opcodes, program.arguments):
+            if opcode == FORWARD:
+                x_step, y_step = HEADINGS[quarter_turns]
+                x_axis += x_step * argument
+                y_axis += y_step * argument
+            elif opcode == ROTATE:
+                quarter_turns = (quarter_turns + argument) % 4
+            elif opcode == NORTH:
+                y_axis += argument
+            elif opcode == SOUTH:
+                y_axis -= argument
+            elif opcode == EAST:
+                x_axis += argument
+            else:
+                x_axis -= argument
+
+        self.__x_axis, self.__y_axis, self.__angle = x_axis, y_axis, quarter_turns * 90
+        return self
+
     def update_position_with_values(self, x_axis: int, y_axis: int) -> Ship:
         '''Update the position of the ship using the provided axis delta values'''
         self.__x_axis += x_axis
@@ -197,6 +273,35 @@ class Waypoint:
 
         return self
 
+    def run_program(self, program: NavigationProgram) -> Waypoint:
+        '''Update the waypoint and its ship by running a compiled navigation program'''
+        x_axis, y_axis = self.__x_axis, self.__y_axis
+        ship_x_axis = ship_y_axis = 0
+
+        for opcode, argument in zip(program.opcodes, program.arguments):
+            if opcode == FORWARD:
+                ship_x_axis += x_axis * argument
+                ship_y_axis += y_axis * argument
+            elif opcode == ROTATE:
+                if argument == 1:
+                    x_axis, y_axis = y_axis, -x_axis
+                elif argument == 2:
+                    x_axis, y_axis = -x_axis, -y_axis
+                elif argument == 3:
+                    x_axis, y_axis = -y_axis, x_axis
+            elif opcode == NORTH:
+                y_axis += argument
+            elif opcode == SOUTH:
+                y_axis -= argument
+            elif opcode == EAST:
+                x_axis += argument
+            else:
+                x_axis -= argument
+
+        self.__x_axis, self.__y_axis = x_axis, y_axis
+        self.ship.update_position_with_values(ship_x_axis, ship_y_axis)
+        return self
+
     def get_position(self) -> Dict[str, int]:
         '''Get the position of the waypoint'''
 
@@ -208,22 +313,256 @@ class Waypoint:
         return self.ship.get_position()
 
 
-def solve_part1(filename: str) -> int:
+def fold_ship_route(program: NavigationProgram) -> NavigationProgram:
+    '''
+    Fold every run of translations between two rotations into a single east, north and forward
+    move, which gives the same ship position whatever the initial heading.
+    '''
+    opcodes = array('b')
+    arguments = array('i')
+    east = north = forward = 0
+
+    def flush() -> None:
+        for opcode, argument in ((EAST, east), (NORTH, north), (FORWARD, forward)):
+            if argument:
+                opcodes.append(opcode)
+                arguments.append(argument)
+
+    for opcode, argument in zip(program.opcodes, program.arguments):
+        if opcode == ROTATE:
+            flush()
+            east = north = forward = 0
+
+            if opcodes and opcodes[-1] == ROTATE:
+                arguments[-1] = (arguments[-1] + argument) % 4
+            else:
+                opcodes.append(ROTATE)
+                arguments.append(argument)
+        elif opcode == FORWARD:
+            forward += argument
+        elif opcode in (NORTH, SOUTH):
+            north += argument if opcode == NORTH else -argument
+        else:
+            east += argument if opcode == EAST else -argument
+
+    flush()
+    return NavigationProgram(opcodes, arguments)
+
+
+Matrix = Tuple[int, int, int, int]
+Vector = Tuple[int, int]
+
+
+def multiply_matrices(left: Matrix, right: Matrix) -> Matrix:
+    '''Multiply two 2x2 matrices stored row by row'''
+    return (left[0] * right[0] + left[1] * right[2], left[0] * right[1] + left[1] * right[3],
+            left[2] * right[0] + left[3] * right[2], left[2] * right[1] + left[3] * right[3])
+
+
+def transform_vector(matrix: Matrix, vector: Vector) -> Vector:
+    '''Multiply a vector by a 2x2 matrix stored row by row'''
+    return (matrix[0] * vector[0] + matrix[1] * vector[1],
+            matrix[2] * vector[0] + matrix[3] * vector[1])
+
+
+IDENTITY: Matrix = (1, 0, 0, 1)
+QUARTER_TURNS: Tuple[Matrix, ...] = ((1, 0, 0, 1), (0, 1, -1, 0), (-1, 0, 0, -1), (0, -1, 1, 0))
+
+
+class RouteTransform(NamedTuple):
+    '''
+    Effect of a run of actions on the waypoint model, as an affine transform of the state:
+    the waypoint becomes `rotation * waypoint + waypoint_shift` and the ship becomes
+    `ship + drift * waypoint + ship_shift`.
+    '''
+    rotation: Matrix = IDENTITY
+    waypoint_shift: Vector = (0, 0)
+    drift: Matrix = (0, 0, 0, 0)
+    ship_shift: Vector = (0, 0)
+
+    @classmethod
+    def from_instruction(cls, opcode: int, argument: int) -> RouteTransform:
+        '''Return the transform of a single compiled instruction'''
+        if opcode == FORWARD:
+            return cls(drift=(argument, 0, 0, argument))
+        if opcode == ROTATE:
+            return cls(rotation=QUARTER_TURNS[argument % 4])
+        if opcode in (NORTH, SOUTH):
+            return cls(waypoint_shift=(0, argument if opcode == NORTH else -argument))
+
+        return cls(waypoint_shift=(argument if opcode == EAST else -argument, 0))
+
+    @classmethod
+    def from_program(cls, program: NavigationProgram, start: int = 0,
+                     end: int = -1) -> RouteTransform:
+        '''Return the transform of a range of instructions of a compiled program'''
+        end = len(program.opcodes) if end < 0 else end
+        return reduce(RouteTransform.then,
+                      (cls.from_instruction(program.opcodes[step], program.arguments[step])
+                       for step in range(start, end)),
+                      cls())
+
+    def then(self, other: RouteTransform) -> RouteTransform:
+        '''Return the transform that applies this transform followed by another one'''
+        moved_shift = transform_vector(other.rotation, self.waypoint_shift)
+        drifted_shift = transform_vector(other.drift, self.waypoint_shift)
+        drift = multiply_matrices(other.drift, self.rotation)
+
+        return RouteTransform(
+            multiply_matrices(other.rotation, self.rotation),
+            (moved_shift[0] + other.waypoint_shift[0], moved_shift[1] + other.waypoint_shift[1]),
+            (self.drift[0] + drift[0], self.drift[1] + drift[1],
+             self.drift[2] + drift[2], self.drift[3] + drift[3]),
+            (self.ship_shift[0] + drifted_shift[0] + other.ship_shift[0],
+             self.ship_shift[1] + drifted_shift[1] + other.ship_shift[1]))
+
+    def inverse(self) -> RouteTransform:
+        '''Return the transform that undoes this one; rotations are inverted by transposing'''
+        rotation = (self.rotation[0], self.rotation[2], self.rotation[1], self.rotation[3])
+        waypoint_shift = transform_vector(rotation, self.waypoint_shift)
+        drift = multiply_matrices(self.drift, rotation)
+        drifted_shift = transform_vector(drift, self.waypoint_shift)
+
+        return RouteTransform(rotation,
+                              (-waypoint_shift[0], -waypoint_shift[1]),
+                              (-drift[0], -drift[1], -drift[2], -drift[3]),
+                              (drifted_shift[0] - self.ship_shift[0],
+                               drifted_shift[1] - self.ship_shift[1]))
+
+    def apply(self, ship: Vector, waypoint: Vector) -> Tuple[Vector, Vector]:
+        '''Return the ship and waypoint positions after applying the transform'''
+        moved_waypoint = transform_vector(self.rotation, waypoint)
+        drift = transform_vector(self.drift, waypoint)
+
+        return ((ship[0] + drift[0] + self.ship_shift[0], ship[1] + drift[1] + self.ship_shift[1]),
+                (moved_waypoint[0] + self.waypoint_shift[0],
+                 moved_waypoint[1] + self.waypoint_shift[1]))
+
+
+class RouteSegments:
+    '''
+    Transforms of fixed-size chunks of a compiled program, with their prefix compositions. The
+    chunks are independent of each other and composing them is associative, so the route is
+    reduced by a prefix scan over the chunks, and the transform of any window of instructions
+    is the inverse of the prefix before it followed by the prefix after it, plus at most two
+    partial chunks.
+    '''
+
+    def __init__(self, program: NavigationProgram, chunk_size: int = 1024) -> None:
+        self.program = program
+        self.chunk_size = chunk_size
+        self.length = len(program.opcodes)
+        chunks = [RouteTransform.from_program(program, start, min(start + chunk_size,
+                                                                  self.length))
+                  for start in range(0, self.length, chunk_size)]
+        self.prefixes: List[RouteTransform] = list(accumulate(chunks, RouteTransform.then,
+                                                              initial=RouteTransform()))
+
+    def prefix(self, step: int) -> RouteTransform:
+        '''Return the transform of the first instructions of the program, up to a step'''
+        chunk, remainder = divmod(step, self.chunk_size)
+        return self.prefixes[chunk].then(
+            RouteTransform.from_program(self.program, step - remainder, step))
+
+    def window(self, start: int, end: int) -> RouteTransform:
+        '''Return the transform of the instructions from a start step up to an end step'''
+        if not 0 <= start <= end <= self.length:
+            raise IndexError(f'invalid window: {start}-{end}')
+
+        return self.prefix(start).inverse().then(self.prefix(end))
+
+    def total(self) -> RouteTransform:
+        '''Return the transform of the whole program'''
+        return self.prefixes[-1]
+
+
+def trace_ship_positions(program: NavigationProgram,
+                         waypoint_model: bool = False) -> Iterator[Vector]:
+    '''Yield the position of the ship after each instruction of a compiled program'''
+    ship_x_axis = ship_y_axis = 0
+    x_axis, y_axis = (10, 1) if waypoint_model else HEADINGS[0]
+
+    for opcode, argument in zip(program.opcodes, program.arguments):
+        if opcode == FORWARD:
+            ship_x_axis += x_axis * argument
+            ship_y_axis += y_axis * argument
+        elif opcode == ROTATE:
+            x_axis, y_axis = transform_vector(QUARTER_TURNS[argument], (x_axis, y_axis))
+        elif not waypoint_model:
+            ship_x_axis += (0, 0, argument, -argument)[opcode]
+            ship_y_axis += (argument, -argument, 0, 0)[opcode]
+        else:
+            x_axis += (0, 0, argument, -argument)[opcode]
+            y_axis += (argument, -argument, 0, 0)[opcode]
+
+        yield ship_x_axis, ship_y_axis
+
+
+class Voyage:
+    '''
+    Positions of the ship over a whole route, recorded once in compact columns along with the
+    running bounding box and maximum Manhattan distance, so questions about any step of the
+    voyage are answered without replaying the route.
+    '''
+
+    def __init__(self, program: NavigationProgram, waypoint_model: bool = False) -> None:
+        self.x_axis = array('q', [0])
+        self.y_axis = array('q', [0])
+        self.min_x_axis = array('q', [0])
+        self.max_x_axis = array('q', [0])
+        self.min_y_axis = array('q', [0])
+        self.max_y_axis = array('q', [0])
+        self.max_distance = array('q', [0])
+
+        for x_axis, y_axis in trace_ship_positions(program, waypoint_model):
+            self.x_axis.append(x_axis)
+            self.y_axis.append(y_axis)
+            self.min_x_axis.append(min(self.min_x_axis[-1], x_axis))
+            self.max_x_axis.append(max(self.max_x_axis[-1], x_axis))
+            self.min_y_axis.append(min(self.min_y_axis[-1], y_axis))
+            self.max_y_axis.append(max(self.max_y_axis[-1], y_axis))
+            self.max_distance.append(max(self.max_distance[-1], abs(x_axis) + abs(y_axis)))
+
+    def __len__(self) -> int:
+        return len(self.x_axis) - 1
+
+    def get_position(self, step: int = -1) -> Dict[str, int]:
+        '''Get the position of the ship after a number of steps, the last one by default'''
+        return {'x': self.x_axis[step], 'y': self.y_axis[step]}
+
+    def get_bounding_box(self, step: int = -1) -> Dict[str, int]:
+        '''Get the bounding box of the positions of the ship up to a number of steps'''
+        return {'min_x': self.min_x_axis[step], 'max_x': self.max_x_axis[step],
+                'min_y': self.min_y_axis[step], 'max_y': self.max_y_axis[step]}
+
+    def get_max_distance(self, step: int = -1) -> int:
+        '''Get the largest Manhattan distance reached by the ship up to a number of steps'''
+        return self.max_distance[step]
+
+    def first_step_beyond(self, distance: int) -> int:
+        '''
+        Return the first step after which the ship is further than a Manhattan distance from
+        its starting point, or -1 if it never is
+        '''
+        step = bisect_right(self.max_distance, distance)
+        return step if step < len(self.max_distance) else -1
+
+
+def parse_input(filename: str) -> NavigationProgram:
+    '''Parse the route file into a navigation program'''
+    return compile_route_file(filename)
+
+
+def solve_part1(program: NavigationProgram) -> int:
     '''Solve Part 1 of the daily puzzle'''
-    ship = Ship()
-
-    for action in load_input_file(filename):
-        ship.update_position(action)
+    ship = Ship().run_program(program)
 
     return abs(ship.get_position()['x']) + abs(ship.get_position()['y'])
 
 
-def solve_part2(filename: str) -> int:
-    '''Solve Part 1 of the daily puzzle'''
-    waypoint = Waypoint()
-
-    for action in load_input_file(filename):
-        waypoint.update_position(action)
+def solve_part2(program: NavigationProgram) -> int:
+    '''Solve Part 2 of the daily puzzle'''
+    waypoint = Waypoint().run_program(program)
 
     return abs(waypoint.get_ship_position()['x']) + abs(waypoint.get_ship_position()['y'])
 
@@ -283,10 +622,138 @@ class Tests(unittest.TestCase):
                 self.assertEqual(waypoint_result, case[2])
                 self.assertEqual(ship_result, case[3])
 
+    route = ('F10', 'N3', 'F7', 'R90', 'F11', 'L270', 'S4', 'W2', 'R180', 'E1', 'L90', 'F5')
+
+    def test_compile_route(self):
+        '''Test the compilation of navigation actions into a program'''
+        program = compile_route(('F10', 'N3', 'L90', 'R270', 'R180', 'W4', 'S1', 'E2'))
+        self.assertEqual(list(program.opcodes), [5, 0, 4, 4, 4, 3, 1, 2])
+        self.assertEqual(list(program.arguments), [10, 3, 3, 3, 2, 4, 1, 2])
+
+        for action in ('L45', 'X10'):
+            with self.subTest(action):
+                with self.assertRaises(ValueError):
+                    compile_route((action,))
+
+    def test_run_program_matches_actions(self):
+        '''Test that running a compiled program matches updating with each action'''
+        ship, waypoint = Ship(), Waypoint()
+
+        for action in self.route:
+            ship.update_position(action)
+            waypoint.update_position(action)
+
+        program = compile_route(self.route)
+        self.assertEqual(Ship().run_program(program).get_position(), ship.get_position())
+        compiled_waypoint = Waypoint().run_program(program)
+        self.assertEqual(compiled_waypoint.get_position(), waypoint.get_position())
+        self.assertEqual(compiled_waypoint.get_ship_position(), waypoint.get_ship_position())
+
+    def test_fold_ship_route(self):
+        '''Test that folding translations keeps the ship position for any initial heading'''
+        folded = fold_ship_route(compile_route(('F10', 'N3', 'S1', 'F7', 'E2', 'R90', 'L90',
+                                                'F11', 'W4')))
+        self.assertEqual(list(folded.opcodes), [2, 0, 5, 4, 2, 5])
+        self.assertEqual(list(folded.arguments), [2, 2, 17, 0, -4, 11])
+
+        program = compile_route(self.route + ('N4', 'S1', 'L90', 'R90', 'F3'))
+        folded = fold_ship_route(program)
+
+        for angle in ('R0', 'R90', 'R180', 'R270'):
+            with self.subTest(angle):
+                self.assertEqual(Ship().update_position(angle).run_program(folded).get_position(),
+                                 Ship().update_position(angle).run_program(program).get_position())
+
+    def test_route_transform(self):
+        '''Test that route transforms compose, invert and match the waypoint model'''
+        program = compile_route(self.route)
+        transform = RouteTransform.from_program(program)
+        waypoint = Waypoint().run_program(program)
+        ship = waypoint.get_ship_position()
+        expected = ((ship['x'], ship['y']),
+                    (waypoint.get_position()['x'], waypoint.get_position()['y']))
+
+        self.assertEqual(transform.apply((0, 0), (10, 1)), expected)
+        self.assertEqual(transform.then(transform.inverse()), RouteTransform())
+        self.assertEqual(transform.inverse().then(transform), RouteTransform())
+
+    def test_route_segments(self):
+        '''Test the window transforms answered from cached segment transforms'''
+        route = tuple(load_input_file(INPUT_FILENAME))
+        program = compile_route(route)
+        segments = RouteSegments(program, chunk_size=64)
+
+        self.assertEqual(segments.total(), RouteTransform.from_program(program))
+
+        for start, end in ((0, 0), (0, 100), (10, 700), (63, 64), (65, len(route))):
+            with self.subTest(start=start, end=end):
+                waypoint = Waypoint().run_program(compile_route(route[start:end]))
+                ship = waypoint.get_ship_position()
+                self.assertEqual(segments.window(start, end).apply((0, 0), (10, 1)),
+                                 ((ship['x'], ship['y']),
+                                  (waypoint.get_position()['x'], waypoint.get_position()['y'])))
+
+        with self.assertRaises(IndexError):
+            segments.window(5, 4)
+
+    def test_voyage(self):
+        '''Test the positions recorded over a voyage for both models'''
+        program = compile_route(self.route)
+
+        for waypoint_model in (False, True):
+            with self.subTest(waypoint_model=waypoint_model):
+                voyage = Voyage(program, waypoint_model)
+                model = Waypoint() if waypoint_model else Ship()
+                positions = [{'x': 0, 'y': 0}]
+
+                for action in self.route:
+                    model.update_position(action)
+                    position = model.get_ship_position() if isinstance(model, Waypoint) \
+                        else model.get_position()
+                    positions.append({'x': position['x'], 'y': position['y']})
+
+                self.assertEqual(len(voyage), len(self.route))
+                self.assertEqual([voyage.get_position(step) for step in range(len(positions))],
+                                 positions)
+
+                for step in (0, 3, len(self.route)):
+                    seen = positions[:step + 1]
+                    distances = [abs(seen_position['x']) + abs(seen_position['y'])
+                                 for seen_position in seen]
+                    self.assertEqual(voyage.get_bounding_box(step), {
+                        'min_x': min(position['x'] for position in seen),
+                        'max_x': max(position['x'] for position in seen),
+                        'min_y': min(position['y'] for position in seen),
+                        'max_y': max(position['y'] for position in seen),
+                    })
+                    self.assertEqual(voyage.get_max_distance(step), max(distances))
+
+    def test_voyage_first_step_beyond(self):
+        '''Test the first step after which the ship goes beyond a distance'''
+        voyage = Voyage(compile_route(('F10', 'N3', 'F7', 'R90', 'F11')))
+        self.assertEqual([voyage.first_step_beyond(distance) for distance in (0, 10, 13, 20, 25)],
+                         [1, 2, 3, 5, -1])
+
+    def test_solve(self):
+        '''Test both parts of the puzzle against the action by action solution'''
+        ship, waypoint = Ship(), Waypoint()
+
+        for action in load_input_file(INPUT_FILENAME):
+            ship.update_position(action)
+            waypoint.update_position(action)
+
+        program = parse_input(INPUT_FILENAME)
+        self.assertEqual(solve_part1(program),
+                         abs(ship.get_position()['x']) + abs(ship.get_position()['y']))
+        self.assertEqual(solve_part2(program),
+                         abs(waypoint.get_ship_position()['x']) +
+                         abs(waypoint.get_ship_position()['y']))
+
 
 if __name__ == '__main__':
     print('Running unit tests...')
     unittest.main(verbosity=2, exit=False)
     print('Puzzle Answers:')
-    print(f'Part 1: {solve_part1(INPUT_FILENAME)}')
-    print(f'Part 2: {solve_part2(INPUT_FILENAME)}')
+    navigation_program = parse_input(INPUT_FILENAME)
+    print(f'Part 1: {solve_part1(navigation_program)}')
+    print(f'Part 2: {solve_part2(navigation_program)}')
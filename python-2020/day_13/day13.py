@@ -140,13 +140,16 @@ positions in the list?
 
 from __future__ import annotations
 import os
-from typing import List, Tuple
+from itertools import islice
+from typing import Iterable, List, NamedTuple, Sequence, Tuple
 import unittest
 import math
 
 
 TEST_INPUT_FILENAME = 'day_13_test_input.txt'
 INPUT_FILENAME = 'day_13_input.txt'
+PARSER_VERSION = 1
+BATCH_SIZE = 65536
 
 
 def load_input_file(filename: str) -> Tuple[int, List[int]]:
@@ -159,9 +162,62 @@ def load_input_file(filename: str) -> Tuple[int, List[int]]:
         return (timestamp, bus_ids)
 
 
+class BusNotes(NamedTuple):
+    '''Notes of the input file: earliest timestamp, bus IDs and their schedule'''
+    timestamp: int
+    bus_ids: List[int]
+    schedule: List[Tuple[int, int]]
+
+
+def parse_input(filename: str) -> BusNotes:
+    '''Parse the notes of the input file, reading it once'''
+    with open(os.path.join(os.path.dirname(__file__), filename), 'r',
+              encoding='utf-8') as input_file:
+        timestamp = int(input_file.readline())
+        schedule = [(offset, int(bus_id))
+                    for offset, bus_id in enumerate(input_file.readline().strip().split(','))
+                    if bus_id != 'x']
+
+    return BusNotes(timestamp, [bus_id for _, bus_id in schedule], schedule)
+
+
+def load_schedule(filename: str) -> List[Tuple[int, int]]:
+    '''Load the (offset, bus_id) pairs of the buses in service from the input file'''
+    return parse_input(filename).schedule
+
+
 def get_next_bus_stop(timestamp: int, bus_id: int) -> int:
     '''Given a timestamp and bus_id, return the next timestamp at which the bus will stop'''
-    return math.ceil(timestamp / bus_id) * bus_id
+    return timestamp + -timestamp % bus_id
+
+
+def find_earliest_buses(timestamps: Iterable[int],
+                        bus_ids: Sequence[int]) -> List[Tuple[int, int]]:
+    '''
+    Given many timestamps and a list of bus_ids, return the earliest bus ID and the timestamp
+    for its next stop for each timestamp, in order. When buses stop at the same time, the one
+    listed first wins.
+
+    The wait for each bus is computed with exact integer arithmetic one bus at a time over a
+    batch of timestamps, and folded with the index of the bus into a single key so the best bus
+    of every timestamp is a plain minimum.
+    '''
+    if not bus_ids:
+        raise ValueError('the bus schedule is empty, there is no bus to take')
+
+    results: List[Tuple[int, int]] = []
+    number_of_buses = len(bus_ids)
+    timestamps = iter(timestamps)
+
+    while batch := list(islice(timestamps, BATCH_SIZE)):
+        keys = [[-timestamp % bus_id * number_of_buses + index for timestamp in batch]
+                for index, bus_id in enumerate(bus_ids)]
+
+        for timestamp, key in zip(batch, map(min, zip(*keys))):
+            wait, index = divmod(key, number_of_buses)
+            results.append((bus_ids[index], timestamp + wait))
+
+    return results
 
 
 def find_earliest_bus(timestamp: int, bus_ids: List[int]) -> Tuple[int, int]:
@@ -169,34 +225,56 @@ def find_earliest_bus(timestamp: int, bus_ids: List[int]) -> Tuple[int, int]:
     Given a timestamp and a list of bus_ids, return the earliest bus ID and the timestamp
     for its next stop.
     '''
-    bus_stops = {}
+    return find_earliest_buses((timestamp,), bus_ids)[0]
+
+
+def solve_part1(notes: BusNotes) -> int:
+    '''Solve part 1 of the daily puzzle'''
+    earliest_bus_id, next_timestamp = find_earliest_bus(notes.timestamp, notes.bus_ids)
+
+    return (next_timestamp - notes.timestamp) * earliest_bus_id
+
+
+def combine_congruences(first: Tuple[int, int], second: Tuple[int, int]) -> Tuple[int, int]:
+    '''
+    Given two congruences as (remainder, modulus) pairs, return the congruence satisfied by the
+    numbers that satisfy both. The moduli do not need to be coprime, but the congruences must
+    then agree modulo their greatest common divisor.
+    '''
+    remainder, modulus = first
+    other_remainder, other_modulus = second
+    divisor = math.gcd(modulus, other_modulus)
 
-    for bus_id in bus_ids:
-        bus_stops[get_next_bus_stop(timestamp, bus_id)] = bus_id
+    if (other_remainder - remainder) % divisor:
+        raise ValueError(f'inconsistent congruences: x = {remainder} (mod {modulus}) and '
+                         f'x = {other_remainder} (mod {other_modulus})')
 
-    next_bus_stop_timestamp = min(bus_stops.keys())
-    earliest_bus_id = bus_stops[next_bus_stop_timestamp]
+    reduced_modulus = other_modulus // divisor
+    multiple = ((other_remainder - remainder) // divisor *
+                pow(modulus // divisor, -1, reduced_modulus)) % reduced_modulus
 
-    return (earliest_bus_id, next_bus_stop_timestamp)
+    return ((remainder + modulus * multiple) % (modulus * reduced_modulus),
+            modulus * reduced_modulus)
 
 
-def solve_part1(filename: str) -> int:
-    '''Solve part 1 of the daily puzzle'''
-    timestamp, buses = load_input_file(filename)
+def find_earliest_departure(schedule: Iterable[Tuple[int, int]]) -> Tuple[int, int]:
+    '''
+    Given (offset, bus_id) pairs, return the earliest timestamp at which each bus departs
+    `offset` minutes after it, along with the period after which the pattern repeats.
+    '''
+    congruence = (0, 1)
 
-    earliest_bus_id, next_timestamp = find_earliest_bus(timestamp, buses)
+    for offset, bus_id in schedule:
+        congruence = combine_congruences(congruence, (-offset % bus_id, bus_id))
 
-    return (next_timestamp - timestamp) * earliest_bus_id
+    return congruence
 
 
-# Reference: https://laptrinhx.com/advent-of-code-2020-day-13-2503899644/
-# Seems to be possible to solve with the Chinese Remainder Theorem:
-# https://en.wikipedia.org/wiki/Chinese_remainder_theorem
-# Full explanation here that I would need to get into code:
-# https://www.dave4math.com/mathematics/chinese-remainder-theorem/
-def solve_part2(filename: str) -> str:
+def solve_part2(notes: BusNotes) -> int:
     '''Solve part 2 of the daily puzzle'''
-    return filename
+    timestamp, _ = find_earliest_departure(notes.schedule)
+
+    return timestamp
 
 class Tests(unittest.TestCase):
     '''Tests'''
@@ -224,20 +302,97 @@ class Tests(unittest.TestCase):
         result = find_earliest_bus(self.timestamp, [bus_id for bus_id, _ in self.buses])
         self.assertEqual(result, (59, 944))
 
+        with self.assertRaisesRegex(ValueError, 'bus schedule is empty'):
+            find_earliest_bus(self.timestamp, [])
+
+        with self.assertRaisesRegex(ValueError, 'bus schedule is empty'):
+            find_earliest_buses([self.timestamp], [])
+
+    def test_next_bus_stop_with_large_timestamp(self) -> None:
+        '''Test the next stop past the precision of floating point numbers'''
+        timestamp = 2 ** 60 + 1
+        self.assertEqual(get_next_bus_stop(timestamp, 7), timestamp + 5)
+        self.assertEqual(get_next_bus_stop(timestamp, 2 ** 60 + 1), timestamp)
+
+    def test_find_earliest_buses(self) -> None:
+        '''Test to find the earliest bus for many timestamps at once'''
+        bus_ids = [bus_id for bus_id, _ in self.buses]
+        timestamps = [939, 0, 944, 945, 2 ** 70]
+        expected = [find_earliest_bus(timestamp, bus_ids) for timestamp in timestamps]
+
+        self.assertEqual(find_earliest_buses(timestamps, bus_ids), expected)
+        self.assertEqual(expected[:4], [(59, 944), (7, 0), (59, 944), (7, 945)])
+        self.assertEqual(find_earliest_buses(range(100), [3, 2, 6]),
+                         [(3 if timestamp % 3 == 0 or timestamp % 6 == 5 else 2,
+                           timestamp + min(-timestamp % 3, -timestamp % 2))
+                          for timestamp in range(100)])
+
+    def test_find_earliest_buses_across_batches(self) -> None:
+        '''Test a number of timestamps larger than a batch'''
+        results = find_earliest_buses(range(BATCH_SIZE + 10), [5, 11])
+        self.assertEqual(len(results), BATCH_SIZE + 10)
+        self.assertEqual(results[-1], (5, BATCH_SIZE + 9))
+
     def test_solve_part1(self) -> None:
         '''Test to solve part 1 with test data'''
-        result = solve_part1(TEST_INPUT_FILENAME)
+        result = solve_part1(parse_input(TEST_INPUT_FILENAME))
         self.assertEqual(result, 295)
 
+    def test_load_schedule(self) -> None:
+        '''Test that the schedule keeps the offset of each bus'''
+        result = load_schedule(TEST_INPUT_FILENAME)
+        self.assertEqual(result, [(0, 7), (1, 13), (4, 59), (6, 31), (7, 19)])
+
+    def test_parse_input(self) -> None:
+        '''Test that the notes parsed in one read match load_input_file'''
+        notes = parse_input(TEST_INPUT_FILENAME)
+        self.assertEqual((notes.timestamp, notes.bus_ids), load_input_file(TEST_INPUT_FILENAME))
+        self.assertEqual(notes.bus_ids, [7, 13, 59, 31, 19])
+
     def test_solve_part2(self) -> None:
         '''Test to solve part 2 with test data'''
-        result = solve_part2(TEST_INPUT_FILENAME)
-        self.assertEqual(result, TEST_INPUT_FILENAME)
+        result = solve_part2(parse_input(TEST_INPUT_FILENAME))
+        self.assertEqual(result, 1068781)
+
+    def test_find_earliest_departure(self) -> None:
+        '''Test to find the earliest departure of other schedules'''
+        cases = (
+            ('17,x,13,19', 3417),
+            ('67,7,59,61', 754018),
+            ('67,x,7,59,61', 779210),
+            ('67,7,x,59,61', 1261476),
+            ('1789,37,47,1889', 1202161486),
+        )
+
+        for case in cases:
+            with self.subTest(case):
+                schedule = [(offset, int(bus_id)) for offset, bus_id in
+                            enumerate(case[0].split(',')) if bus_id != 'x']
+                self.assertEqual(find_earliest_departure(schedule)[0], case[1])
+
+    def test_find_earliest_departure_with_shared_factors(self) -> None:
+        '''Test bus IDs that are not coprime'''
+        self.assertEqual(find_earliest_departure([(0, 4), (2, 6)]), (4, 12))
+        self.assertEqual(find_earliest_departure([(0, 6), (0, 6), (3, 9)]), (6, 18))
+
+        with self.assertRaises(ValueError):
+            find_earliest_departure([(0, 4), (1, 6)])
+
+    def test_find_earliest_departure_with_large_schedule(self) -> None:
+        '''Test a schedule of a thousand buses with a very large answer'''
+        primes = [number for number in range(2, 8000)
+                  if all(number % divisor for divisor in range(2, math.isqrt(number) + 1))]
+        schedule = list(enumerate(primes[:1000]))
+        timestamp, period = find_earliest_departure(schedule)
+
+        self.assertEqual(period, math.prod(primes[:1000]))
+        self.assertTrue(all((timestamp + offset) % bus_id == 0 for offset, bus_id in schedule))
 
 
 if __name__ == '__main__': # pragma: no cover
     print('Running unit tests...')
     unittest.main(verbosity=2, exit=False)
     print('Puzzle Answers:')
-    print(f'Part 1: {solve_part1(INPUT_FILENAME)}')
-    print(f'Part 2: {solve_part2(INPUT_FILENAME)}')
+    bus_notes = parse_input(INPUT_FILENAME)
+    print(f'Part 1: {solve_part1(bus_notes)}')
+    print(f'Part 2: {solve_part2(bus_notes)}')
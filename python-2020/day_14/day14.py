@@ -130,16 +130,23 @@ sum of all values left in memory after it completes?
 '''
 
 from __future__ import annotations
+from abc import ABC, abstractmethod
 import os
-from typing import Iterable, Dict, List, Iterator, Match
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Dict, List, Iterator, Match, NamedTuple, Tuple, Type
 import unittest
+from unittest import mock
 import re
 import math
+import time
+import tracemalloc
 
 
 TEST_INPUT_FILENAME = 'day_14_test_input.txt'
 TEST_INPUT_FILENAME2 = 'day_14_test_input2.txt'
 INPUT_FILENAME = 'day_14_input.txt'
+PARSER_VERSION = 1
 
 
 def load_input_file(filename: str) -> Iterable[str]:
@@ -149,14 +156,294 @@ def load_input_file(filename: str) -> Iterable[str]:
         return map(str.strip, input_file.readlines())
 
 
+class MaskBits(NamedTuple):
+    '''Integer form of a mask: bits forced to 1, bits kept (not forced to 0) and floating bits'''
+    or_mask: int
+    and_mask: int
+    floating_mask: int
+
+
+def compile_mask(mask: str) -> MaskBits:
+    '''Turn a mask string into the integer masks used to apply it'''
+    return MaskBits(int(mask.replace('X', '0'), 2),
+                    int(mask.replace('X', '1'), 2),
+                    int(mask.replace('1', '0').replace('X', '1'), 2))
+
+
+def floating_addresses(base_address: int, floating_mask: int) -> Iterator[int]:
+    '''
+    Yield, in increasing order, every address made of a base address with any combination of
+    the floating bits set, by walking the submasks of the floating mask.
+    '''
+    submask = 0
+
+    while True:
+        yield base_address | submask
+        submask = (submask - floating_mask) & floating_mask
+
+        if not submask:
+            return
+
+
+class SymbolicMemory:
+    '''
+    Memory written through floating addresses, stored as cubes of addresses instead of one entry
+    per address. A cube is the set of addresses that match its fixed bits everywhere except on
+    its floating bits. Cubes never overlap: a write removes its addresses from the older cubes,
+    splitting them into at most one cube per bit they float on and the new write does not.
+    '''
+
+    def __init__(self) -> None:
+        self.__cubes: List[Tuple[int, int, int]] = []
+
+    @staticmethod
+    def subtract(cube: Tuple[int, int, int], fixed_bits: int,
+                 floating_mask: int) -> List[Tuple[int, int, int]]:
+        '''Return the disjoint cubes covering the addresses of a cube outside another cube'''
+        cube_fixed_bits, cube_floating_mask, value = cube
+
+        if (cube_fixed_bits ^ fixed_bits) & ~cube_floating_mask & ~floating_mask:
+            return [cube]
+
+        remainder = []
+        splitting_bits = cube_floating_mask & ~floating_mask
+
+        while splitting_bits:
+            bit = splitting_bits & -splitting_bits
+            splitting_bits ^= bit
+            cube_floating_mask ^= bit
+            remainder.append((cube_fixed_bits | (~fixed_bits & bit), cube_floating_mask, value))
+            cube_fixed_bits |= fixed_bits & bit
+
+        return remainder
+
+    def write(self, fixed_bits: int, floating_mask: int, value: int) -> None:
+        '''Write a value to every address of a cube'''
+        cubes = []
+
+        for cube in self.__cubes:
+            cubes.extend(self.subtract(cube, fixed_bits, floating_mask))
+
+        cubes.append((fixed_bits, floating_mask, value))
+        self.__cubes = cubes
+
+    def sum(self) -> int:
+        '''Return the sum of the values of every address written'''
+        return sum(value << bin(floating_mask).count('1')
+                   for _, floating_mask, value in self.__cubes)
+
+    def cubes(self) -> List[Tuple[int, int, int]]:
+        '''Return the cubes of the memory as (fixed_bits, floating_mask, value) tuples'''
+        return list(self.__cubes)
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        '''Yield the (address, value) pairs written, expanding every cube'''
+        for fixed_bits, floating_mask, value in self.__cubes:
+            for address in floating_addresses(fixed_bits, floating_mask):
+                yield address, value
+
+
+class MemoryStore(ABC):
+    '''Base class for the stores that hold the memory of a program'''
+
+    @abstractmethod
+    def get(self, address: int) -> int:
+        '''Return the value at an address, raising KeyError if it was never written'''
+
+    @abstractmethod
+    def set(self, address: int, value: int) -> None:
+        '''Write a value at an address'''
+
+    def set_many(self, addresses: Iterable[int], value: int) -> None:
+        '''Write the same value at many addresses'''
+        for address in addresses:
+            self.set(address, value)
+
+    @abstractmethod
+    def items(self) -> Iterator[Tuple[int, int]]:
+        '''Yield the (address, value) pairs written'''
+
+    def sum(self) -> int:
+        '''Return the sum of the values written, without building a dict of the memory'''
+        return sum(value for _, value in self.items())
+
+    def dump(self) -> Dict[int, int]:
+        '''Return the memory as a dict'''
+        return dict(self.items())
+
+
+class DictMemory(MemoryStore):
+    '''Memory held in a dict keyed by address'''
+
+    def __init__(self) -> None:
+        self.__memory: Dict[int, int] = {}
+
+    def get(self, address: int) -> int:
+        return self.__memory[address]
+
+    def set(self, address: int, value: int) -> None:
+        self.__memory[address] = value
+
+    def set_many(self, addresses: Iterable[int], value: int) -> None:
+        self.__memory.update(dict.fromkeys(addresses, value))
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.__memory.items())
+
+    def sum(self) -> int:
+        return sum(self.__memory.values())
+
+    def dump(self) -> Dict[int, int]:
+        return self.__memory
+
+
+class SortedArrayMemory(MemoryStore):
+    '''
+    Memory held in two parallel arrays of addresses and values sorted by address. Writes are
+    buffered and merged into the arrays in bulk once the buffer grows large enough.
+    '''
+
+    def __init__(self, merge_threshold: int = 4096) -> None:
+        self.__addresses = array('Q')
+        self.__values = array('Q')
+        self.__pending: Dict[int, int] = {}
+        self.__merge_threshold = merge_threshold
+
+    def __len__(self) -> int:
+        self.merge()
+        return len(self.__addresses)
+
+    def merge(self) -> None:
+        '''Merge the buffered writes into the sorted arrays'''
+        if not self.__pending:
+            return
+
+        addresses = array('Q')
+        values = array('Q')
+        index = 0
+
+        for address in sorted(self.__pending):
+            position = bisect_left(self.__addresses, address, index)
+            addresses.extend(self.__addresses[index:position])
+            values.extend(self.__values[index:position])
+            index = position
+
+            if index < len(self.__addresses) and self.__addresses[index] == address:
+                index += 1
+
+            addresses.append(address)
+            values.append(self.__pending[address])
+
+        addresses.extend(self.__addresses[index:])
+        values.extend(self.__values[index:])
+        self.__addresses, self.__values = addresses, values
+        self.__pending = {}
+
+    def __merge_if_needed(self) -> None:
+        if len(self.__pending) >= max(self.__merge_threshold, len(self.__addresses) // 4):
+            self.merge()
+
+    def get(self, address: int) -> int:
+        if address in self.__pending:
+            return self.__pending[address]
+
+        index = bisect_left(self.__addresses, address)
+
+        if index < len(self.__addresses) and self.__addresses[index] == address:
+            return self.__values[index]
+
+        raise KeyError(address)
+
+    def set(self, address: int, value: int) -> None:
+        self.__pending[address] = value
+        self.__merge_if_needed()
+
+    def set_many(self, addresses: Iterable[int], value: int) -> None:
+        self.__pending.update(dict.fromkeys(addresses, value))
+        self.__merge_if_needed()
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        self.merge()
+        return zip(self.__addresses, self.__values)
+
+    def sum(self) -> int:
+        self.merge()
+        return sum(self.__values)
+
+
+class PagedMemory(MemoryStore):
+    '''
+    Memory split into fixed-size pages of values, allocated the first time one of their
+    addresses is written, with a byte per address recording whether it was written.
+
+    A page costs 9 bytes per address whether it is written or not, 36 KiB with the default 12
+    page bits, so this store only suits addresses that cluster densely. The version 2 writes of
+    the puzzle input scatter about 73 000 addresses over 9281 pages, which take about 330 MiB
+    where a DictMemory needs a few tens of MiB; fewer page bits waste less on sparse addresses.
+    '''
+
+    def __init__(self, page_bits: int = 12) -> None:
+        self.__page_bits = page_bits
+        self.__page_size = 1 << page_bits
+        self.__pages: Dict[int, Tuple[array[int], bytearray]] = {}
+
+    def __page(self, page_number: int) -> Tuple[array[int], bytearray]:
+        if page_number not in self.__pages:
+            self.__pages[page_number] = (array('Q', bytes(8 * self.__page_size)),
+                                         bytearray(self.__page_size))
+
+        return self.__pages[page_number]
+
+    def get(self, address: int) -> int:
+        page_number, offset = address >> self.__page_bits, address & (self.__page_size - 1)
+
+        if page_number in self.__pages and self.__pages[page_number][1][offset]:
+            return self.__pages[page_number][0][offset]
+
+        raise KeyError(address)
+
+    def set(self, address: int, value: int) -> None:
+        values, written = self.__page(address >> self.__page_bits)
+        offset = address & (self.__page_size - 1)
+        values[offset] = value
+        written[offset] = 1
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        for page_number in sorted(self.__pages):
+            values, written = self.__pages[page_number]
+            base_address = page_number << self.__page_bits
+
+            for offset, is_written in enumerate(written):
+                if is_written:
+                    yield base_address + offset, values[offset]
+
+    def sum(self) -> int:
+        return sum(sum(values) for values, _ in self.__pages.values())
+
+    def pages(self) -> int:
+        '''Return the number of pages allocated'''
+        return len(self.__pages)
+
+
+MEMORY_BACKENDS: Dict[str, Type[MemoryStore]] = {
+    'dict': DictMemory,
+    'sorted': SortedArrayMemory,
+    'paged': PagedMemory,
+}
+
+
 class Program:
     '''Class that represents a program'''
-    mask_pattern = re.compile(r'mask\s=\s([X01]{36})')
-    memwrite_pattern = re.compile(r'mem\[(\d+)\]\s=\s(\d+)')
+    mask_prefix = 'mask = '
+    memwrite_prefix = 'mem['
+    memwrite_separator = '] = '
 
-    def __init__(self, version_one: bool = True) -> None:
+    def __init__(self, version_one: bool = True, symbolic: bool = False,
+                 memory: str = 'dict') -> None:
         self.__mask = 'X' * 36
-        self.__memory: Dict[int, int] = {}
+        self.__mask_bits = compile_mask(self.__mask)
+        self.__memory = MEMORY_BACKENDS[memory]()
+        self.__symbolic_memory = SymbolicMemory() if symbolic and not version_one else None
         self.__version_one = version_one
 
     def apply_v2_mask(self, memory_slot: int) -> str:
@@ -193,16 +480,26 @@ class Program:
 
     def read_program(self, instruction: str) -> None:
         '''Read a program line and call the proper action to be executed'''
-        if match := re.match(self.mask_pattern, instruction):
-            self.__mask = match.group(1)
-        if match := re.match(self.memwrite_pattern, instruction):
+        if instruction.startswith(self.mask_prefix):
+            self.mask = instruction[len(self.mask_prefix):]
+        elif instruction.startswith(self.memwrite_prefix):
+            address, _, value = instruction[len(self.memwrite_prefix):].partition(
+                self.memwrite_separator)
+
             if self.version_one:
-                value = int(match.group(2)) | int(self.mask.replace('X', '0'), 2)
-                value = value & int(self.mask.replace('X', '1'), 2)
-                self.set_memory(int(match.group(1)), value)
+                mask_bits = self.__mask_bits
+                self.__memory.set(int(address),
+                                  (int(value) | mask_bits.or_mask) & mask_bits.and_mask)
+            elif self.__symbolic_memory is not None:
+                mask_bits = self.__mask_bits
+                self.__symbolic_memory.write(
+                    (int(address) | mask_bits.or_mask) & ~mask_bits.floating_mask,
+                    mask_bits.floating_mask, int(value))
             else:
-                for mem_address in self.resolve_address(self.apply_v2_mask(int(match.group(1)))):
-                    self.set_memory(mem_address, int(match.group(2)))
+                mask_bits = self.__mask_bits
+                self.__memory.set_many(floating_addresses(
+                    (int(address) | mask_bits.or_mask) & ~mask_bits.floating_mask,
+                    mask_bits.floating_mask), int(value))
 
     @property
     def mask(self) -> str:
@@ -212,6 +509,12 @@ class Program:
     @mask.setter
     def mask(self, value: str) -> None:
         self.__mask = value
+        self.__mask_bits = compile_mask(value)
+
+    @property
+    def mask_bits(self) -> MaskBits:
+        '''Getter for the integer form of the mask'''
+        return self.__mask_bits
 
     @property
     def version_one(self) -> bool:
@@ -224,23 +527,117 @@ class Program:
 
     def get_memory(self, memslot: int) -> int:
         '''Getter for memory class member'''
-        return self.__memory[memslot]
+        return self.__memory.get(memslot)
 
     def set_memory(self, memslot: int, value: int) -> None:
         '''Setter for memory class member'''
-        self.__memory[memslot] = value
+        self.__memory.set(memslot, value)
 
     def dump_memory(self) -> Dict[int, int]:
-        '''Return the full memory dump of the program'''
-        return self.__memory
+        '''
+        Return the full memory dump of the program. A symbolic memory is expanded to one entry
+        per address, which can be very large for masks with many floating bits.
+        '''
+        if self.__symbolic_memory is not None:
+            return dict(self.__symbolic_memory.items())
+
+        return self.__memory.dump()
+
+    def sum_memory(self) -> int:
+        '''Return the sum of the values in memory'''
+        if self.__symbolic_memory is not None:
+            return self.__symbolic_memory.sum()
+
+        return self.__memory.sum()
 
 
-def solve(filename: str, version_one: bool = True) -> int:
+def solve(filename: str, version_one: bool = True, symbolic: bool = True,
+          memory: str = 'dict') -> int:
     '''Solve part 1 of the puzzle'''
-    program = Program(version_one=version_one)
-    for instruction in load_input_file(filename):
+    return run_program(parse_input(filename), version_one, symbolic, memory)
+
+
+def parse_input(filename: str) -> List[str]:
+    '''Parse the instructions of the input file'''
+    return list(load_input_file(filename))
+
+
+def run_program(instructions: Iterable[str], version_one: bool = True, symbolic: bool = True,
+                memory: str = 'dict') -> int:
+    '''Run the instructions and return the sum of the memory'''
+    program = Program(version_one=version_one, symbolic=symbolic, memory=memory)
+    for instruction in instructions:
         program.read_program(instruction)
-    return sum(program.dump_memory().values())
+    return program.sum_memory()
+
+
+def solve_part1(instructions: List[str]) -> int:
+    '''Solve part 1 of the daily puzzle'''
+    return run_program(instructions, version_one=True)
+
+
+def solve_part2(instructions: List[str]) -> int:
+    '''Solve part 2 of the daily puzzle'''
+    return run_program(instructions, version_one=False)
+
+
+def benchmark_floating_addresses(repeat: int = 1000) -> Dict[str, float]:
+    '''
+    Time the resolution of a write through a mask with 9 floating bits, with the string based
+    address resolution and with the submask enumeration, and return the durations in seconds.
+    '''
+    program = Program(version_one=False)
+    program.mask = '0' * 18 + 'X0' * 9
+    address = 0b1011001
+    mask_bits = program.mask_bits
+    base_address = (address | mask_bits.or_mask) & ~mask_bits.floating_mask
+    durations = {}
+
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        expected = program.resolve_address(program.apply_v2_mask(address))
+    durations['resolve_address'] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        result = list(floating_addresses(base_address, mask_bits.floating_mask))
+    durations['floating_addresses'] = time.perf_counter() - start_time
+
+    if result != expected:
+        raise RuntimeError('floating address resolutions differ')
+
+    return durations
+
+
+def benchmark_memory_backends(masks: int = 64) -> Dict[str, Tuple[float, int]]:
+    '''
+    Run a version 2 program with dense writes (8 floating bits per write) on each memory
+    backend and return the duration in seconds and the peak memory allocated in bytes.
+    '''
+    instructions = []
+
+    for mask_number in range(masks):
+        instructions.append(f'mask = {mask_number:020b}XXXXXXXX00000000')
+        instructions.extend(f'mem[{address}] = {address}' for address in range(0, 256, 4))
+
+    results = {}
+
+    for backend in MEMORY_BACKENDS:
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        program = Program(version_one=False, memory=backend)
+
+        for instruction in instructions:
+            program.read_program(instruction)
+
+        program.sum_memory()
+        duration = time.perf_counter() - start_time
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[backend] = (duration, peak)
+
+    return results
+
 
 class Tests(unittest.TestCase):
     '''Tests'''
@@ -279,12 +676,26 @@ class Tests(unittest.TestCase):
         program.mask = self.mask
         self.assertEqual(program.mask, self.mask)
 
+    def test_compile_mask(self) -> None:
+        '''Test the integer form of masks'''
+        self.assertEqual(compile_mask(self.mask),
+                         (0b1000000, 2 ** 36 - 1 - 0b10, 2 ** 36 - 1 - 0b1000010))
+        self.assertEqual(compile_mask(self.part2_tests[1][0][7:]), (0, 0b1011, 0b1011))
+
     def test_read_program_with_mask(self) -> None:
         '''Test the read_program function with a mask instruction'''
 
         program = Program()
         program.read_program(self.mask_instruction)
         self.assertEqual(program.mask, self.mask)
+        self.assertEqual(program.mask_bits, compile_mask(self.mask))
+
+    def test_read_program_with_other_line(self) -> None:
+        '''Test that the read_program function ignores lines that are not instructions'''
+
+        program = Program()
+        program.read_program('')
+        self.assertEqual(program.dump_memory(), {})
 
     def test_read_program_with_memwrite_and_all_x_mask(self) -> None:
         '''Test the read_program function with a memwrite instruction and all X mask'''
@@ -293,6 +704,14 @@ class Tests(unittest.TestCase):
         program.read_program(self.memwrite_instruction)
         self.assertEqual(program.get_memory(8), 11)
 
+    def test_set_memory(self) -> None:
+        '''Test the set_memory function'''
+
+        program = Program()
+        program.set_memory(8, 11)
+        self.assertEqual(program.get_memory(8), 11)
+        self.assertEqual(program.dump_memory(), {8: 11})
+
     def test_read_program_with_memwrites_and_mask(self) -> None:
         '''Test the read_program function with memwrite instructions and a specific mask'''
 
@@ -307,6 +726,7 @@ class Tests(unittest.TestCase):
     def test_solve_part1_with_test_data(self) -> None:
         '''Test the solve_part1 function with test data'''
         self.assertEqual(solve(TEST_INPUT_FILENAME, version_one=True), 165)
+        self.assertEqual(solve_part1(parse_input(TEST_INPUT_FILENAME)), 165)
 
     def test_apply_v2_mask(self) -> None:
         '''Test the apply_v2_mask function'''
@@ -327,6 +747,26 @@ class Tests(unittest.TestCase):
             with self.subTest(case):
                 self.assertListEqual(program.resolve_address(case[2]), case[3])
 
+    def test_floating_addresses(self) -> None:
+        '''Test the enumeration of floating addresses'''
+        self.assertEqual(list(floating_addresses(0b10010, 0b100001)), [18, 19, 50, 51])
+        self.assertEqual(list(floating_addresses(7, 0)), [7])
+
+        for case in self.part2_tests:
+            with self.subTest(case):
+                mask_bits = compile_mask(case[2])
+                self.assertEqual(list(floating_addresses(mask_bits.or_mask,
+                                                         mask_bits.floating_mask)), case[3])
+
+    def test_benchmark_floating_addresses(self) -> None:
+        '''Test the benchmark of the floating address resolutions'''
+        durations = benchmark_floating_addresses(repeat=2)
+        self.assertEqual(list(durations), ['resolve_address', 'floating_addresses'])
+
+        with mock.patch.dict(globals(), floating_addresses=lambda base_address, mask: []), \
+                self.assertRaises(RuntimeError):
+            benchmark_floating_addresses(repeat=1)
+
     def test_v2_read_program(self) -> None:
         '''Test the read_program function for version_one = False'''
 
@@ -341,11 +781,134 @@ class Tests(unittest.TestCase):
     def test_solve_part2_with_test_data(self) -> None:
         '''Test the solve_part1 function with test data'''
         self.assertEqual(solve(TEST_INPUT_FILENAME2, version_one=False), 208)
+        self.assertEqual(solve_part2(parse_input(TEST_INPUT_FILENAME2)), 208)
+        self.assertEqual(solve(TEST_INPUT_FILENAME2, version_one=False, symbolic=False), 208)
+
+    def test_symbolic_memory_subtract(self) -> None:
+        '''Test the subtraction of a cube from another one'''
+        cases: List[Tuple[Tuple[int, int, int], int, int, List[Tuple[int, int, int]]]] = [
+            ((0b0000, 0b0011, 5), 0b1000, 0b0000, [(0b0000, 0b0011, 5)]),
+            ((0b0000, 0b0011, 5), 0b0000, 0b0011, []),
+            ((0b0000, 0b0011, 5), 0b0001, 0b0000, [(0b0000, 0b0010, 5), (0b0011, 0b0000, 5)]),
+            ((0b0000, 0b0111, 5), 0b0010, 0b0001, [(0b0000, 0b0101, 5), (0b0110, 0b0001, 5)]),
+        ]
+
+        for case in cases:
+            with self.subTest(case):
+                self.assertEqual(SymbolicMemory.subtract(*case[:3]), case[3])
+
+    def test_symbolic_memory(self) -> None:
+        '''Test that the symbolic memory matches the expanded memory'''
+        instructions = (
+            'mask = 0000000000000000000000000000000XX0XX',
+            'mem[3] = 7',
+            'mask = 000000000000000000000000000000X1001X',
+            'mem[42] = 100',
+            'mask = 00000000000000000000000000000000X0XX',
+            'mem[26] = 1',
+            'mask = 000000000000000000000000000000000000',
+            'mem[27] = 1000',
+            'mask = 0000000000000000000000000000000X10XX',
+            'mem[0] = 3',
+        )
+        expanded = Program(version_one=False)
+        symbolic = Program(version_one=False, symbolic=True)
+
+        for instruction in instructions:
+            expanded.read_program(instruction)
+            symbolic.read_program(instruction)
+
+        self.assertEqual(symbolic.sum_memory(), expanded.sum_memory())
+        self.assertEqual(symbolic.dump_memory(), expanded.dump_memory())
+
+    def test_symbolic_memory_with_many_floating_bits(self) -> None:
+        '''Test floating masks that would be too large to expand'''
+        memory = SymbolicMemory()
+        memory.write(0, 2 ** 36 - 1, 1)
+        memory.write(0, 2 ** 30 - 1, 2)
+        memory.write(1, 0, 5)
+
+        self.assertEqual(memory.sum(), 2 ** 36 + 2 ** 30 + 3)
+        self.assertEqual(len(memory.cubes()), 6 + 30 + 1)
+
+
+class MemoryStoreTests(unittest.TestCase):
+    '''Tests of the memory stores'''
+
+    def test_memory_backends(self) -> None:
+        '''Test that every memory backend holds the same memory'''
+        for backend in MEMORY_BACKENDS:
+            with self.subTest(backend):
+                for filename, version_one in ((TEST_INPUT_FILENAME, True),
+                                              (TEST_INPUT_FILENAME2, False)):
+                    expanded = Program(version_one=version_one)
+                    program = Program(version_one=version_one, memory=backend)
+
+                    for instruction in load_input_file(filename):
+                        expanded.read_program(instruction)
+                        program.read_program(instruction)
+
+                    self.assertEqual(program.dump_memory(), expanded.dump_memory())
+                    self.assertEqual(program.sum_memory(), expanded.sum_memory())
+                    self.assertEqual(solve(filename, version_one, False, backend),
+                                     expanded.sum_memory())
+
+                program.set_memory(2 ** 36 - 1, 5)
+                program.set_memory(7, 0)
+                self.assertEqual(program.get_memory(2 ** 36 - 1), 5)
+                self.assertEqual(program.get_memory(7), 0)
+                self.assertEqual(program.get_memory(16), 1)
+
+                with self.assertRaises(KeyError):
+                    program.get_memory(2 ** 35)
+                with self.assertRaises(KeyError):
+                    program.get_memory(15)
+
+    def test_sorted_array_memory(self) -> None:
+        '''Test the bulk merges of the sorted array memory'''
+        memory = SortedArrayMemory(merge_threshold=3)
+        memory.set_many((9, 3, 5), 1)
+        memory.set(4, 2)
+        memory.set_many((5, 1), 3)
+        self.assertEqual(memory.get(4), 2)
+        self.assertEqual(memory.get(5), 3)
+        self.assertEqual(len(memory), 5)
+        memory.merge()
+        self.assertEqual(list(memory.items()), [(1, 3), (3, 1), (4, 2), (5, 3), (9, 1)])
+        self.assertEqual(memory.sum(), 10)
+
+    def test_paged_memory(self) -> None:
+        '''Test that pages are only allocated when written'''
+        memory = PagedMemory(page_bits=4)
+        memory.set_many(range(8, 24), 2)
+        memory.set(2 ** 36 - 1, 3)
+        self.assertEqual(memory.pages(), 3)
+        self.assertEqual(memory.sum(), 35)
+        self.assertEqual(len(memory.dump()), 17)
+
+    def test_dict_memory(self) -> None:
+        '''Test the dict memory through the methods of the base memory store'''
+        memory = DictMemory()
+        memory.set_many((4, 2), 1)
+        memory.set(8, 5)
+        self.assertEqual(memory.get(2), 1)
+        self.assertEqual(sorted(memory.items()), [(2, 1), (4, 1), (8, 5)])
+        self.assertEqual(memory.sum(), 7)
+        self.assertEqual(memory.dump(), {2: 1, 4: 1, 8: 5})
+        MemoryStore.set_many(memory, (2, 6), 3)
+        self.assertEqual(MemoryStore.sum(memory), 12)
+        self.assertEqual(MemoryStore.dump(memory), {2: 3, 4: 1, 6: 3, 8: 5})
+
+    def test_benchmark_memory_backends(self) -> None:
+        '''Test the benchmark of the memory backends'''
+        results = benchmark_memory_backends(masks=2)
+        self.assertEqual(list(results), list(MEMORY_BACKENDS))
 
 
 if __name__ == '__main__': # pragma: no cover
     print('Running unit tests...')
     unittest.main(verbosity=2, exit=False)
     print('Puzzle Answers:')
-    print(f'Part 1: {solve(INPUT_FILENAME, version_one=True)}')
-    print(f'Part 2: {solve(INPUT_FILENAME, version_one=False)}')
+    initialization_program = parse_input(INPUT_FILENAME)
+    print(f'Part 1: {solve_part1(initialization_program)}')
+    print(f'Part 2: {solve_part2(initialization_program)}')
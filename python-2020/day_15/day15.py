@@ -76,14 +76,28 @@ Given your starting numbers, what will be the 30000000th number spoken?
 
 from __future__ import annotations
 import os
-from typing import NamedTuple, Tuple, List, Dict
+from array import array
+import mmap
+import multiprocessing
+import struct
+import sys
+import tempfile
+from typing import Iterable, NamedTuple, Optional, Tuple, List, Dict
 import unittest
+from unittest import mock
 import time
-#import cProfile
 
 
 TEST_INPUT_FILENAME = 'day_15_test_input.txt'
 INPUT_FILENAME = 'day_15_input.txt'
+PARSER_VERSION = 1
+PART1_LAST_TURN = 2020
+PART2_LAST_TURN = 30_000_000
+NEVER_SPOKEN = 0
+DENSE_LIMIT = 1 << 22
+MAX_TURN = (1 << 32) - 1
+GAME_HEADER = struct.Struct('<4sQQQQ')
+GAME_MAGIC = b'VECK'
 
 
 def load_input_file(filename: str) -> List[int]:
@@ -93,49 +107,265 @@ def load_input_file(filename: str) -> List[int]:
         return list(map(int, input_file.read().strip().split(',')))
 
 
-def solve_part1(starting_numbers: List[int], last_turn: int) -> int:
-    '''Solve part 1 of the puzzle'''
-    turns_dict: Dict[int, List[int]] = {}
-    current_turn: int = 1
-    last_spoken_number: int = 0
+def parse_input(filename: str) -> List[int]:
+    '''Parse the starting numbers of the input file'''
+    return load_input_file(filename)
 
+
+def solve_part1(starting_numbers: List[int], last_turn: int = PART1_LAST_TURN,
+                dense_limit: int = DENSE_LIMIT) -> int:
+    '''
+    Solve part 1 of the puzzle
+
+    Only the last turn in which each number was spoken is kept. Numbers below the dense limit
+    are looked up in a flat array indexed by number, and the rare larger ones in a dict. A
+    number spoken on a turn is never larger than that turn, so the array never has to grow, and
+    turn 0 serves as the sentinel for numbers never spoken.
+    '''
     if last_turn <= len(starting_numbers):
         return starting_numbers[last_turn - 1]
-    else:
-        for number in starting_numbers:
-            turns_dict[number] = [current_turn]
-            current_turn += 1
-            last_spoken_number = number
 
-        #performance = cProfile.Profile()
-        #performance.enable()
-        while current_turn <= last_turn:
-            if len(turns_dict[last_spoken_number]) == 1:
-                if 0 not in turns_dict:
-                    turns_dict[0] = [current_turn]
-                else:
-                    turns_dict[0].append(current_turn)
+    dense_size = min(max(last_turn, max(starting_numbers) + 1), dense_limit)
+    return play_game(starting_numbers, last_turn, array('I', bytes(4 * dense_size)))
+
+
+def solve_part2(starting_numbers: List[int]) -> int:
+    '''Solve part 2 of the puzzle, the same game played up to a much later turn'''
+    return solve_part1(starting_numbers, PART2_LAST_TURN)
+
 
-                last_spoken_number = 0
+def play_game(starting_numbers: List[int], last_turn: int, last_seen: array[int],
+              first_turn: int = NEVER_SPOKEN) -> int:
+    '''
+    Play a game using a last-seen table that may hold entries of earlier games
 
-            else:
-                new_spoken_number = turns_dict[last_spoken_number][-1] - \
-                                        turns_dict[last_spoken_number][-2]
+    Turns are numbered from the first turn onwards, so any entry not larger than it was left by
+    an earlier game and counts as never spoken, and the table can be reused without clearing it.
+    Numbers beyond the end of the table are kept in a dict.
+    '''
+    dense_size = len(last_seen)
+    last_seen_large: Dict[int, int] = {}
 
-                if new_spoken_number not in turns_dict:
-                    turns_dict[new_spoken_number] = [current_turn]
-                else:
-                    turns_dict[new_spoken_number].append(current_turn)
+    for turn, number in enumerate(starting_numbers[:-1], first_turn + 1):
+        if number < dense_size:
+            last_seen[number] = turn
+        else:
+            last_seen_large[number] = turn
 
-                last_spoken_number = new_spoken_number
+    last_spoken_number = starting_numbers[-1]
 
-            current_turn += 1
+    for turn in range(first_turn + len(starting_numbers), first_turn + last_turn):
+        if last_spoken_number < dense_size:
+            previous_turn = last_seen[last_spoken_number]
+            last_seen[last_spoken_number] = turn
+        else:
+            previous_turn = last_seen_large.get(last_spoken_number, first_turn)
+            last_seen_large[last_spoken_number] = turn
 
-        #performance.disable()
-        #performance.print_stats()
+        last_spoken_number = turn - previous_turn if previous_turn > first_turn else 0
 
     return last_spoken_number
 
+
+# Last-seen table and turn offset owned by each worker process of solve_many
+worker_last_seen = array('I')
+worker_first_turn = NEVER_SPOKEN
+
+
+def init_game_worker(dense_size: int) -> None:
+    '''Allocate the last-seen table of a worker process once for all its games'''
+    global worker_last_seen, worker_first_turn  # pylint: disable=global-statement
+    worker_last_seen = array('I', bytes(4 * dense_size))
+    worker_first_turn = NEVER_SPOKEN
+
+
+def play_worker_game(starting_numbers: List[int], last_turn: int) -> int:
+    '''Play a game in a worker process, reusing its last-seen table'''
+    global worker_first_turn  # pylint: disable=global-statement
+
+    if last_turn <= len(starting_numbers):
+        return starting_numbers[last_turn - 1]
+
+    if worker_first_turn + last_turn > MAX_TURN:
+        memoryview(worker_last_seen).cast('B')[:] = bytes(4 * len(worker_last_seen))
+        worker_first_turn = NEVER_SPOKEN
+
+    result = play_game(starting_numbers, last_turn, worker_last_seen, worker_first_turn)
+    worker_first_turn += last_turn
+    return result
+
+
+def solve_many(starting_sequences: List[List[int]], last_turn: int,
+               dense_limit: int = DENSE_LIMIT, processes: Optional[int] = None) -> List[int]:
+    '''
+    Play a game for each list of starting numbers in a pool of worker processes and return the
+    last spoken numbers in the order of the lists
+    '''
+    dense_size = min(max([last_turn] + [max(numbers) + 1 for numbers in starting_sequences]),
+                     dense_limit)
+
+    with multiprocessing.Pool(processes, init_game_worker, (dense_size,)) as pool:
+        return pool.starmap(play_worker_game,
+                            [(numbers, last_turn) for numbers in starting_sequences],
+                            chunksize=1)
+
+
+def to_little_endian(numbers: array[int]) -> array[int]:
+    '''
+    Return unsigned integers in little-endian byte order, swapping a copy on big-endian machines.
+    Swapping is its own inverse, so this also turns little-endian integers back to native order.
+    '''
+    if sys.byteorder == 'little':
+        return numbers
+
+    swapped = array(numbers.typecode, numbers)
+    swapped.byteswap()
+    return swapped
+
+
+class MemoryGame:
+    '''
+    Memory game that can be advanced turn by turn, answer several turns in a single pass, and
+    be saved to and loaded from a file through a memory map to resume a long run later.
+
+    A saved game is the header GAME_HEADER (the magic GAME_MAGIC, then the turn, the last
+    spoken number, the count of starting numbers and the size of the last-seen table), followed
+    by the starting numbers and the last-seen table as unsigned 32-bit integers. Every field is
+    little-endian whatever the byte order of the machine.
+    '''
+
+    def __init__(self, starting_numbers: List[int]) -> None:
+        self.starting_numbers = list(starting_numbers)
+        self.last_seen = array('I')
+        self.__reserve(max(starting_numbers) + 1)
+
+        for turn, number in enumerate(starting_numbers[:-1], 1):
+            self.last_seen[number] = turn
+
+        self.turn = len(starting_numbers)
+        self.last_spoken_number = starting_numbers[-1]
+
+    def __reserve(self, size: int) -> None:
+        if size > len(self.last_seen):
+            self.last_seen.frombytes(bytes(4 * (max(size, 2 * len(self.last_seen)) -
+                                                len(self.last_seen))))
+
+    def advance_to(self, last_turn: int) -> int:
+        '''Play until a turn and return the number spoken on that turn'''
+        if last_turn <= len(self.starting_numbers):
+            return self.starting_numbers[last_turn - 1]
+        if last_turn < self.turn:
+            raise ValueError(f'turn {last_turn} was already played, the game is at turn '
+                             f'{self.turn}')
+
+        self.__reserve(last_turn)
+        last_seen = self.last_seen
+        last_spoken_number = self.last_spoken_number
+
+        for turn in range(self.turn, last_turn):
+            previous_turn = last_seen[last_spoken_number]
+            last_seen[last_spoken_number] = turn
+            last_spoken_number = turn - previous_turn if previous_turn != NEVER_SPOKEN else 0
+
+        self.turn = last_turn
+        self.last_spoken_number = last_spoken_number
+        return last_spoken_number
+
+    def answers(self, turns: Iterable[int]) -> List[int]:
+        '''Return the numbers spoken on turns given in increasing order, in a single pass'''
+        return [self.advance_to(turn) for turn in turns]
+
+    def save(self, filename: str) -> None:
+        '''Save the state of the game to a file through a memory map'''
+        starting_numbers = to_little_endian(array('I', self.starting_numbers))
+        last_seen = to_little_endian(self.last_seen)
+        size = GAME_HEADER.size + 4 * (len(starting_numbers) + len(last_seen))
+
+        with open(filename, 'w+b') as game_file:
+            game_file.truncate(size)
+
+            with mmap.mmap(game_file.fileno(), size) as mapped_file:
+                GAME_HEADER.pack_into(mapped_file, 0, GAME_MAGIC, self.turn,
+                                      self.last_spoken_number, len(starting_numbers),
+                                      len(last_seen))
+                offset = GAME_HEADER.size + 4 * len(starting_numbers)
+                mapped_file[GAME_HEADER.size:offset] = starting_numbers.tobytes()
+                mapped_file[offset:] = memoryview(last_seen).cast('B')
+                mapped_file.flush()
+
+    @classmethod
+    def load(cls, filename: str) -> MemoryGame:
+        '''
+        Load the state of a game saved to a file
+
+        The numbers are copied out of the memory map into arrays, which the game grows as it
+        advances, so the file is closed once the game is loaded.
+        '''
+        with open(filename, 'rb') as game_file, \
+                mmap.mmap(game_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            if len(mapped_file) < GAME_HEADER.size:
+                raise ValueError(f'{filename} is too short to hold a saved memory game')
+
+            magic, turn, last_spoken_number, starting_size, size = \
+                GAME_HEADER.unpack_from(mapped_file)
+
+            if magic != GAME_MAGIC:
+                raise ValueError(f'{filename} is not a saved memory game')
+
+            expected_size = GAME_HEADER.size + 4 * (starting_size + size)
+
+            if starting_size == 0 or len(mapped_file) != expected_size:
+                raise ValueError(f'{filename} holds {len(mapped_file)} bytes, its header '
+                                 f'describes a saved memory game of {expected_size} bytes')
+
+            offset = GAME_HEADER.size + 4 * starting_size
+            game = cls(list(to_little_endian(array('I', mapped_file[GAME_HEADER.size:offset]))))
+            game.last_seen = to_little_endian(array('I', mapped_file[offset:]))
+
+        game.turn = turn
+        game.last_spoken_number = last_spoken_number
+        return game
+
+
+def measure_game(starting_numbers: List[int], last_turn: int,
+                 dense_limit: int) -> Tuple[int, float, int]:
+    '''
+    Play a game and return the last spoken number, the duration in seconds and the peak
+    resident set size of the process in kilobytes. The resource module is only available on
+    Unix, so it is imported here rather than with the module.
+    '''
+    import resource  # pylint: disable=import-outside-toplevel
+
+    start_time = time.perf_counter()
+    result = solve_part1(starting_numbers, last_turn, dense_limit)
+    duration = time.perf_counter() - start_time
+
+    return (result, duration, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def benchmark_game(starting_numbers: List[int],
+                   turn_counts: Tuple[int, ...] = (2020, 30_000, 3_000_000, 30_000_000,
+                                                   300_000_000),
+                   dense_limits: Tuple[int, ...] = (1 << 16, DENSE_LIMIT, 1 << 30)
+                   ) -> List[Dict[str, float]]:
+    '''
+    Play a game for each combination of turn count and dense limit, each one in a fresh
+    process so its peak memory can be measured, and return the time and peak RSS of each.
+    '''
+    results = []
+    context = multiprocessing.get_context('spawn')
+
+    for last_turn in turn_counts:
+        for dense_limit in dense_limits:
+            with context.Pool(1) as pool:
+                result, duration, peak_rss = pool.apply(measure_game, (starting_numbers,
+                                                                       last_turn, dense_limit))
+
+            results.append({'turns': last_turn, 'dense_limit': dense_limit, 'result': result,
+                            'seconds': duration, 'peak_rss_kb': peak_rss})
+
+    return results
+
 class Tests(unittest.TestCase):
     '''Tests'''
 
@@ -172,10 +402,6 @@ class Tests(unittest.TestCase):
         StartingNumberTestTuple([3, 1, 2], 1836),
     )
 
-    part2_different_starting_numbers = (
-        StartingNumberTestTuple([0, 3, 6], 175594),
-    )
-
     def test_solve_part1(self) -> None:
         '''Test the solve_part1 function'''
         for case in self.part1_tests:
@@ -184,35 +410,156 @@ class Tests(unittest.TestCase):
                                                 case[0]),
                                                 case[1])
 
+    def test_solve_part2(self) -> None:
+        '''Test that part 2 plays the game of the input up to its own last turn'''
+        with mock.patch.dict(globals(), PART2_LAST_TURN=2020):
+            self.assertEqual(solve_part2(parse_input(TEST_INPUT_FILENAME)), 436)
+
+    def test_solve_part1_with_large_starting_numbers(self) -> None:
+        '''Test the solve_part1 function with starting numbers larger than the last turn'''
+        self.assertEqual(solve_part1([100, 3], 4), 0)
+        self.assertEqual(solve_part1([100, 3, 100], 4), 2)
+
+    def test_memory_game_answers(self) -> None:
+        '''Test that a game answers all the test turns in a single pass'''
+        game = MemoryGame(load_input_file(TEST_INPUT_FILENAME))
+        self.assertEqual(game.answers([case.turn for case in self.part1_tests]),
+                         [case.spoken_number for case in self.part1_tests])
+        self.assertEqual(game.turn, 2020)
+        self.assertEqual(game.advance_to(2), 3)
+
+        with self.assertRaises(ValueError):
+            game.advance_to(10)
+
+    def test_memory_game_save_and_load(self) -> None:
+        '''Test that a saved game resumes where it stopped'''
+        game = MemoryGame([3, 1, 2])
+        game.advance_to(1000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'game.bin')
+            game.save(filename)
+            resumed = MemoryGame.load(filename)
+
+            with open(filename, 'r+b') as game_file:
+                game_file.write(b'XXXX')
+
+            with self.assertRaises(ValueError):
+                MemoryGame.load(filename)
+
+        self.assertEqual((resumed.turn, resumed.last_spoken_number),
+                         (1000, game.last_spoken_number))
+        self.assertEqual(resumed.starting_numbers, [3, 1, 2])
+        self.assertEqual(resumed.advance_to(2020), 1836)
+        self.assertEqual(resumed.advance_to(3), 2)
+
+    def test_memory_game_load_damaged_file(self) -> None:
+        '''Test that loading a truncated or inconsistent file raises a ValueError'''
+        game = MemoryGame([3, 1, 2])
+        game.advance_to(1000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'game.bin')
+            game.save(filename)
+
+            with open(filename, 'rb') as game_file:
+                content = game_file.read()
+
+            damaged_contents = (content[:GAME_HEADER.size - 1], content[:-1], content + b'\0',
+                                GAME_HEADER.pack(GAME_MAGIC, 3, 2, 0, 0))
+
+            for damaged_content in damaged_contents:
+                with self.subTest(size=len(damaged_content)):
+                    with open(filename, 'wb') as game_file:
+                        game_file.write(damaged_content)
+
+                    with self.assertRaises(ValueError):
+                        MemoryGame.load(filename)
+
+    def test_memory_game_save_little_endian(self) -> None:
+        '''Test that a game is saved little-endian, swapping the bytes on big-endian machines'''
+        game = MemoryGame([3, 1, 2])
+        game.advance_to(1000)
+        self.assertEqual(to_little_endian(array('I', [1])).tobytes(),
+                         (1).to_bytes(4, sys.byteorder))
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(sys, 'byteorder', 'big'):
+            filename = os.path.join(directory, 'game.bin')
+            game.save(filename)
+            resumed = MemoryGame.load(filename)
+
+            with open(filename, 'rb') as game_file:
+                starting_bytes = game_file.read()[GAME_HEADER.size:GAME_HEADER.size + 12]
+
+        swapped_starting_numbers = array('I', [3, 1, 2])
+        swapped_starting_numbers.byteswap()
+        self.assertEqual(starting_bytes, swapped_starting_numbers.tobytes())
+        self.assertEqual(resumed.starting_numbers, [3, 1, 2])
+        self.assertEqual(resumed.last_seen, game.last_seen)
+
+    def test_solve_part1_with_dense_limits(self) -> None:
+        '''Test the solve_part1 function with numbers split between the array and the dict'''
+        for dense_limit in (0, 1, 5, 100, 10_000):
+            with self.subTest(dense_limit=dense_limit):
+                self.assertEqual(solve_part1([0, 3, 6], 2020, dense_limit), 436)
+                self.assertEqual(solve_part1([3, 1, 2], 2020, dense_limit), 1836)
+                self.assertEqual(solve_part1([100, 3, 100], 4, dense_limit), 2)
+
+    def test_benchmark_game(self) -> None:
+        '''Test the benchmark grid of the game'''
+        results = benchmark_game([0, 3, 6], (10, 2020), (2, DENSE_LIMIT))
+
+        self.assertEqual([(row['turns'], row['dense_limit'], row['result']) for row in results],
+                         [(10, 2, 0), (10, DENSE_LIMIT, 0),
+                          (2020, 2, 436), (2020, DENSE_LIMIT, 436)])
+        self.assertTrue(all(row['peak_rss_kb'] > 0 for row in results))
+
+    def test_measure_game(self) -> None:
+        '''Test the measure of a single game'''
+        result, duration, peak_rss = measure_game([0, 3, 6], 2020, DENSE_LIMIT)
+        self.assertEqual(result, 436)
+        self.assertGreaterEqual(duration, 0)
+        self.assertGreater(peak_rss, 0)
+
     def test_solve_part1_with_different_starting_numbers(self) -> None:
         '''Test the solve_part1 function with different starting numbers'''
         for case in self.part1_different_starting_numbers:
             with self.subTest(case, i=case[0]):
                 self.assertEqual(solve_part1(case[0], 2020), case[1])
 
-#    def test_solve_part2(self) -> None:
-#        '''Test the solve_part1 function for part 2'''
-#        for case in self.part2_different_starting_numbers:
-#            with self.subTest(case, i=case[0]):
-#                self.assertEqual(solve_part1(case[0], 30000000), case[1])
+    def test_solve_many(self) -> None:
+        '''Test that solve_many returns the results in the order of the starting numbers'''
+        cases = self.part1_different_starting_numbers
+        self.assertEqual(solve_many([case.starting_numbers for case in cases], 2020,
+                                    processes=2),
+                         [case.last_spoken_number for case in cases])
+
+    def test_play_worker_game(self) -> None:
+        '''Test that a worker reuses its last-seen table across games'''
+        global worker_first_turn  # pylint: disable=global-statement
+        globals_patcher = mock.patch.dict(globals())
+        globals_patcher.start()
+        self.addCleanup(globals_patcher.stop)
+        init_game_worker(64)
 
+        for case in self.part1_different_starting_numbers:
+            with self.subTest(case, i=case[0]):
+                self.assertEqual(play_worker_game(case.starting_numbers, 2020),
+                                 case.last_spoken_number)
 
-if __name__ == '__main__': # pragma: no cover
-    '''
-        print('Running unit tests...')
-        unittest.main(verbosity=2, exit=False)
+        self.assertEqual(play_worker_game([0, 3, 6], 2), 3)
+        self.assertEqual(worker_first_turn, 2020 * len(self.part1_different_starting_numbers))
 
-        print('Puzzle Answers:')
+        worker_first_turn = MAX_TURN - 10
+        self.assertEqual(play_worker_game([0, 3, 6], 2020), 436)
+        self.assertEqual(worker_first_turn, 2020)
 
-        part1_start_time = time.perf_counter_ns()
-        part1_result = solve_part1(load_input_file(INPUT_FILENAME), 2020)
-        part1_stop_time = time.perf_counter_ns()
-        print(f'Part 1: {part1_result} - '
-            f'Completed in {(part1_stop_time - part1_start_time)/1000}µs')
-    '''
 
-    part2_start_time = time.perf_counter_ns()
-    part2_result = solve_part1([0, 1, 5, 10, 3, 12, 19], 30000000)
-    part2_stop_time = time.perf_counter_ns()
-    print(f'Part 2: {part2_result} - '
-        f'Completed in {(part2_stop_time - part2_start_time)/1000}µs')
+if __name__ == '__main__': # pragma: no cover
+    print('Running unit tests...')
+    unittest.main(verbosity=2, exit=False)
+    print('Puzzle Answers:')
+    starting_numbers = parse_input(INPUT_FILENAME)
+    print(f'Part 1: {solve_part1(starting_numbers)}')
+    print(f'Part 2: {solve_part2(starting_numbers)}')
@@ -1,34 +1,44 @@
 #!/usr/bin/env python3
 
 # Advent of Code 2020, Day 2
+import os
 import re
 
-password_rules = []
+INPUT_FILENAME = 'day_2_input'
+PARSER_VERSION = 1
 rule_pattern = re.compile(r'(\d+)\-(\d+)\s(\w)\:\s(\w+)')
 
-with open('day_2_input', 'r') as input:
-    for line in input:
-        password_rules.append(re.findall(rule_pattern, line.strip())[0])
+def parse_input(filename):
+    password_rules = []
 
-# To show the rules to help for debug.
-# print(f'Rules: {password_rules}')
+    with open(os.path.join(os.path.dirname(__file__), filename), 'r') as input:
+        for line in input:
+            password_rules.append(re.findall(rule_pattern, line.strip())[0])
 
-# Part 1
-# string.count() method may be more common.
-valid_passwords = sum([1 for min, max, char, password in password_rules if int(min) <= len(re.findall(r'' + char, password)) <= int(max)])
-print(f'Part 1: {str(valid_passwords)}')
+    # To show the rules to help for debug.
+    # print(f'Rules: {password_rules}')
+    return password_rules
 
-# Part 2
-valid_passwords = 0
+def solve_part1(password_rules):
+    # string.count() method may be more common.
+    return sum([1 for min, max, char, password in password_rules if int(min) <= len(re.findall(r'' + char, password)) <= int(max)])
 
-for min, max, char, password in password_rules:
-    matches = 0
-    
-    for match in re.finditer(r'' + char, password):
-        if match.span()[1] in (int(min), int(max)):
-            matches += 1
-    
-    if matches == 1:
-        valid_passwords += 1
+def solve_part2(password_rules):
+    valid_passwords = 0
 
-print(f'Part 2: {str(valid_passwords)}')
+    for min, max, char, password in password_rules:
+        matches = 0
+        
+        for match in re.finditer(r'' + char, password):
+            if match.span()[1] in (int(min), int(max)):
+                matches += 1
+        
+        if matches == 1:
+            valid_passwords += 1
+
+    return valid_passwords
+
+if __name__ == '__main__':
+    password_rules = parse_input(INPUT_FILENAME)
+    print(f'Part 1: {str(solve_part1(password_rules))}')
+    print(f'Part 2: {str(solve_part2(password_rules))}')
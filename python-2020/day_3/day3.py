@@ -2,8 +2,12 @@
 
 # Advent of Code 2020, Day 3
 import functools
+import os
 from operator import mul
 
+INPUT_FILENAME = 'day_3_input'
+PARSER_VERSION = 1
+
 def load_grid_information(input_file):
     grid_info = {
         'coordinates': set(),
@@ -12,7 +16,7 @@ def load_grid_information(input_file):
     }
     row_number = 0
 
-    with open(input_file, 'r') as file:
+    with open(os.path.join(os.path.dirname(__file__), input_file), 'r') as file:
         for line in file:
             char_pos = 0
 
@@ -29,7 +33,7 @@ def load_grid_information(input_file):
 
     return grid_info
 
-def get_number_of_trees(slope):
+def get_number_of_trees(grid, slope):
     number_of_trees = 0
 
     for y_coord in range(1, grid['column_length']):
@@ -45,11 +49,20 @@ def get_number_of_trees(slope):
 
     return number_of_trees
 
+def parse_input(filename):
+    return load_grid_information(filename)
+
+def solve_part1(grid):
+    return get_number_of_trees(grid, 3)
+
+def solve_part2(grid):
+    return functools.reduce(mul, [get_number_of_trees(grid, slope) for slope in [1, 3, 5, 7, 1/2]], 1)
+
 if __name__ == '__main__':
-    grid = load_grid_information('day_3_input')
+    grid = parse_input(INPUT_FILENAME)
 
     # Part 1
-    print(f'Part 1: {get_number_of_trees(3)}')
+    print(f'Part 1: {solve_part1(grid)}')
 
     # Part 2
-    print(f'Part 2: {functools.reduce(mul, [get_number_of_trees(slope) for slope in [1, 3, 5, 7, 1/2]], 1)}')
+    print(f'Part 2: {solve_part2(grid)}')
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 
 # Advent of Code 2020, Day 4
+import os
 import re
 
+INPUT_FILENAME = 'day_4_input'
+PARSER_VERSION = 1
+
 height_cm_pattern = re.compile(r'(\d{3})cm')
 height_in_pattern = re.compile(r'(\d{2})in')
 hair_color_pattern = re.compile(r'\#[0-9a-f]{6}')
@@ -29,10 +33,10 @@ def is_valid_passport(passport, validate_fields=False):
         
     return ((len(passport) == 8) and ('cid' in passport)) or ((len(passport) == 7) and ('cid' not in passport))
 
-def validate_passports(filename, validate_fields=False):
-    valid_passports = 0
+def parse_input(filename):
+    passports = []
     
-    with open(filename, 'r') as input:
+    with open(os.path.join(os.path.dirname(__file__), filename), 'r') as input:
         current_passport = {}
         
         for line in input:
@@ -40,19 +44,29 @@ def validate_passports(filename, validate_fields=False):
                 current_passport.update(get_passport_dict(line))
             else:
                 if current_passport:
-                    if (is_valid_passport(current_passport, validate_fields)):
-                        valid_passports += 1
+                    passports.append(current_passport)
                     current_passport = {}
         
         # Required for the last passport as we cannot know in advance whether the current
         # line is the last or not.
         if current_passport:
-            if (is_valid_passport(current_passport, validate_fields)):
-                valid_passports += 1            
-            current_passport = {}
+            passports.append(current_passport)
             
-    return valid_passports
+    return passports
+
+def count_valid_passports(passports, validate_fields=False):
+    return sum(1 for passport in passports if is_valid_passport(passport, validate_fields))
+
+def validate_passports(filename, validate_fields=False):
+    return count_valid_passports(parse_input(filename), validate_fields)
+
+def solve_part1(passports):
+    return count_valid_passports(passports)
+
+def solve_part2(passports):
+    return count_valid_passports(passports, validate_fields=True)
 
 if __name__ == '__main__':
-    print(f"Part 1: {validate_passports('day_4_input')}")
-    print(f"Part 2: {validate_passports('day_4_input', validate_fields=True)}")
+    passports = parse_input(INPUT_FILENAME)
+    print(f"Part 1: {solve_part1(passports)}")
+    print(f"Part 2: {solve_part2(passports)}")
@@ -52,8 +52,11 @@ What is the ID of your seat?
 import os
 from typing import Iterable
 
-def load_input_file() -> Iterable[str]:
-    with open(os.path.join(os.path.dirname(__file__), 'day_5_input.txt'), 'r') as input:
+INPUT_FILENAME = 'day_5_input.txt'
+PARSER_VERSION = 1
+
+def load_input_file(filename: str = INPUT_FILENAME) -> Iterable[str]:
+    with open(os.path.join(os.path.dirname(__file__), filename), 'r') as input:
         return map(str.strip, input.readlines())
 
 def decode_boarding_pass(boarding_pass) -> int:
@@ -63,26 +66,23 @@ def decode_boarding_pass(boarding_pass) -> int:
     
     return seat_id
 
-if __name__ == '__main__':
-    highest_seat_id = 0
-    seat_ids = set()
-
-    boarding_passes = load_input_file()
+def parse_input(filename: str = INPUT_FILENAME) -> set:
     BOARDING_PASS_TRANSLATION = str.maketrans('FBLR', '0101')
-    
-    # I could use map again to apply the decode function for a boarding pass.
-    # With that done, we can simply use max() over the array of seat ID's.
-    for boarding_pass in boarding_passes:
-        boarding_pass_binary = boarding_pass.translate(BOARDING_PASS_TRANSLATION)
-        seat_id = decode_boarding_pass(boarding_pass_binary)
-        seat_ids.add(seat_id)
 
-        if seat_id > highest_seat_id:
-            highest_seat_id = seat_id
+    return {decode_boarding_pass(boarding_pass.translate(BOARDING_PASS_TRANSLATION))
+            for boarding_pass in load_input_file(filename)}
 
-    print(f'Part 1: {highest_seat_id}')
+def solve_part1(seat_ids: set) -> int:
+    return max(seat_ids)
 
+def solve_part2(seat_ids: set) -> int:
     for seat_id in seat_ids:
         if ((seat_id + 2) in seat_ids) and not ((seat_id + 1) in seat_ids):
-            print(f'Part 2: {seat_id + 1}')
-            break
+            return seat_id + 1
+
+    raise ValueError('no free seat between two taken seats')
+
+if __name__ == '__main__':
+    seat_ids = parse_input()
+    print(f'Part 1: {solve_part1(seat_ids)}')
+    print(f'Part 2: {solve_part2(seat_ids)}')
@@ -79,6 +79,9 @@ import os
 from typing import Iterable
 import unittest
 
+INPUT_FILENAME = 'day_6_input.txt'
+PARSER_VERSION = 1
+
 def load_input_file(filename: str) -> Iterable[str]:
     with open(os.path.join(os.path.dirname(__file__), filename), 'r') as input:
         return map(str.strip, input.readlines())
@@ -118,6 +121,16 @@ def count_common_group_answers(group_answers: Iterable[str]) -> int:
     
     return total_answers
 
+
+def parse_input(filename: str) -> list:
+    return list(load_input_file(filename))
+
+def solve_part1(group_answers: list) -> int:
+    return count_unique_group_answers(group_answers)
+
+def solve_part2(group_answers: list) -> int:
+    return count_common_group_answers(group_answers)
+
 class Tests(unittest.TestCase):
     def test_count_unique_group_answers(self):
         result = count_unique_group_answers(load_input_file('day_6_small_input.txt'))
@@ -131,5 +144,6 @@ if __name__ == '__main__':
     print('Running unit tests...')
     unittest.main(verbosity=2, exit=False)
     print('Puzzle Answers:')
-    print(f'Part 1: {count_unique_group_answers(load_input_file("day_6_input.txt"))}')
-    print(f'Part 2: {count_common_group_answers(load_input_file("day_6_input.txt"))}')
+    group_answers = parse_input(INPUT_FILENAME)
+    print(f'Part 1: {solve_part1(group_answers)}')
+    print(f'Part 2: {solve_part2(group_answers)}')
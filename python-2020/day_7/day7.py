@@ -67,6 +67,8 @@ import unittest
 
 TEST_INPUT_FILENAME = 'day_7_small_input.txt'
 INPUT_FILENAME = 'day_7_input.txt'
+PARSER_VERSION = 1
+SEARCHED_BAG_NAME = 'shiny gold'
 
 
 def load_input_file(filename: str) -> Iterable[str]:
@@ -96,8 +98,11 @@ def traverse_bag_tree(bag_tree: dict, current_bag: set, searched_bag_name: str)
 
 
 def count_bag_containers(outer_bags: Iterable[str], bag_name: str) -> int:
+    return count_bag_tree_containers(build_bag_tree(outer_bags), bag_name)
+
+
+def count_bag_tree_containers(bag_tree: dict, bag_name: str) -> int:
     bag_count = 0
-    bag_tree = build_bag_tree(outer_bags)
 
     for bag in bag_tree.keys():
         if traverse_bag_tree(bag_tree, bag, bag_name):
@@ -138,6 +143,20 @@ def count_individual_bags(outer_bags: Iterable[str], bag_name: str) -> int:
     return traverse_bag_tree_and_count(bag_tree, bag_name)
 
 
+def parse_input(filename: str) -> tuple:
+    outer_bags = list(load_input_file(filename))
+    
+    return (build_bag_tree(outer_bags), build_bag_tree_with_count(outer_bags))
+
+
+def solve_part1(bag_trees: tuple) -> int:
+    return count_bag_tree_containers(bag_trees[0], SEARCHED_BAG_NAME)
+
+
+def solve_part2(bag_trees: tuple) -> int:
+    return traverse_bag_tree_and_count(bag_trees[1], SEARCHED_BAG_NAME)
+
+
 class Tests(unittest.TestCase):
     
     def test_count_bag_containers(self):
@@ -181,5 +200,6 @@ if __name__ == '__main__':
     print('Running unit tests...')
     unittest.main(verbosity=2, exit=False)
     print('Puzzle Answers:')
-    print(f"Part 1: {count_bag_containers(load_input_file(INPUT_FILENAME), 'shiny gold')}")
-    print(f"Part 2: {count_individual_bags(load_input_file(INPUT_FILENAME), 'shiny gold')}")
+    bag_trees = parse_input(INPUT_FILENAME)
+    print(f"Part 1: {solve_part1(bag_trees)}")
+    print(f"Part 2: {solve_part2(bag_trees)}")
@@ -88,6 +88,7 @@ import unittest
 
 TEST_INPUT_FILENAME = 'day_8_small_input.txt'
 INPUT_FILENAME = 'day_8_input.txt'
+PARSER_VERSION = 1
 INSTRUCTION_PATTERN = re.compile(r'(nop|acc|jmp)\s(.\d+)')
 
 
@@ -159,8 +160,11 @@ def execute_program(instruction_list: list, decoded: bool = False) -> tuple:
 
 
 def execute_program_after_instruction_change(filename: str) -> tuple:
-    decoded_instruction_list = decode_all_instructions(load_instructions(filename))
-    
+    return execute_decoded_program_after_instruction_change(
+        decode_all_instructions(load_instructions(filename)))
+
+
+def execute_decoded_program_after_instruction_change(decoded_instruction_list: list) -> tuple:
     for pointer in range(0, len(decoded_instruction_list)):
         fixed_decoded_instruction_list = decoded_instruction_list.copy()
         
@@ -177,6 +181,18 @@ def execute_program_after_instruction_change(filename: str) -> tuple:
     return result
 
 
+def parse_input(filename: str) -> list:
+    return decode_all_instructions(load_instructions(filename))
+
+
+def solve_part1(decoded_instruction_list: list) -> int:
+    return execute_program(decoded_instruction_list, decoded=True)[0]
+
+
+def solve_part2(decoded_instruction_list: list) -> int:
+    return execute_decoded_program_after_instruction_change(decoded_instruction_list)[0]
+
+
 class Tests(unittest.TestCase):
     
     test_instructions = [
@@ -220,5 +236,6 @@ if __name__ == '__main__':
     print('Running unit tests...')
     unittest.main(verbosity=2, exit=False)
     print('Puzzle Answers:')
-    print(f"Part 1: {execute_program(load_instructions(INPUT_FILENAME))[0]}")
-    print(f"Part 2: {execute_program_after_instruction_change(INPUT_FILENAME)[0]}")
+    decoded_instruction_list = parse_input(INPUT_FILENAME)
+    print(f"Part 1: {solve_part1(decoded_instruction_list)}")
+    print(f"Part 2: {solve_part2(decoded_instruction_list)}")
@@ -104,6 +104,8 @@ import unittest
 
 TEST_INPUT_FILENAME = 'day_9_small_input.txt'
 INPUT_FILENAME = 'day_9_input.txt'
+PARSER_VERSION = 1
+PREAMBLE_LENGTH = 25
 
 
 def load_input_file(filename: str) -> Iterable[str]:
@@ -112,10 +114,18 @@ def load_input_file(filename: str) -> Iterable[str]:
         return map(str.strip, input_file.readlines())
 
 
+def parse_input(filename: str) -> tuple:
+    '''Parse the numbers of the input file.'''
+    return tuple(map(int, load_input_file(filename)))
+
+
 def find_encoding_error(filename: str, preamble_length: int) -> int:
     '''Find the number causing the encoding error.'''
-    numbers = tuple(map(int, load_input_file(filename)))
+    return find_invalid_number(parse_input(filename), preamble_length)
 
+
+def find_invalid_number(numbers: tuple, preamble_length: int) -> int:
+    '''Find the first number that is not the sum of two of the numbers before it.'''
     for position in range(preamble_length, len(numbers)):
         preamble = numbers[position - preamble_length:position]
         preamble_sums = set(map(sum, combinations(preamble, 2)))
@@ -126,8 +136,11 @@ def find_encoding_error(filename: str, preamble_length: int) -> int:
 
 def find_encryption_weakness(filename: str, invalid_number: int) -> int:
     '''Find the suite of contiguous numbers causing the encryption weakness.'''
-    numbers = tuple(map(int, load_input_file(filename)))
+    return find_weakness(parse_input(filename), invalid_number)
+
 
+def find_weakness(numbers: tuple, invalid_number: int) -> int:
+    '''Find the suite of contiguous numbers summing to the invalid number.'''
     for length_of_contiguous_numbers in range(2, len(numbers)):
         for position in range(0, len(numbers) - length_of_contiguous_numbers):
             contiguous_numbers = numbers[position:position + length_of_contiguous_numbers]
@@ -135,6 +148,16 @@ def find_encryption_weakness(filename: str, invalid_number: int) -> int:
                 return max(contiguous_numbers) + min(contiguous_numbers)
 
 
+def solve_part1(numbers: tuple) -> int:
+    '''Solve part 1 of the daily puzzle.'''
+    return find_invalid_number(numbers, PREAMBLE_LENGTH)
+
+
+def solve_part2(numbers: tuple) -> int:
+    '''Solve part 2 of the daily puzzle.'''
+    return find_weakness(numbers, solve_part1(numbers))
+
+
 class Tests(unittest.TestCase):
     '''Tests'''
 
@@ -166,5 +189,6 @@ if __name__ == '__main__':
     print('Running unit tests...')
     unittest.main(verbosity=2, exit=False)
     print('Puzzle Answers:')
-    print(f"Part 1: {find_encoding_error(INPUT_FILENAME, 25)}")
-    print(f"Part 2: {find_encryption_weakness(INPUT_FILENAME, 22477624)}")
+    numbers = parse_input(INPUT_FILENAME)
+    print(f"Part 1: {solve_part1(numbers)}")
+    print(f"Part 2: {solve_part2(numbers)}")